@@ -0,0 +1,42 @@
+"""cascade_word_delete
+
+Revision ID: dda63aebd00c
+Revises: 6fdfd6ee975a
+Create Date: 2026-10-19 16:26:37.542556
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "dda63aebd00c"
+down_revision = "6fdfd6ee975a"
+branch_labels = None
+depends_on = None
+
+
+CHILD_TABLES = ("definitions", "synonyms", "translations", "examples")
+
+
+def upgrade():
+    # deleting a word becomes a single statement, postgres removes its children.
+    # Child rows are found by the unique constraints, they lead with word_id.
+    for table in CHILD_TABLES:
+        op.drop_constraint(f"{table}_word_id_fkey", table, type_="foreignkey")
+        op.create_foreign_key(
+            f"{table}_word_id_fkey",
+            table,
+            "words",
+            ["word_id"],
+            ["word_id"],
+            ondelete="CASCADE",
+        )
+
+
+def downgrade():
+    for table in CHILD_TABLES:
+        op.drop_constraint(f"{table}_word_id_fkey", table, type_="foreignkey")
+        op.create_foreign_key(
+            f"{table}_word_id_fkey", table, "words", ["word_id"], ["word_id"]
+        )
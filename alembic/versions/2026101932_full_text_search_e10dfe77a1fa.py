@@ -0,0 +1,77 @@
+"""full_text_search
+
+Revision ID: e10dfe77a1fa
+Revises: dda63aebd00c
+Create Date: 2026-10-19 16:32:23.373393
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e10dfe77a1fa"
+down_revision = "dda63aebd00c"
+branch_labels = None
+depends_on = None
+
+
+TEXT_SEARCH_CONFIG_FUNCTION = """
+CREATE OR REPLACE FUNCTION text_search_config(language varchar)
+RETURNS regconfig LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT (CASE language
+        WHEN 'ar' THEN 'arabic' WHEN 'hy' THEN 'armenian' WHEN 'eu' THEN 'basque'
+        WHEN 'ca' THEN 'catalan' WHEN 'da' THEN 'danish' WHEN 'nl' THEN 'dutch'
+        WHEN 'en' THEN 'english' WHEN 'fi' THEN 'finnish' WHEN 'fr' THEN 'french'
+        WHEN 'de' THEN 'german' WHEN 'el' THEN 'greek' WHEN 'hi' THEN 'hindi'
+        WHEN 'hu' THEN 'hungarian' WHEN 'id' THEN 'indonesian'
+        WHEN 'ga' THEN 'irish' WHEN 'it' THEN 'italian'
+        WHEN 'lt' THEN 'lithuanian' WHEN 'ne' THEN 'nepali'
+        WHEN 'no' THEN 'norwegian' WHEN 'pt' THEN 'portuguese'
+        WHEN 'ro' THEN 'romanian' WHEN 'ru' THEN 'russian' WHEN 'sr' THEN 'serbian'
+        WHEN 'es' THEN 'spanish' WHEN 'sv' THEN 'swedish' WHEN 'ta' THEN 'tamil'
+        WHEN 'tr' THEN 'turkish' WHEN 'yi' THEN 'yiddish'
+        ELSE 'simple'
+    END)::regconfig
+$$
+"""
+
+SEARCHABLE_COLUMNS = {"definitions": "definition", "examples": "example"}
+
+
+def upgrade():
+    op.execute(TEXT_SEARCH_CONFIG_FUNCTION)
+
+    for table, column in SEARCHABLE_COLUMNS.items():
+        # stored generated column, rewrites the table
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                TSVECTOR(),
+                sa.Computed(
+                    f"to_tsvector(text_search_config(language), {column})",
+                    persisted=True,
+                ),
+            ),
+        )
+
+    # build indexes without blocking writes
+    with op.get_context().autocommit_block():
+        for table in SEARCHABLE_COLUMNS:
+            op.create_index(
+                f"ix_{table}_search_vector",
+                table,
+                ["search_vector"],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    for table in SEARCHABLE_COLUMNS:
+        op.drop_index(f"ix_{table}_search_vector", table_name=table)
+        op.drop_column(table, "search_vector")
+
+    op.execute("DROP FUNCTION text_search_config(varchar)")
@@ -0,0 +1,36 @@
+"""word_entries
+
+Revision ID: 06de54e3eed4
+Revises: e10dfe77a1fa
+Create Date: 2026-10-19 16:34:18.485178
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "06de54e3eed4"
+down_revision = "e10dfe77a1fa"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "word_entries",
+        sa.Column("word_id", sa.Integer(), nullable=False),
+        sa.Column("tl", sa.String(length=50), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["word_id"], ["words.word_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("word_id", "tl"),
+    )
+    op.create_index("ix_words_word_language", "words", ["word", "language"])
+    # backfill with `python -m app.rebuild_entries`
+
+
+def downgrade():
+    op.drop_index("ix_words_word_language", table_name="words")
+    op.drop_table("word_entries")
@@ -0,0 +1,46 @@
+"""reverse_translation_lookup
+
+Revision ID: 5b7f3c1e9a24
+Revises: 06de54e3eed4
+Create Date: 2026-10-19 16:35:02.118305
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5b7f3c1e9a24"
+down_revision = "06de54e3eed4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # pg_trgm ships with postgres contrib, creating it needs superuser
+    # or a trusted extension (postgres 13+)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # build indexes without blocking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_translations_language_lower_translation",
+            "translations",
+            ["language", sa.text("lower(translation)")],
+            postgresql_concurrently=True,
+        )
+        # not declared on the model, tests run without pg_trgm
+        op.create_index(
+            "ix_translations_lower_translation_trgm",
+            "translations",
+            [sa.text("lower(translation) gin_trgm_ops")],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    op.drop_index("ix_translations_lower_translation_trgm", table_name="translations")
+    op.drop_index(
+        "ix_translations_language_lower_translation", table_name="translations"
+    )
@@ -0,0 +1,127 @@
+"""normalized_word_key
+
+Revision ID: 8c2d4e6f1a37
+Revises: 5b7f3c1e9a24
+Create Date: 2026-10-19 17:12:41.530917
+
+"""
+import sqlalchemy as sa
+
+from alembic import context, op
+from app.domain.normalization import clean_word, normalize_word
+
+# revision identifiers, used by Alembic.
+revision = "8c2d4e6f1a37"
+down_revision = "5b7f3c1e9a24"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# child table -> value column, all unique on (word_id, language, value)
+CHILDREN = {
+    "definitions": "definition",
+    "synonyms": "synonym",
+    "translations": "translation",
+    "examples": "example",
+}
+
+words = sa.table(
+    "words",
+    sa.column("word_id", sa.Integer),
+    sa.column("word", sa.Text),
+    sa.column("language", sa.String),
+    sa.column("normalized", sa.Text),
+)
+
+
+def _backfill():
+    if context.is_offline_mode():
+        # approximation for generated scripts, Turkic I and full case folding
+        # are only applied by the online backfill
+        op.execute(
+            "UPDATE words SET word = btrim(regexp_replace("
+            "normalize(word, NFC), '\\s+', ' ', 'g'))"
+        )
+        op.execute("UPDATE words SET normalized = lower(word)")
+        return
+
+    # the rules live in python, rows are rewritten in batches by primary key
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(words.c.word_id, words.c.word, words.c.language)
+            .where(words.c.word_id > last_id)
+            .order_by(words.c.word_id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            words.update()
+            .where(words.c.word_id == sa.bindparam("id"))
+            .values(word=sa.bindparam("cleaned"), normalized=sa.bindparam("key")),
+            [
+                {
+                    "id": row.word_id,
+                    "cleaned": clean_word(row.word),
+                    "key": normalize_word(row.word, row.language),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].word_id
+
+
+def _merge_duplicates():
+    # variants of one word collapse into the oldest row
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE word_duplicates ON COMMIT DROP AS
+        SELECT word_id, keeper FROM (
+            SELECT word_id,
+                   min(word_id) OVER (PARTITION BY normalized, language) AS keeper
+            FROM words
+        ) AS ranked
+        WHERE word_id <> keeper
+        """
+    )
+    for table, column in CHILDREN.items():
+        op.execute(
+            f"""
+            INSERT INTO {table} (word_id, language, {column})
+            SELECT DISTINCT d.keeper, c.language, c.{column}
+            FROM {table} AS c JOIN word_duplicates AS d ON c.word_id = d.word_id
+            ON CONFLICT DO NOTHING
+            """
+        )
+    # assembled entries of the keepers miss the merged children,
+    # run `python -m app.rebuild_entries` after the migration
+    op.execute(
+        "DELETE FROM word_entries WHERE word_id IN "
+        "(SELECT keeper FROM word_duplicates)"
+    )
+    # children and entries of the duplicates are removed by cascade
+    op.execute(
+        "DELETE FROM words WHERE word_id IN (SELECT word_id FROM word_duplicates)"
+    )
+
+
+def upgrade():
+    op.add_column("words", sa.Column("normalized", sa.Text(), nullable=True))
+    _backfill()
+    _merge_duplicates()
+    op.alter_column("words", "normalized", nullable=False)
+
+    op.create_index(
+        "ix_words_normalized_language", "words", ["normalized", "language"]
+    )
+    op.drop_index("ix_words_word_language", table_name="words")
+
+
+def downgrade():
+    # merged duplicates are not restored
+    op.create_index("ix_words_word_language", "words", ["word", "language"])
+    op.drop_index("ix_words_normalized_language", table_name="words")
+    op.drop_column("words", "normalized")
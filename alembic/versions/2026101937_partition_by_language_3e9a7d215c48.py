@@ -0,0 +1,111 @@
+"""partition_by_language
+
+Revision ID: 3e9a7d215c48
+Revises: 8c2d4e6f1a37
+Create Date: 2026-10-19 18:03:27.214536
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3e9a7d215c48"
+down_revision = "8c2d4e6f1a37"
+branch_labels = None
+depends_on = None
+
+# table -> (primary key, value column, unique constraint)
+TABLES = {
+    "definitions": ("definition_id", "definition", "_word_language_definition_uc"),
+    "synonyms": ("synonym_id", "synonym", "_word_language_synonym_uc"),
+    "translations": ("translation_id", "translation", "_word_language_translation_uc"),
+    "examples": ("example_id", "example", "_word_language_example_uc"),
+}
+
+# secondary indexes, recreated on the partitioned tables
+INDEXES = {
+    "definitions": {"ix_definitions_search_vector": "USING gin (search_vector)"},
+    "synonyms": {},
+    "translations": {
+        "ix_translations_language_lower_translation": "(language, lower(translation))",
+        "ix_translations_lower_translation_trgm": (
+            "USING gin (lower(translation) gin_trgm_ops)"
+        ),
+    },
+    "examples": {"ix_examples_search_vector": "USING gin (search_vector)"},
+}
+
+
+def upgrade():
+    # Every table becomes the default partition of a new partitioned table
+    # of the same name, rows are not copied. Languages get own partitions
+    # afterwards with `python -m app.add_language_partition`.
+
+    # keys of a partitioned table must include the partition key, build
+    # them ahead without blocking writes, attaching adopts existing indexes
+    with op.get_context().autocommit_block():
+        for table, (key, _, _) in TABLES.items():
+            op.execute(
+                f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {table}_default_pkey"
+                f" ON {table} ({key}, language)"
+            )
+
+    for table, (key, column, constraint) in TABLES.items():
+        default = f"{table}_default"
+
+        # free the names for the partitioned table
+        op.execute(f"ALTER TABLE {table} RENAME TO {default}")
+        op.execute(
+            f"ALTER TABLE {default} DROP CONSTRAINT {table}_pkey,"
+            f" ADD CONSTRAINT {default}_pkey PRIMARY KEY USING INDEX {default}_pkey"
+        )
+        op.execute(
+            f"ALTER TABLE {default} RENAME CONSTRAINT {constraint}"
+            f" TO {default}{constraint}"
+        )
+        for index in INDEXES[table]:
+            op.execute(f"ALTER INDEX {index} RENAME TO {index}_default")
+
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {default}"
+            f" INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING STORAGE)"
+            f" PARTITION BY LIST (language)"
+        )
+        op.execute(
+            f"ALTER TABLE {table}"
+            f" ADD CONSTRAINT {table}_pkey PRIMARY KEY ({key}, language),"
+            f" ADD CONSTRAINT {constraint} UNIQUE (word_id, language, {column}),"
+            f" ADD CONSTRAINT {table}_word_id_fkey FOREIGN KEY (word_id)"
+            f" REFERENCES words (word_id) ON DELETE CASCADE"
+        )
+        for index, definition in INDEXES[table].items():
+            op.execute(f"CREATE INDEX {index} ON {table} {definition}")
+        op.execute(f"ALTER SEQUENCE {table}_{key}_seq OWNED BY {table}.{key}")
+
+        # no other partitions yet, nothing to validate
+        op.execute(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+
+
+def downgrade():
+    for table, (key, column, constraint) in TABLES.items():
+        default = f"{table}_default"
+        columns = f"{key}, word_id, language, {column}"
+
+        # rows of the language partitions go back to the default one
+        op.execute(f"ALTER TABLE {table} DETACH PARTITION {default}")
+        op.execute(
+            f"INSERT INTO {default} ({columns}) SELECT {columns} FROM {table}"
+        )
+        op.execute(f"ALTER SEQUENCE {table}_{key}_seq OWNED BY {default}.{key}")
+        op.execute(f"DROP TABLE {table}")
+
+        op.execute(f"ALTER TABLE {default} RENAME TO {table}")
+        op.execute(
+            f"ALTER TABLE {table} DROP CONSTRAINT {default}_pkey,"
+            f" ADD CONSTRAINT {table}_pkey PRIMARY KEY ({key})"
+        )
+        op.execute(
+            f"ALTER TABLE {table} RENAME CONSTRAINT {default}{constraint}"
+            f" TO {constraint}"
+        )
+        for index in INDEXES[table]:
+            op.execute(f"ALTER INDEX {index}_default RENAME TO {index}")
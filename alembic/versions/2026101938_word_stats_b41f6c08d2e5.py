@@ -0,0 +1,38 @@
+"""word_stats
+
+Revision ID: b41f6c08d2e5
+Revises: 3e9a7d215c48
+Create Date: 2026-10-19 18:47:55.602193
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b41f6c08d2e5"
+down_revision = "3e9a7d215c48"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "word_stats",
+        sa.Column("word_id", sa.Integer(), nullable=False),
+        sa.Column("tl", sa.String(length=50), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("hits", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["word_id"], ["words.word_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("word_id", "tl"),
+    )
+
+
+def downgrade():
+    op.drop_table("word_stats")
@@ -0,0 +1,63 @@
+"""scrape_jobs
+
+Revision ID: 6d2a9e4b7c13
+Revises: b41f6c08d2e5
+Create Date: 2026-10-19 19:21:08.317642
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "6d2a9e4b7c13"
+down_revision = "b41f6c08d2e5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "scrape_jobs",
+        sa.Column("job_id", sa.BigInteger(), nullable=False),
+        sa.Column("word", sa.Text(), nullable=False),
+        sa.Column("normalized", sa.Text(), nullable=False),
+        sa.Column("sl", sa.String(length=50), nullable=False),
+        sa.Column("tl", sa.String(length=50), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+    op.create_index(
+        "ix_scrape_jobs_active",
+        "scrape_jobs",
+        ["normalized", "sl", "tl"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+    op.create_index(
+        "ix_scrape_jobs_pending",
+        "scrape_jobs",
+        ["priority", "job_id"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_scrape_jobs_pending", table_name="scrape_jobs")
+    op.drop_index("ix_scrape_jobs_active", table_name="scrape_jobs")
+    op.drop_table("scrape_jobs")
@@ -0,0 +1,26 @@
+"""scrape_job_traceparent
+
+Revision ID: a7e3c5d19b62
+Revises: 6d2a9e4b7c13
+Create Date: 2026-10-19 19:58:41.906214
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a7e3c5d19b62"
+down_revision = "6d2a9e4b7c13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "scrape_jobs", sa.Column("traceparent", sa.String(length=55), nullable=True)
+    )
+
+
+def downgrade():
+    op.drop_column("scrape_jobs", "traceparent")
@@ -0,0 +1,45 @@
+"""scrape_pages
+
+Revision ID: c58f2d7a9e16
+Revises: a7e3c5d19b62
+Create Date: 2026-10-19 20:41:12.553870
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c58f2d7a9e16"
+down_revision = "a7e3c5d19b62"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "scrape_pages",
+        sa.Column("page_id", sa.BigInteger(), nullable=False),
+        sa.Column("word", sa.Text(), nullable=False),
+        sa.Column("normalized", sa.Text(), nullable=False),
+        sa.Column("sl", sa.String(length=50), nullable=False),
+        sa.Column("tl", sa.String(length=50), nullable=False),
+        sa.Column("digest", sa.String(length=64), nullable=False),
+        sa.Column("page", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "scraped_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("page_id"),
+        sa.UniqueConstraint(
+            "normalized", "sl", "tl", name="_normalized_sl_tl_page_uc"
+        ),
+    )
+    # pages are zlib compressed already, TOAST only moves them out of line
+    op.execute("ALTER TABLE scrape_pages ALTER COLUMN page SET STORAGE EXTERNAL")
+
+
+def downgrade():
+    op.drop_table("scrape_pages")
@@ -0,0 +1,86 @@
+"""lower_case_german_keys
+
+Revision ID: bc586c95d57c
+Revises: c58f2d7a9e16
+Create Date: 2026-10-19 21:08:27.164392
+
+"""
+from collections.abc import Callable
+
+import sqlalchemy as sa
+
+from alembic import context, op
+from app.domain.normalization import LOWER_CASE_LANGUAGES, normalize_word
+
+# revision identifiers, used by Alembic.
+revision = "bc586c95d57c"
+down_revision = "c58f2d7a9e16"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# table -> (key column, word column, language column)
+KEYED_TABLES = {
+    "words": ("word_id", "word", "language"),
+    "scrape_jobs": ("job_id", "word", "sl"),
+    "scrape_pages": ("page_id", "word", "sl"),
+}
+
+
+def _rekey(name: str, key: Callable[[str, str], str]):
+    id_column, word_column, language_column = KEYED_TABLES[name]
+    table = sa.table(
+        name,
+        sa.column(id_column, sa.BigInteger),
+        sa.column(word_column, sa.Text),
+        sa.column(language_column, sa.String),
+        sa.column("normalized", sa.Text),
+    )
+    row_id, word, language = (
+        table.c[id_column],
+        table.c[word_column],
+        table.c[language_column],
+    )
+
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(row_id, word, language)
+            .where(language.in_(LOWER_CASE_LANGUAGES), row_id > last_id)
+            .order_by(row_id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            table.update()
+            .where(row_id == sa.bindparam("id"))
+            .values(normalized=sa.bindparam("key")),
+            [{"id": row[0], "key": key(row[1], row[2])} for row in rows],
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    if context.is_offline_mode():
+        # the rules live in python, generated scripts approximate them
+        languages = ", ".join(f"'{language}'" for language in LOWER_CASE_LANGUAGES)
+        for name, (_, word, language) in KEYED_TABLES.items():
+            op.execute(
+                f"UPDATE {name} SET normalized = lower({word})"
+                f" WHERE {language} IN ({languages})"
+            )
+        return
+
+    # lower-cased keys are finer than the case-folded ones, they cannot collide
+    for name in KEYED_TABLES:
+        _rekey(name, normalize_word)
+
+
+def downgrade():
+    # words merged before the upgrade are not split again. Only words are
+    # folded back, folded keys of pages and jobs could break their unique indexes
+    # and a stale one only costs a scrape
+    _rekey("words", lambda word, language: normalize_word(word))
@@ -0,0 +1,33 @@
+"""
+Moves languages into their own partitions of the word children tables,
+e.g. `python -m app.add_language_partition en fr de --batch-size 5000`.
+Without languages prints the current partitions. Safe to run while the service
+is up and to repeat after an interruption, see app.repo.pg.partitions.
+"""
+
+import argparse
+import asyncio
+
+from app.core.session import get_context
+from app.repo.pg.partitions import PartitionPgRepo
+
+
+async def main(languages: list[str], batch_size: int) -> None:
+    repo = PartitionPgRepo(_session_factory=get_context)
+
+    for language in languages:
+        moved = await repo.add_language(language, batch_size=batch_size)
+        print(f"Partitioned {language}, moved {moved} rows")
+
+    for table, partitions in (await repo.get_partitions()).items():
+        for partition, bound in partitions.items():
+            print(f"{table}: {partition} {bound}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("languages", nargs="*")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.languages, args.batch_size))
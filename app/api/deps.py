@@ -1,5 +1,5 @@
 import time
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
 
 import jwt
 from fastapi import Depends, HTTPException, status
@@ -8,14 +8,112 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import config, security
-from app.core.session import async_session, get_context
+from app.core.admission import AdmissionLimiter
+from app.core.resilience import CircuitBreaker
+from app.core.scheduler import ScrapeScheduler
+from app.core.session import async_engine, async_session, get_context, get_read_context
+from app.core.slow_queries import SlowQueryLog
 from app.models import User
+from app.repo.cache import WordCache
 from app.repo.google.word import GoogleWordRepo
+from app.repo.job import TranslationJobRepo
+from app.repo.local.word import LocalDictionaryRepo
+from app.repo.pg.archive import ScrapeArchivePgRepo
+from app.repo.pg.queue import DONE_CHANNEL, NotificationListener, ScrapeQueuePgRepo
 from app.repo.pg.word import WordPgRepo
+from app.repo.snapshot import WordSnapshot
+from app.repo.stats import WordStats
+from app.repo.suggest import SuggestIndex
 from app.repo.word import WordRepo
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl="auth/access-token")
 
+# one per worker process, shared by all requests
+scrape_scheduler = ScrapeScheduler(
+    max_concurrency=config.settings.SCRAPE_MAX_CONCURRENCY,
+    max_concurrency_per_pair=config.settings.SCRAPE_MAX_CONCURRENCY_PER_PAIR,
+    rate=config.settings.SCRAPE_RATE_PER_SECOND,
+    burst=config.settings.SCRAPE_BURST,
+    queue_timeout=config.settings.SCRAPE_QUEUE_TIMEOUT_SECONDS,
+)
+scrape_breaker = CircuitBreaker(
+    "scrape",
+    failure_rate=config.settings.SCRAPE_BREAKER_FAILURE_RATE,
+    window=config.settings.SCRAPE_BREAKER_WINDOW,
+    min_calls=config.settings.SCRAPE_BREAKER_MIN_CALLS,
+    open_seconds=config.settings.SCRAPE_BREAKER_OPEN_SECONDS,
+)
+db_limiter = AdmissionLimiter(
+    "db",
+    limit=config.settings.ADMISSION_DB_CONCURRENCY,
+    max_wait=config.settings.ADMISSION_DB_MAX_WAIT_SECONDS,
+    max_queue=config.settings.ADMISSION_DB_MAX_QUEUE,
+)
+scrape_limiter = AdmissionLimiter(
+    "scrape",
+    limit=config.settings.ADMISSION_SCRAPE_CONCURRENCY,
+    max_wait=config.settings.ADMISSION_SCRAPE_MAX_WAIT_SECONDS,
+    max_queue=config.settings.ADMISSION_SCRAPE_MAX_QUEUE,
+    retry_after=5,
+)
+graphql_limiter = AdmissionLimiter(
+    "graphql",
+    limit=config.settings.ADMISSION_GRAPHQL_CONCURRENCY,
+    max_wait=config.settings.ADMISSION_GRAPHQL_MAX_WAIT_SECONDS,
+    max_queue=config.settings.ADMISSION_GRAPHQL_MAX_QUEUE,
+)
+slow_query_log = (
+    SlowQueryLog(
+        threshold_ms=config.settings.SLOW_QUERY_THRESHOLD_MS,
+        explain=(
+            config.settings.ENVIRONMENT != "PRD"
+            if config.settings.SLOW_QUERY_EXPLAIN is None
+            else config.settings.SLOW_QUERY_EXPLAIN
+        ),
+        explain_interval=config.settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS,
+        max_entries=config.settings.SLOW_QUERY_MAX_ENTRIES,
+        log_path=config.settings.SLOW_QUERY_LOG_PATH,
+        log_max_bytes=config.settings.SLOW_QUERY_LOG_MAX_BYTES,
+        log_backups=config.settings.SLOW_QUERY_LOG_BACKUPS,
+    )
+    if config.settings.SLOW_QUERY_THRESHOLD_MS
+    else None
+)
+local_dictionary = LocalDictionaryRepo(config.settings.LOCAL_DICTIONARIES)
+translation_jobs = TranslationJobRepo(ttl=config.settings.JOBS_TTL_SECONDS)
+suggest_index = SuggestIndex(max_candidates=config.settings.SUGGEST_MAX_CANDIDATES)
+word_snapshot = (
+    WordSnapshot(
+        config.settings.WORDS_SNAPSHOT_PATH,
+        check_interval=config.settings.WORDS_SNAPSHOT_CHECK_SECONDS,
+    )
+    if config.settings.WORDS_SNAPSHOT_PATH
+    else None
+)
+word_cache = (
+    WordCache(
+        capacity=config.settings.WORDS_CACHE_SIZE,
+        ttl=config.settings.WORDS_CACHE_TTL_SECONDS,
+    )
+    if config.settings.WORDS_CACHE_SIZE
+    else None
+)
+word_stats = WordStats() if config.settings.WORDS_STATS_FLUSH_SECONDS else None
+scrape_queue = (
+    ScrapeQueuePgRepo(
+        _session_factory=get_context,
+        listener=NotificationListener(async_engine, DONE_CHANNEL),
+        poll_interval=config.settings.SCRAPE_WORKER_POLL_SECONDS,
+    )
+    if config.settings.SCRAPE_QUEUE_ENABLED
+    else None
+)
+scrape_archive = (
+    ScrapeArchivePgRepo(_session_factory=get_context)
+    if config.settings.SCRAPE_ARCHIVE_PAGES
+    else None
+)
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
@@ -57,10 +155,52 @@ async def get_current_user(
     return user
 
 
+async def get_current_superuser(
+    current_user: User = Depends(get_current_user),
+) -> User:
+    if current_user.email != config.settings.FIRST_SUPERUSER_EMAIL:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="The user doesn't have enough privileges",
+        )
+    return current_user
+
+
 def get_word_repo() -> "WordRepo":
-    pg_repo = WordPgRepo(_session_factory=get_context)
-    return WordRepo(pg_repo=pg_repo, google_repo=GoogleWordRepo())
+    pg_repo = WordPgRepo(
+        _session_factory=get_context,
+        _read_session_factory=get_read_context,
+        stats_half_life=config.settings.WORDS_STATS_HALF_LIFE_SECONDS,
+    )
+    return WordRepo(
+        pg_repo=pg_repo,
+        google_repo=GoogleWordRepo(
+            lean=config.settings.SCRAPE_LEAN_PROFILE,
+            page_load_strategy=config.settings.SCRAPE_PAGE_LOAD_STRATEGY,
+            window_size=config.settings.SCRAPE_WINDOW_SIZE,
+            js_flags=config.settings.SCRAPE_JS_FLAGS,
+            archive=scrape_archive,
+        ),
+        scheduler=scrape_scheduler,
+        breaker=scrape_breaker,
+        local_repo=local_dictionary,
+        provider_chain=config.settings.WORDS_PROVIDER_CHAIN,
+        suggest_index=suggest_index,
+        snapshot=word_snapshot,
+        cache=word_cache,
+        stats=word_stats,
+        scrape_queue=scrape_queue,
+        scrape_wait=config.settings.SCRAPE_QUEUE_WAIT_SECONDS,
+        db_limiter=db_limiter,
+        scrape_limiter=scrape_limiter,
+    )
+
+
+def get_job_repo() -> "TranslationJobRepo":
+    return translation_jobs
 
 
-def get_strawberry_context() -> dict[str, "WordRepo"]:
-    yield {"word_repo": get_word_repo()}
+async def get_strawberry_context() -> AsyncIterator[dict[str, "WordRepo"]]:
+    # held for the whole query, every query may read pages of words
+    async with graphql_limiter.slot():
+        yield {"word_repo": get_word_repo()}
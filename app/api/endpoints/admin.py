@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.api import deps
+from app.api.schemas.responses import SlowQueryResponse
+
+router = APIRouter(dependencies=[Depends(deps.get_current_superuser)])
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryResponse])
+async def read_slow_queries(limit: int = Query(20, ge=1, le=500)):
+    """Slow statements of this worker process, the highest total time first"""
+    if deps.slow_query_log is None:
+        return []
+    return deps.slow_query_log.top(limit)
+
+
+@router.delete("/slow-queries", status_code=204)
+async def clear_slow_queries():
+    """Forgets the slow statements of this worker process"""
+    if deps.slow_query_log is not None:
+        deps.slow_query_log.clear()
@@ -4,7 +4,7 @@ import jwt
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import ValidationError
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
@@ -23,15 +23,31 @@ async def login_access_token(
 ):
     """OAuth2 compatible token, get an access token for future requests using username and password"""
 
-    result = await session.execute(select(User).where(User.email == form_data.username))
-    user = result.scalars().first()
+    result = await session.execute(
+        select(User.id, User.hashed_password).where(User.email == form_data.username)
+    )
+    user = result.first()
+    # end read transaction, so the connection is not held while hashing
+    await session.commit()
 
     if user is None:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
 
-    if not security.verify_password(form_data.password, user.hashed_password):
+    async with security.AUTH_LIMITER.slot():
+        verified, new_hash = await security.verify_and_update_password_async(
+            form_data.password, user.hashed_password
+        )
+
+    if not verified:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
 
+    if new_hash is not None:
+        # SECURITY_BCRYPT_ROUNDS changed since the hash was made
+        await session.execute(
+            update(User).where(User.id == user.id).values(hashed_password=new_hash)
+        )
+        await session.commit()
+
     return security.generate_access_token_response(str(user.id))
 
 
@@ -3,10 +3,9 @@ from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
-from app.api.schemas.requests import (UserCreateRequest,
-                                      UserUpdatePasswordRequest)
+from app.api.schemas.requests import UserCreateRequest, UserUpdatePasswordRequest
 from app.api.schemas.responses import UserResponse
-from app.core.security import get_password_hash
+from app.core.security import AUTH_LIMITER, get_password_hash_async
 from app.models import User
 
 router = APIRouter()
@@ -37,7 +36,10 @@ async def reset_current_user_password(
     current_user: User = Depends(deps.get_current_user),
 ):
     """Update current user password"""
-    current_user.hashed_password = get_password_hash(user_update_password.password)
+    async with AUTH_LIMITER.slot():
+        current_user.hashed_password = await get_password_hash_async(
+            user_update_password.password
+        )
     session.add(current_user)
     await session.commit()
     return current_user
@@ -52,10 +54,9 @@ async def register_new_user(
     result = await session.execute(select(User).where(User.email == new_user.email))
     if result.scalars().first() is not None:
         raise HTTPException(status_code=400, detail="Cannot use this email address")
-    user = User(
-        email=new_user.email,
-        hashed_password=get_password_hash(new_user.password),
-    )
+    async with AUTH_LIMITER.slot():
+        hashed_password = await get_password_hash_async(new_user.password)
+    user = User(email=new_user.email, hashed_password=hashed_password)
     session.add(user)
     await session.commit()
     return user
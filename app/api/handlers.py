@@ -0,0 +1,25 @@
+"""Exception handlers shared by the main app and mounted sub-apps."""
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from app.core.admission import AdmissionRejectedException
+from app.core.resilience import DeadlineExceededException
+
+
+async def admission_rejected_handler(
+    request: Request, exc: AdmissionRejectedException
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def deadline_exceeded_handler(
+    request: Request, exc: DeadlineExceededException
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT, content={"detail": str(exc)}
+    )
@@ -22,3 +22,14 @@ class UserResponse(BaseResponse):
 
 class ResponseErrorSchema(BaseModel):
     message: str
+
+
+class SlowQueryResponse(BaseResponse):
+    sql: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    parameters: str
+    plan: str | None
+    last_seen: float
@@ -2,8 +2,11 @@
 
 from fastapi import FastAPI, status
 
+from app.api.handlers import admission_rejected_handler, deadline_exceeded_handler
 from app.api.schemas.responses import ResponseErrorSchema
-from app.api.v1.routers import word
+from app.api.v1.routers import job, word
+from app.core.admission import AdmissionRejectedException
+from app.core.resilience import DeadlineExceededException
 
 INTERNAL_SERVER_ERROR: dict = {
     status.HTTP_500_INTERNAL_SERVER_ERROR: {
@@ -21,9 +24,14 @@ def create_app(title: str, version: str) -> FastAPI:
         redoc_url=None,
         responses=INTERNAL_SERVER_ERROR,
     )
+    api_v1.add_exception_handler(
+        AdmissionRejectedException, admission_rejected_handler
+    )
+    api_v1.add_exception_handler(DeadlineExceededException, deadline_exceeded_handler)
 
     # Добавление роутеров
     api_v1.include_router(word.router)
+    api_v1.include_router(job.router)
 
     api_v1.include_router(word.graphql_router, prefix="/graphql")
 
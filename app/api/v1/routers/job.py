@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.deps import TranslationJobRepo, WordRepo, get_job_repo, get_word_repo
+from app.api.v1.schemas import JobSchema
+from app.domain.entities import JobEntity, JobStatus
+from app.repo.job import UndefinedJobException
+
+TAG = "jobs"
+PREFIX = f"/{TAG}"
+
+router = APIRouter(prefix=PREFIX, tags=[TAG])
+
+
+def job_to_schema(job: JobEntity) -> JobSchema:
+    return JobSchema(
+        id=job.id,
+        status=job.status,
+        word=job.result.model_dump() if job.result else None,
+        error=job.error,
+    )
+
+
+@router.get("/{job_id}", response_model=JobSchema)
+async def get_job(
+    job_id: str,
+    jobs: "TranslationJobRepo" = Depends(get_job_repo),
+    repo: "WordRepo" = Depends(get_word_repo),
+):
+
+    job = jobs.get(job_id)
+    if job:
+        return job_to_schema(job)
+
+    # the job may have run on another worker or expired, then the word is stored
+    try:
+        word_text, sl, tl = jobs.parse_id(job_id)
+    except UndefinedJobException:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Job not found")
+
+    word = await repo.lookup(word_text, sl, tl)
+    if word:
+        return job_to_schema(
+            JobEntity(
+                id=job_id,
+                word=word_text,
+                sl=sl,
+                tl=tl,
+                status=JobStatus.DONE,
+                result=word,
+            )
+        )
+
+    # jobs live in the memory of the worker that started them, a job of another
+    # worker is pending for this one unless the scrape queue knows better
+    job = JobEntity(id=job_id, word=word_text, sl=sl, tl=tl)
+    queued = None
+    if repo.scrape_queue is not None:
+        queued = await repo.scrape_queue.get_latest(word_text, sl, tl)
+    if queued is not None:
+        job.status, job.error = queued.status, queued.error
+    if job.status == JobStatus.DONE:
+        # saved on the primary, the lookup may have gone to a lagging replica
+        job.result = await repo.pg_repo.get(word_text, sl, tl, primary=True)
+        if job.result is None:
+            job.status, job.error = JobStatus.FAILED, "Word not found"
+
+    return job_to_schema(job)
@@ -1,13 +1,42 @@
+import json
+from collections.abc import AsyncIterator
 from http import HTTPStatus
-from typing import Optional
+from typing import Optional, Union
 
 import strawberry
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from strawberry.fastapi import GraphQLRouter
 
-from app.api.deps import WordRepo, get_strawberry_context, get_word_repo
-from app.api.v1.schemas import WordSchema
-from app.api.v1.types import WordType
+from app.api.deps import (
+    TranslationJobRepo,
+    WordRepo,
+    get_job_repo,
+    get_strawberry_context,
+    get_word_repo,
+)
+from app.api.v1.routers.job import job_to_schema
+from app.api.v1.schemas import (
+    BulkDeleteResultSchema,
+    BulkDeleteSchema,
+    JobSchema,
+    ReverseTranslationSchema,
+    SearchPageSchema,
+    SuggestionSchema,
+    WordSchema,
+)
+from app.api.v1.types import (
+    ReverseLookupType,
+    ReverseTranslationType,
+    SearchHitType,
+    SearchPageType,
+    WordType,
+)
+from app.core import config
+from app.core.admission import AdmissionRejectedException
+from app.core.resilience import DeadlineExceededException
+from app.core.tracing import TracingExtension
+from app.repo.pg.word import InvalidCursorException
 
 TAG = "words"
 PREFIX = f"/{TAG}"
@@ -15,19 +44,234 @@ PREFIX = f"/{TAG}"
 router = APIRouter(prefix=PREFIX, tags=[TAG])
 
 
-@router.get("/{word_text}", response_model=WordSchema)
+@router.post(":bulk-delete", response_model=BulkDeleteResultSchema)
+async def bulk_delete_words(
+    request: BulkDeleteSchema,
+    repo: "WordRepo" = Depends(get_word_repo),
+):
+
+    deleted = await repo.bulk_delete(
+        words=request.words,
+        word_filter=request.word_filter,
+        sl=request.sl,
+        batch_size=config.settings.WORDS_DELETE_BATCH_SIZE,
+    )
+
+    return BulkDeleteResultSchema(deleted=deleted)
+
+
+@router.get(":search", response_model=SearchPageSchema)
+async def search_words(
+    q: str = Query(..., description="Web search syntax query"),
+    language: str = Query(..., description="Language of definitions and examples"),
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = Query(None, description="next_cursor of previous page"),
+    repo: "WordRepo" = Depends(get_word_repo),
+):
+    """Ranked full-text search across definitions and examples"""
+
+    try:
+        page = await repo.search(q, language, limit, after)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e))
+
+    return page.model_dump()
+
+
+@router.get(":suggest", response_model=list[SuggestionSchema])
+async def suggest_words(
+    prefix: str = Query(..., min_length=1, description="Beginning of the word"),
+    sl: str = Query("auto", description="Source language"),
+    limit: int = Query(10, ge=1, le=50),
+    repo: "WordRepo" = Depends(get_word_repo),
+):
+    """Stored words starting with the prefix, the most popular first"""
+
+    suggestions = await repo.suggest(prefix, sl, limit)
+
+    return [{"word": word, "language": language} for word, language in suggestions]
+
+
+@router.get(":reverse", response_model=dict[str, list[ReverseTranslationSchema]])
+async def reverse_lookup_words(
+    translation: list[str] = Query(
+        ..., max_length=100, description="Translations to look up, repeatable"
+    ),
+    language: str = Query(..., description="Language of the translations"),
+    sl: str = Query("auto", description="Source language of the words"),
+    partial: bool = Query(False, description="Match translations by substring"),
+    limit: int = Query(20, ge=1, le=100, description="Words per translation"),
+    repo: "WordRepo" = Depends(get_word_repo),
+):
+    """Source words of stored translations, keyed by the given translation"""
+
+    words = await repo.reverse_lookup(translation, language, sl, partial, limit)
+
+    return {
+        term: [word.model_dump() for word in term_words]
+        for term, term_words in words.items()
+    }
+
+
+@router.get(
+    "/{word_text}",
+    response_model=Union[WordSchema, dict[str, WordSchema]],
+    responses={
+        HTTPStatus.ACCEPTED: {
+            "model": Union[JobSchema, dict[str, Union[WordSchema, JobSchema]]]
+        }
+    },
+)
 async def get_word(
+    request: Request,
+    word_text: str,
+    sl: str = Query(..., description="Source language"),
+    tl: list[str] = Query(
+        ..., description="Target language, repeated or comma-separated for several"
+    ),
+    prefer: Optional[str] = Header(None, description="`respond-async` for 202 on miss"),
+    repo: "WordRepo" = Depends(get_word_repo),
+    jobs: "TranslationJobRepo" = Depends(get_job_repo),
+):
+    """A single target language responds with the word, several ones respond with
+    the words keyed by target language, targets that cannot be found are omitted.
+    """
+
+    tls = parse_languages(tl)
+    if not tls:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail="Target language is required"
+        )
+    if len(tls) > 1:
+        return await get_word_many(request, word_text, sl, tls, prefer, repo, jobs)
+    tl = tls[0]
+
+    if not respond_async(prefer):
+        word = await repo.get(word_text, sl, tl)
+        if not word:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND, detail="Word not found"
+            )
+        return word
+
+    word = await repo.lookup(word_text, sl, tl)
+    if word:
+        return word
+
+    job = jobs.submit(word_text, sl, tl, lambda: repo.fetch(word_text, sl, tl))
+
+    return JSONResponse(
+        status_code=HTTPStatus.ACCEPTED,
+        content=job_to_schema(job).model_dump(mode="json"),
+        headers={"Location": str(request.url_for("get_job", job_id=job.id))},
+    )
+
+
+async def get_word_many(
+    request: Request,
+    word_text: str,
+    sl: str,
+    tls: list[str],
+    prefer: Optional[str],
+    repo: "WordRepo",
+    jobs: "TranslationJobRepo",
+):
+    if not respond_async(prefer):
+        words = await repo.get_many(word_text, sl, tls)
+        if not words:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND, detail="Word not found"
+            )
+        return words
+
+    words = await repo.lookup_many(word_text, sl, tls)
+    missing = [tl for tl in tls if tl not in words]
+    if not missing:
+        return words
+
+    # stored targets come as words, every missing one gets its own job
+    content = {}
+    for tl in tls:
+        if tl in words:
+            content[tl] = WordSchema.model_validate(words[tl].model_dump())
+        else:
+            content[tl] = job_to_schema(
+                jobs.submit(
+                    word_text, sl, tl, lambda tl=tl: repo.fetch(word_text, sl, tl)
+                )
+            )
+
+    return JSONResponse(
+        status_code=HTTPStatus.ACCEPTED,
+        content={tl: value.model_dump(mode="json") for tl, value in content.items()},
+    )
+
+
+def parse_languages(values: list[str]) -> list[str]:
+    """Flattens repeated and comma-separated languages keeping the first occurrence."""
+    languages = (language.strip() for value in values for language in value.split(","))
+    return list(dict.fromkeys(language for language in languages if language))
+
+
+def respond_async(prefer: Optional[str]) -> bool:
+    if prefer is None:
+        return config.settings.WORDS_ASYNC_MISSES
+    preferences = {p.strip().lower() for p in prefer.split(",")}
+    return "respond-async" in preferences
+
+
+@router.get("/{word_text}/stream", response_class=StreamingResponse)
+async def stream_word(
     word_text: str,
     sl: str = Query(..., description="Source language"),
     tl: str = Query(..., description="Target language"),
     repo: "WordRepo" = Depends(get_word_repo),
 ):
+    """Server-Sent Events stream of the word.
+
+    A stored word comes as a single `entity` event. A missing one is scraped and
+    every section (`definitions` with the primary translation first, then
+    `translations`, `synonyms`, `examples`) is sent as soon as it is extracted,
+    followed by the complete `entity`. Failures come as an `error` event, also
+    after some sections when the scrape broke off before the `entity`.
+    """
+
+    async def events() -> AsyncIterator[str]:
+        sent, complete = False, False
+        try:
+            async for section, value in repo.stream(word_text, sl, tl):
+                sent = True
+                if section == "entity":
+                    complete = True
+                    data = WordSchema.model_validate(value.model_dump()).model_dump()
+                else:
+                    # same shape as the section of WordSchema
+                    data = [item.model_dump(exclude={"language"}) for item in value]
+                yield sse_event(section, data)
+        except (AdmissionRejectedException, DeadlineExceededException) as e:
+            yield sse_event("error", {"detail": str(e)})
+            return
+
+        if not sent:
+            yield sse_event("error", {"detail": "Word not found"})
+        elif not complete:
+            yield sse_event("error", {"detail": "Scraping failed"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
-    word = await repo.get(word_text, sl, tl)
-    if not word:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Word not found")
+def check_limit(name: str, value: Optional[int], maximum: int = 100) -> None:
+    """Rejects the limits the REST endpoints reject, for the GraphQL fields."""
+    if value is None or not 1 <= value <= maximum:
+        raise ValueError(f"{name} must be between 1 and {maximum}")
 
-    return word
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 
 @router.delete("/{word_text}", status_code=HTTPStatus.NO_CONTENT)
@@ -79,7 +323,51 @@ class WordQuery:
             for word in words
         ]
 
+    @strawberry.field
+    async def search(
+        self,
+        info,
+        query: str,
+        language: str,
+        first: Optional[int] = 20,
+        after: Optional[str] = None,
+    ) -> SearchPageType:
+        check_limit("first", first)
+        word_repo = info.context["word_repo"]
+        page = await word_repo.search(query, language, first, after)
+
+        return SearchPageType(
+            hits=[SearchHitType(**hit.model_dump()) for hit in page.hits],
+            next_cursor=page.next_cursor,
+        )
+
+    @strawberry.field
+    async def reverse(
+        self,
+        info,
+        translations: list[str],
+        language: str,
+        sl: Optional[str] = "auto",
+        partial: Optional[bool] = False,
+        first: Optional[int] = 20,
+    ) -> list[ReverseLookupType]:
+        check_limit("first", first)
+        if len(translations) > 100:
+            raise ValueError("translations accepts at most 100 values")
+        word_repo = info.context["word_repo"]
+        words = await word_repo.reverse_lookup(
+            translations, language, sl, partial, first
+        )
+
+        return [
+            ReverseLookupType(
+                translation=term,
+                words=[ReverseTranslationType(**word.model_dump()) for word in found],
+            )
+            for term, found in words.items()
+        ]
+
 
-schema = strawberry.Schema(WordQuery)
+schema = strawberry.Schema(WordQuery, extensions=[TracingExtension])
 
 graphql_router = GraphQLRouter(schema, context_getter=get_strawberry_context)
@@ -1,6 +1,8 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
+
+from app.domain.entities import JobStatus
 
 
 class DefinitionSchema(BaseModel):
@@ -27,3 +29,51 @@ class WordSchema(BaseModel):
     synonyms: Optional[list[SynonymSchema]] = None
     translations: Optional[list[TranslationSchema]] = None
     examples: Optional[list[ExampleSchema]] = None
+
+
+class SearchHitSchema(BaseModel):
+    word: str
+    word_language: str
+    language: str
+    kind: str
+    text: str
+    rank: float
+
+
+class SearchPageSchema(BaseModel):
+    hits: list[SearchHitSchema]
+    next_cursor: Optional[str] = None
+
+
+class SuggestionSchema(BaseModel):
+    word: str
+    language: str
+
+
+class ReverseTranslationSchema(BaseModel):
+    word: str
+    language: str
+    translation: str
+
+
+class JobSchema(BaseModel):
+    id: str
+    status: JobStatus
+    word: Optional[WordSchema] = None
+    error: Optional[str] = None
+
+
+class BulkDeleteSchema(BaseModel):
+    words: Optional[list[str]] = None
+    word_filter: Optional[str] = None
+    sl: str = "auto"
+
+    @model_validator(mode="after")
+    def check_selector(self) -> "BulkDeleteSchema":
+        if not self.words and not self.word_filter:
+            raise ValueError("Either words or word_filter must be given")
+        return self
+
+
+class BulkDeleteResultSchema(BaseModel):
+    deleted: int
@@ -37,3 +37,32 @@ class WordType:
     synonyms: Optional[List[SynonymType]] = None
     translations: Optional[List[TranslationType]] = None
     examples: Optional[List[ExampleType]] = None
+
+
+@strawberry.type
+class SearchHitType:
+    word: str
+    word_language: str
+    language: str
+    kind: str
+    text: str
+    rank: float
+
+
+@strawberry.type
+class SearchPageType:
+    hits: List[SearchHitType]
+    next_cursor: Optional[str] = None
+
+
+@strawberry.type
+class ReverseTranslationType:
+    word: str
+    language: str
+    translation: str
+
+
+@strawberry.type
+class ReverseLookupType:
+    translation: str
+    words: List[ReverseTranslationType]
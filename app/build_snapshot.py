@@ -0,0 +1,40 @@
+"""
+Builds the memory-mapped snapshot of hot word entries read by the workers.
+
+Run it periodically, e.g. `python -m app.build_snapshot` from cron. Entries
+are ranked by their popularity in `word_stats`. The new snapshot replaces
+the old one atomically, workers pick it up on their own.
+"""
+
+import argparse
+import asyncio
+
+from app.core import config
+from app.core.session import get_context
+from app.repo.pg.word import WordPgRepo
+from app.repo.snapshot import write_snapshot
+
+
+async def main(path: str, top_n: int) -> None:
+    repo = WordPgRepo(
+        _session_factory=get_context,
+        stats_half_life=config.settings.WORDS_STATS_HALF_LIFE_SECONDS,
+    )
+    entries = [entry async for entry in repo.get_hot_entries(top_n)]
+
+    written = write_snapshot(path, entries)
+    print(f"Wrote {written} entries to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", default=config.settings.WORDS_SNAPSHOT_PATH)
+    parser.add_argument(
+        "--top-n", type=int, default=config.settings.WORDS_SNAPSHOT_TOP_N
+    )
+    args = parser.parse_args()
+
+    if not args.path:
+        parser.error("--path is required when WORDS_SNAPSHOT_PATH is not set")
+
+    asyncio.run(main(args.path, args.top_n))
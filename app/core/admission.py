@@ -0,0 +1,109 @@
+"""
+Admission control for expensive request paths.
+
+A limiter bounds how many requests of one kind may be in flight on a worker.
+Requests above the limit wait for a free slot at most `max_wait` seconds and are
+rejected afterwards, so a burst is answered quickly instead of piling up.
+With `max_queue` set, requests finding that many others waiting are rejected
+right away.
+
+Every expensive route class has its own limiter, so shedding one of them
+leaves the others and cheap cache hits alone:
+
+- `db`: word lookups missing the snapshot and the cache, searches,
+- `scrape`: lookups missing the database, see `WordRepo`,
+- `graphql`: GraphQL pages,
+- `auth`: password hashing of logins and registrations.
+
+Rejections answer 503 with `Retry-After`, see app.api.handlers.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.core.metrics import Counter, Gauge
+
+IN_FLIGHT = Gauge(
+    "admission_in_flight", "Admitted requests per limiter.", labelnames=("name",)
+)
+WAITING = Gauge(
+    "admission_waiting",
+    "Requests waiting for a slot per limiter.",
+    labelnames=("name",),
+)
+SHED = Counter(
+    "admission_shed_total",
+    "Requests rejected per limiter and reason: queue_full or timeout.",
+    labelnames=("name", "reason"),
+)
+
+
+class AdmissionRejectedException(Exception):
+    """Request was not admitted within the allowed wait time."""
+
+    def __init__(self, name: str, retry_after: int, message: Optional[str] = None):
+        super().__init__(message or f"Too many concurrent '{name}' requests")
+        self.name = name
+        self.retry_after = retry_after
+
+
+@dataclass
+class AdmissionLimiter:
+    """Bounded in-flight limit with a queue-wait threshold."""
+
+    name: str
+    limit: int
+    max_wait: float
+    retry_after: int = 1
+    # waiting requests, None for no bound
+    max_queue: Optional[int] = None
+
+    _semaphore: asyncio.Semaphore = field(init=False, repr=False)
+    _waiting: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        self._semaphore = asyncio.Semaphore(self.limit)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Holds one slot for the duration of the block.
+
+        :raises AdmissionRejectedException: no slot was freed within `max_wait`
+            or too many requests wait already.
+        """
+        if self._semaphore.locked():
+            await self._wait()
+        else:
+            await self._semaphore.acquire()
+
+        IN_FLIGHT.inc(name=self.name)
+        try:
+            yield
+        finally:
+            IN_FLIGHT.dec(name=self.name)
+            self._semaphore.release()
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    async def _wait(self) -> None:
+        if self.max_queue is not None and self._waiting >= self.max_queue:
+            self._reject("queue_full")
+
+        self._waiting += 1
+        WAITING.inc(name=self.name)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self._reject("timeout")
+        finally:
+            self._waiting -= 1
+            WAITING.dec(name=self.name)
+
+    def _reject(self, reason: str) -> None:
+        SHED.inc(name=self.name, reason=reason)
+        raise AdmissionRejectedException(self.name, self.retry_after) from None
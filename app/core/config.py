@@ -38,6 +38,11 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ENVIRONMENT: Literal["DEV", "PYTEST", "STG", "PRD"] = "DEV"
     SECURITY_BCRYPT_ROUNDS: int = 12
+    SECURITY_HASHING_WORKERS: int = 2
+    # password hashing of logins and registrations, see app.core.admission
+    SECURITY_LOGIN_CONCURRENCY: int = 8
+    SECURITY_LOGIN_MAX_WAIT_SECONDS: float = 2.0
+    SECURITY_LOGIN_MAX_QUEUE: int | None = 32
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 11520  # 8 days
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 40320  # 28 days
     BACKEND_CORS_ORIGINS: list[AnyHttpUrl] = []
@@ -55,6 +60,129 @@ class Settings(BaseSettings):
     DEFAULT_DATABASE_PORT: int
     DEFAULT_DATABASE_DB: str
 
+    # POSTGRESQL READ REPLICA
+    # optional, lookups go to the default database when hostname is not set
+    READ_DATABASE_HOSTNAME: str | None = None
+    READ_DATABASE_PORT: int | None = None
+
+    # SQLALCHEMY CONNECTION POOL
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    # asyncpg prepared statements cache, set 0 behind pgbouncer
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+
+    # WORDS
+    WORDS_DELETE_BATCH_SIZE: int = 500
+    # answer misses with 202 and a job id, clients may ask for it
+    # per request with `Prefer: respond-async` header
+    WORDS_ASYNC_MISSES: bool = False
+    JOBS_TTL_SECONDS: int = 600
+    # autocomplete index is rebuilt from the database at this interval,
+    # 0 builds it at startup only
+    SUGGEST_REFRESH_SECONDS: int = 300
+    SUGGEST_MAX_CANDIDATES: int = 5000
+    # memory-mapped snapshot of hot entries built by `python -m app.build_snapshot`,
+    # consulted before the database when set
+    WORDS_SNAPSHOT_PATH: str | None = None
+    WORDS_SNAPSHOT_TOP_N: int = 10000
+    WORDS_SNAPSHOT_CHECK_SECONDS: float = 5.0
+    # in-process cache of assembled words per worker, 0 disables it;
+    # the most popular entries of every pair are loaded at startup
+    WORDS_CACHE_SIZE: int = 10000
+    WORDS_CACHE_TTL_SECONDS: float = 300.0
+    WORDS_CACHE_WARM_TOP_N: int = 1000
+    # hits are counted per worker and flushed to `word_stats` at this
+    # interval, 0 disables counting
+    WORDS_STATS_FLUSH_SECONDS: int = 60
+    WORDS_STATS_HALF_LIFE_SECONDS: float = 7 * 24 * 3600
+
+    # SCRAPER, limits are per worker process
+    SCRAPE_MAX_CONCURRENCY: int = 4
+    SCRAPE_MAX_CONCURRENCY_PER_PAIR: int = 2
+    SCRAPE_RATE_PER_SECOND: float = 1.0
+    SCRAPE_BURST: int = 5
+    SCRAPE_QUEUE_TIMEOUT_SECONDS: float = 10.0
+    # lean page-load profile of the headless browser, see GoogleWordRepo, off
+    # until `python -m app.tests.benchmarks.page_load` numbers are recorded
+    SCRAPE_LEAN_PROFILE: bool = False
+    # applies with both profiles
+    SCRAPE_PAGE_LOAD_STRATEGY: Literal["normal", "eager", "none"] = "normal"
+    SCRAPE_WINDOW_SIZE: str = "800,600"
+    SCRAPE_JS_FLAGS: str | None = None
+    # compressed snapshots of the scraped pages, extracted again by
+    # `python -m app.reprocess_pages` instead of scraping, see app.repo.pg.archive
+    SCRAPE_ARCHIVE_PAGES: bool = True
+    # offline dictionaries as "sl:tl:path", see app.repo.local.word
+    LOCAL_DICTIONARIES: list[str] = []
+    # providers asked on a database miss, in order, per "sl:tl" pair
+    # or "default", e.g. {"default": ["local", "scraper"], "en:fr": ["scraper"]}
+    WORDS_PROVIDER_CHAIN: dict[str, list[Literal["local", "scraper"]]] = {
+        "default": ["local", "scraper"]
+    }
+
+    # circuit breaker around the scraping provider
+    SCRAPE_BREAKER_FAILURE_RATE: float = 0.5
+    SCRAPE_BREAKER_WINDOW: int = 20
+    SCRAPE_BREAKER_MIN_CALLS: int = 5
+    SCRAPE_BREAKER_OPEN_SECONDS: float = 30.0
+
+    # scrapes run by `python -m app.scrape_worker` processes instead of the API
+    # workers, see app.repo.pg.queue
+    SCRAPE_QUEUE_ENABLED: bool = False
+    # how long a request waits for its queued scrape
+    SCRAPE_QUEUE_WAIT_SECONDS: float = 15.0
+    SCRAPE_WORKER_CONCURRENCY: int = 2
+    # idle workers also poll, notifications may be lost on reconnects
+    SCRAPE_WORKER_POLL_SECONDS: float = 5.0
+    # running jobs older than this are taken again, their worker is gone
+    SCRAPE_JOB_TIMEOUT_SECONDS: float = 120.0
+    SCRAPE_JOB_MAX_ATTEMPTS: int = 3
+    # finished jobs are deleted after
+    SCRAPE_JOB_RETENTION_SECONDS: float = 24 * 3600
+
+    # per worker in-flight limits of the expensive route classes, requests wait
+    # for a slot at most MAX_WAIT and are rejected right away when MAX_QUEUE
+    # others wait already, see app.core.admission
+    ADMISSION_DB_CONCURRENCY: int = 32
+    ADMISSION_DB_MAX_WAIT_SECONDS: float = 1.0
+    ADMISSION_DB_MAX_QUEUE: int | None = 64
+    ADMISSION_SCRAPE_CONCURRENCY: int = 16
+    ADMISSION_SCRAPE_MAX_WAIT_SECONDS: float = 0.5
+    ADMISSION_SCRAPE_MAX_QUEUE: int | None = 16
+    ADMISSION_GRAPHQL_CONCURRENCY: int = 8
+    ADMISSION_GRAPHQL_MAX_WAIT_SECONDS: float = 1.0
+    ADMISSION_GRAPHQL_MAX_QUEUE: int | None = 16
+
+    # time budget of a request, clients may ask for less with the header (seconds)
+    REQUEST_DEADLINE_SECONDS: float = 20.0
+    REQUEST_DEADLINE_HEADER: str = "X-Request-Timeout"
+
+    # spans of requests, repositories, SQL and scrapes, see app.core.tracing
+    TRACING_EXPORTER: Literal["none", "memory", "file", "otlp"] = "none"
+    TRACING_SERVICE_NAME: str = "translation-service"
+    # share of the traces started by this service that are recorded
+    TRACING_SAMPLE_RATE: float = 1.0
+    TRACING_EXPORT_INTERVAL_SECONDS: float = 5.0
+    TRACING_FILE_PATH: str = "spans.jsonl"
+    # OTLP/HTTP collector, spans are posted to <endpoint>/v1/traces
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318"
+    TRACING_OTLP_HEADERS: dict[str, str] = {}
+
+    # statements slower than the threshold are logged, 0 disables timing,
+    # see app.core.slow_queries
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    # capture plans of slow statements, re-runs them, default outside production
+    SLOW_QUERY_EXPLAIN: bool | None = None
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: float = 3600.0
+    SLOW_QUERY_MAX_ENTRIES: int = 500
+    # rotating JSON lines log, off unless set, every worker process writes
+    # its own file with its pid before the extension
+    SLOW_QUERY_LOG_PATH: str | None = None
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUPS: int = 5
+
     # POSTGRESQL TEST DATABASE
     TEST_DATABASE_HOSTNAME: str = "postgres"
     TEST_DATABASE_USER: str = "postgres"
@@ -80,6 +208,22 @@ class Settings(BaseSettings):
             )
         )
 
+    @computed_field
+    @cached_property
+    def READ_SQLALCHEMY_DATABASE_URI(self) -> str | None:
+        if not self.READ_DATABASE_HOSTNAME:
+            return None
+        return str(
+            PostgresDsn.build(
+                scheme="postgresql+asyncpg",
+                username=self.DEFAULT_DATABASE_USER,
+                password=self.DEFAULT_DATABASE_PASSWORD,
+                host=self.READ_DATABASE_HOSTNAME,
+                port=self.READ_DATABASE_PORT or self.DEFAULT_DATABASE_PORT,
+                path=self.DEFAULT_DATABASE_DB,
+            )
+        )
+
     @computed_field
     @cached_property
     def TEST_SQLALCHEMY_DATABASE_URI(self) -> str:
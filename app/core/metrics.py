@@ -0,0 +1,143 @@
+"""
+Minimal in-process metrics registry rendered in Prometheus text format.
+
+Metrics are kept per worker process, scrape `/metrics` of every worker
+(or run a single worker per container) to get the whole picture.
+
+https://prometheus.io/docs/instrumenting/exposition_formats/
+"""
+
+import bisect
+import math
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not labelnames:
+        return ""
+    pairs = ",".join(f'{name}="{value}"' for name, value in zip(labelnames, values))
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+@dataclass
+class Metric(ABC):
+    name: str
+    documentation: str
+    labelnames: tuple[str, ...] = ()
+
+    type_name = "untyped"
+
+    def __post_init__(self):
+        REGISTRY.register(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> list[tuple[str, str, float]]:
+        """(sample name, formatted labels, value) of every series."""
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+@dataclass
+class Counter(Metric):
+    type_name = "counter"
+
+    _values: dict[tuple[str, ...], float] = field(
+        default_factory=lambda: defaultdict(float), init=False, repr=False
+    )
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        self._values[self._key(labels)] += amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        return [
+            (self.name, _format_labels(self.labelnames, key), value)
+            for key, value in sorted(self._values.items())
+        ]
+
+
+@dataclass
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self._values[self._key(labels)] -= amount
+
+
+@dataclass
+class Histogram(Metric):
+    type_name = "histogram"
+
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+
+    _counts: dict[tuple[str, ...], list[int]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _sums: dict[tuple[str, ...], float] = field(
+        default_factory=lambda: defaultdict(float), init=False, repr=False
+    )
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        samples = []
+        for key, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                labels = _format_labels(
+                    (*self.labelnames, "le"), (*key, _format_value(bound))
+                )
+                samples.append((f"{self.name}_bucket", labels, cumulative))
+            labels = _format_labels(self.labelnames, key)
+            samples.append((f"{self.name}_sum", labels, self._sums[key]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
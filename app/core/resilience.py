@@ -0,0 +1,249 @@
+"""
+Failure isolation for the scrape path.
+
+Circuit breaker: the outcomes of the last `window` calls to a provider are
+kept, once at least `min_calls` of them are known and the failure share reaches
+`failure_rate` the breaker opens and calls fail immediately with
+`CircuitOpenException`. After `open_seconds` it lets `half_open_calls` probe
+calls through, a successful probe closes it, a failed one opens it again.
+
+Deadline: every request gets a time budget, the server default or a shorter one
+asked by the client with the deadline header. The deadline lives in a context
+variable, so anything awaited on behalf of the request (database lookup,
+scheduler wait, scrape) can bound itself by the remaining budget and fail with
+`DeadlineExceededException` instead of hanging.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Optional, TypeVar
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.admission import AdmissionRejectedException
+from app.core.metrics import Counter, Gauge
+
+T = TypeVar("T")
+
+BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state: 0 closed, 1 half-open, 2 open.",
+    labelnames=("name",),
+)
+BREAKER_REJECTIONS = Counter(
+    "circuit_breaker_rejections_total",
+    "Calls failed fast by an open circuit breaker.",
+    labelnames=("name",),
+)
+DEADLINES_EXCEEDED = Counter(
+    "request_deadlines_exceeded_total", "Operations cut by the request deadline."
+)
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class CircuitOpenException(AdmissionRejectedException):
+    """Provider is failing, the call was not attempted."""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(name, retry_after, f"'{name}' is temporarily unavailable")
+
+
+class DeadlineExceededException(Exception):
+    """Request time budget is exhausted."""
+
+    pass
+
+
+class BreakerState(IntEnum):
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+@dataclass
+class CircuitBreaker:
+    name: str
+    failure_rate: float = 0.5
+    window: int = 20
+    min_calls: int = 5
+    open_seconds: float = 30
+    half_open_calls: int = 1
+
+    state: BreakerState = field(default=BreakerState.CLOSED, init=False)
+    _outcomes: deque = field(init=False, repr=False)
+    _opened_at: float = field(default=0, init=False, repr=False)
+    _probes: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        self._outcomes = deque(maxlen=self.window)
+        BREAKER_STATE.set(self.state, name=self.name)
+
+    async def run(
+        self,
+        factory: Callable[[], Awaitable[T]],
+        is_failure: Callable[[T], bool] = lambda result: False,
+    ) -> T:
+        """Runs the coroutine produced by `factory` unless the breaker is open.
+        Exceptions and results matching `is_failure` count as failures.
+
+        :raises CircuitOpenException: breaker is open.
+        """
+        self.allow()
+        try:
+            result = await factory()
+        except Exception:
+            self.record(success=False)
+            raise
+        except BaseException:
+            # cancelled by the caller, says nothing about the provider
+            self.record(success=None)
+            raise
+        self.record(success=not is_failure(result))
+        return result
+
+    def check(self) -> None:
+        """Fails fast without admitting a call.
+
+        :raises CircuitOpenException: breaker is open.
+        """
+        if self.state == BreakerState.OPEN:
+            left = self._opened_at + self.open_seconds - time.monotonic()
+            if left > 0:
+                BREAKER_REJECTIONS.inc(name=self.name)
+                raise CircuitOpenException(self.name, max(1, round(left)))
+
+    def allow(self) -> None:
+        """Admits a call, it must be followed by `record`.
+
+        :raises CircuitOpenException: breaker is open.
+        """
+        if self.state == BreakerState.OPEN:
+            self.check()
+            self._set_state(BreakerState.HALF_OPEN)
+
+        if self.state == BreakerState.HALF_OPEN:
+            if self._probes >= self.half_open_calls:
+                BREAKER_REJECTIONS.inc(name=self.name)
+                raise CircuitOpenException(self.name, 1)
+            self._probes += 1
+
+    def record(self, success: Optional[bool]) -> None:
+        """Records the outcome of an admitted call, None gives the call back
+        without an outcome."""
+        if self.state == BreakerState.HALF_OPEN:
+            self._probes -= 1
+            if success is None:
+                return
+            if success:
+                self._outcomes.clear()
+                self._set_state(BreakerState.CLOSED)
+            else:
+                self._open()
+            return
+
+        if success is None:
+            return
+        self._outcomes.append(success)
+        failures = self._outcomes.count(False)
+        if (
+            self.state == BreakerState.CLOSED
+            and len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.failure_rate
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._set_state(BreakerState.OPEN)
+
+    def _set_state(self, state: BreakerState) -> None:
+        self.state = state
+        BREAKER_STATE.set(state, name=self.name)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Sets the deadline `seconds` from now for the block, None removes it.
+    A nested scope never extends the enclosing deadline."""
+    deadline = None if seconds is None else time.monotonic() + seconds
+    current = _deadline.get()
+    if deadline is not None and current is not None:
+        deadline = min(deadline, current)
+
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the deadline, None without a deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def bound_timeout(timeout: Optional[float]) -> Optional[float]:
+    """The smaller of `timeout` and the remaining budget."""
+    left = remaining()
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
+
+
+def check_deadline() -> None:
+    """:raises DeadlineExceededException: no time left."""
+    if remaining() == 0:
+        DEADLINES_EXCEEDED.inc()
+        raise DeadlineExceededException("Request deadline exceeded")
+
+
+async def with_deadline(awaitable: Awaitable[T]) -> T:
+    """Awaits within the remaining budget.
+
+    :raises DeadlineExceededException: budget ran out first.
+    """
+    left = remaining()
+    if left is None:
+        return await awaitable
+
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError:
+        DEADLINES_EXCEEDED.inc()
+        raise DeadlineExceededException("Request deadline exceeded") from None
+
+
+class DeadlineMiddleware:
+    """Gives every HTTP request `default` seconds, clients may ask for less
+    with the `header` in seconds."""
+
+    def __init__(self, app: ASGIApp, default: float, header: str):
+        self.app = app
+        self.default = default
+        self.header = header.lower().encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        seconds = self.default
+        for name, value in scope["headers"]:
+            if name == self.header:
+                try:
+                    seconds = min(seconds, max(0.0, float(value)))
+                except ValueError:
+                    pass
+                break
+
+        with deadline_scope(seconds):
+            await self.app(scope, receive, send)
@@ -0,0 +1,254 @@
+"""
+Scheduler in front of the scraping provider.
+
+Every scrape starts a browser, so they are admitted one by one:
+
+- a global token bucket bounds the rate of scrapes started per worker,
+- at most `max_concurrency` scrapes run at once, and at most
+  `max_concurrency_per_pair` of them for one (sl, tl) language pair,
+- waiting requests are served by priority (interactive before background
+  jobs such as prewarm or refresh) and then in arrival order,
+- a request waiting longer than its timeout leaves the queue with
+  `ScrapeQueueTimeoutException`, or `DeadlineExceededException` when the
+  request deadline comes first.
+"""
+
+import asyncio
+import bisect
+import itertools
+import time
+from collections import Counter as CounterDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Optional, TypeVar
+
+from app.core.admission import AdmissionRejectedException
+from app.core.metrics import Counter, Gauge, Histogram
+from app.core.resilience import bound_timeout, check_deadline
+
+T = TypeVar("T")
+
+QUEUE_DEPTH = Gauge(
+    "scrape_queue_depth", "Scrapes waiting for a slot.", labelnames=("priority",)
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "scrape_queue_wait_seconds",
+    "Time spent waiting for a scrape slot.",
+    labelnames=("priority",),
+)
+QUEUE_TIMEOUTS = Counter(
+    "scrape_queue_timeouts_total",
+    "Scrapes dropped after waiting too long for a slot.",
+    labelnames=("priority",),
+)
+IN_FLIGHT = Gauge("scrape_in_flight", "Scrapes currently running.")
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class ScrapeQueueTimeoutException(AdmissionRejectedException):
+    """Scrape did not get a slot within the queue wait timeout."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("scrape", retry_after)
+
+
+@dataclass
+class TokenBucket:
+    """Classic token bucket, refilled lazily on access."""
+
+    rate: float
+    capacity: float
+
+    _tokens: float = field(init=False)
+    _updated_at: float = field(init=False)
+
+    def __post_init__(self):
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def try_take(self) -> bool:
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def wait_time(self) -> float:
+        """Seconds until the next token is available."""
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    pair: tuple[str, str] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+class ScrapeScheduler:
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_concurrency_per_pair: int,
+        rate: float,
+        burst: int,
+        queue_timeout: float,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_pair = max_concurrency_per_pair
+        self.queue_timeout = queue_timeout
+        self._bucket = TokenBucket(rate=rate, capacity=burst)
+        # kept sorted by (priority, arrival)
+        self._waiters: list[_Waiter] = []
+        self._running = 0
+        self._running_per_pair: CounterDict[tuple[str, str]] = CounterDict()
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def run(
+        self,
+        factory: Callable[[], Awaitable[T]],
+        sl: str,
+        tl: str,
+        priority: Priority = Priority.INTERACTIVE,
+        timeout: Optional[float] = None,
+    ) -> T:
+        """Waits for a slot and runs the coroutine produced by `factory` in it.
+
+        :raises ScrapeQueueTimeoutException: no slot within the timeout.
+        :raises DeadlineExceededException: no slot within the request deadline.
+        """
+        async with self.slot(sl, tl, priority, timeout):
+            return await factory()
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        sl: str,
+        tl: str,
+        priority: Priority = Priority.INTERACTIVE,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[None]:
+        """Holds one scrape slot for the duration of the block.
+
+        :raises ScrapeQueueTimeoutException: no slot within the timeout.
+        """
+        pair = (sl, tl)
+        await self._acquire(pair, priority, timeout)
+        try:
+            yield
+        finally:
+            self._release(pair)
+
+    async def _acquire(
+        self, pair: tuple[str, str], priority: Priority, timeout: Optional[float]
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            priority=priority,
+            seq=next(self._seq),
+            pair=pair,
+            future=loop.create_future(),
+            enqueued_at=loop.time(),
+        )
+        bisect.insort(self._waiters, waiter)
+        self._dispatch()
+        self._update_depth()
+
+        if timeout is None:
+            timeout = self.queue_timeout
+
+        try:
+            done, _ = await asyncio.wait(
+                {waiter.future}, timeout=bound_timeout(timeout)
+            )
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+
+        label = priority.name.lower()
+        if not done:
+            self._abandon(waiter)
+            QUEUE_TIMEOUTS.inc(priority=label)
+            # request budget ran out before the queue timeout
+            check_deadline()
+            raise ScrapeQueueTimeoutException(
+                retry_after=max(1, round(self._bucket.wait_time()))
+            )
+
+        QUEUE_WAIT_SECONDS.observe(loop.time() - waiter.enqueued_at, priority=label)
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        if waiter.future.done():
+            # slot was granted in the meantime, give it back
+            self._release(waiter.pair)
+            return
+        waiter.future.cancel()
+        self._waiters.remove(waiter)
+        self._update_depth()
+
+    def _release(self, pair: tuple[str, str]) -> None:
+        self._running -= 1
+        self._running_per_pair[pair] -= 1
+        if not self._running_per_pair[pair]:
+            del self._running_per_pair[pair]
+        IN_FLIGHT.set(self._running)
+        self._dispatch()
+        self._update_depth()
+
+    def _dispatch(self) -> None:
+        granted = []
+
+        for waiter in self._waiters:
+            if self._running >= self.max_concurrency:
+                break
+            if self._running_per_pair[waiter.pair] >= self.max_concurrency_per_pair:
+                continue
+            if not self._bucket.try_take():
+                self._schedule_wakeup(self._bucket.wait_time())
+                break
+
+            self._running += 1
+            self._running_per_pair[waiter.pair] += 1
+            waiter.future.set_result(None)
+            granted.append(waiter)
+
+        for waiter in granted:
+            self._waiters.remove(waiter)
+        IN_FLIGHT.set(self._running)
+
+    def _schedule_wakeup(self, delay: float) -> None:
+        if self._wakeup is not None:
+            return
+
+        def wakeup():
+            self._wakeup = None
+            self._dispatch()
+            self._update_depth()
+
+        self._wakeup = asyncio.get_running_loop().call_later(delay, wakeup)
+
+    def _update_depth(self) -> None:
+        depth = CounterDict(waiter.priority for waiter in self._waiters)
+        for priority in Priority:
+            QUEUE_DEPTH.set(depth[priority], priority=priority.name.lower())
@@ -1,6 +1,9 @@
 """Black-box security shortcuts to generate JWT tokens and password hashing and verifcation."""
 
+import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 import jwt
 from passlib.context import CryptContext
@@ -8,6 +11,7 @@ from pydantic import BaseModel
 
 from app.api.schemas.responses import AccessTokenResponse
 from app.core import config
+from app.core.admission import AdmissionLimiter
 
 JWT_ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_SECS = config.settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
@@ -16,6 +20,22 @@ PWD_CONTEXT = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto",
     bcrypt__rounds=config.settings.SECURITY_BCRYPT_ROUNDS,
+    # hashes made with any other number of rounds are flagged for rehashing
+    bcrypt__min_rounds=config.settings.SECURITY_BCRYPT_ROUNDS,
+    bcrypt__max_rounds=config.settings.SECURITY_BCRYPT_ROUNDS,
+)
+# bcrypt releases the GIL, so a small dedicated pool keeps the event loop free
+# and bounds how many cores a burst of logins can take away from other requests
+PWD_EXECUTOR = ThreadPoolExecutor(
+    max_workers=config.settings.SECURITY_HASHING_WORKERS,
+    thread_name_prefix="password-hashing",
+)
+# shared by every endpoint hashing passwords
+AUTH_LIMITER = AdmissionLimiter(
+    name="auth",
+    limit=config.settings.SECURITY_LOGIN_CONCURRENCY,
+    max_wait=config.settings.SECURITY_LOGIN_MAX_WAIT_SECONDS,
+    max_queue=config.settings.SECURITY_LOGIN_MAX_QUEUE,
 )
 
 
@@ -87,3 +107,30 @@ def get_password_hash(password: str) -> str:
     It takes about 0.3s for default 12 rounds of SECURITY_BCRYPT_DEFAULT_ROUNDS.
     """
     return PWD_CONTEXT.hash(password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """Verifies plain and hashed password matches and rehashes it if needed
+
+    Returns new hash as the second element when stored one was made with
+    other than current SECURITY_BCRYPT_ROUNDS, None otherwise.
+    """
+    return PWD_CONTEXT.verify_and_update(plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """Same as `verify_and_update_password`, but runs on PWD_EXECUTOR."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        PWD_EXECUTOR, verify_and_update_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Same as `get_password_hash`, but runs on PWD_EXECUTOR."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(PWD_EXECUTOR, get_password_hash, password)
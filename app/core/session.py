@@ -2,31 +2,65 @@
 SQLAlchemy async engine and sessions tools
 
 https://docs.sqlalchemy.org/en/20/orm/extensions/asyncio.html
+
+`async_engine` points to the primary database and serves writes.
+`async_read_engine` serves lookups: it points to the read replica when
+`READ_DATABASE_HOSTNAME` is set and shares the primary pool otherwise.
+Its connections run in autocommit mode, so lookups do not open transactions.
 """
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from app.core import config
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
 if config.settings.ENVIRONMENT == "PYTEST":
     sqlalchemy_database_uri = config.settings.TEST_SQLALCHEMY_DATABASE_URI
+    sqlalchemy_read_database_uri = None
 else:
     sqlalchemy_database_uri = config.settings.DEFAULT_SQLALCHEMY_DATABASE_URI
+    sqlalchemy_read_database_uri = config.settings.READ_SQLALCHEMY_DATABASE_URI
 
 
-async_engine = create_async_engine(sqlalchemy_database_uri, pool_pre_ping=True)
-async_session = async_sessionmaker(async_engine, expire_on_commit=False)
+def _create_engine(uri: str) -> "AsyncEngine":
+    return create_async_engine(
+        uri,
+        pool_size=config.settings.DATABASE_POOL_SIZE,
+        max_overflow=config.settings.DATABASE_MAX_OVERFLOW,
+        pool_recycle=config.settings.DATABASE_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=config.settings.DATABASE_POOL_PRE_PING,
+        connect_args={
+            "statement_cache_size": config.settings.DATABASE_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": config.settings.DATABASE_STATEMENT_CACHE_SIZE,
+        },
+    )
 
 
-from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
-from typing import TYPE_CHECKING
+async_engine = _create_engine(sqlalchemy_database_uri)
+async_session = async_sessionmaker(async_engine, expire_on_commit=False)
 
-if TYPE_CHECKING:
-    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+if sqlalchemy_read_database_uri:
+    async_read_engine = _create_engine(sqlalchemy_read_database_uri)
+else:
+    async_read_engine = async_engine
+async_read_engine = async_read_engine.execution_options(isolation_level="AUTOCOMMIT")
+async_read_session = async_sessionmaker(async_read_engine, expire_on_commit=False)
 
 
 @asynccontextmanager
 async def get_context() -> AsyncIterator["AsyncSession"]:
     async with async_session.begin() as session:
         yield session
+
+
+@asynccontextmanager
+async def get_read_context() -> AsyncIterator["AsyncSession"]:
+    """Non-transactional session for lookups, do not write through it."""
+    async with async_read_session() as session:
+        yield session
@@ -0,0 +1,246 @@
+"""
+Slow-query log of the SQLAlchemy engines.
+
+Statements running longer than the threshold are aggregated per normalized
+SQL (literals and placeholders replaced with `?`, IN lists collapsed) with
+their count, total and maximum time and the shape of their parameters, and
+written to a rotating JSON lines log when `log_path` is set. Every process
+writes its own file, with its pid before the extension, as rotation is not
+safe across processes. `GET /admin/slow-queries` lists the top offenders by
+total time.
+
+Outside production the first slow run of every statement also captures its
+plan on the same connection, inside a savepoint: `EXPLAIN (ANALYZE, BUFFERS)`
+for plain SELECTs, plain `EXPLAIN` for the others, so writes and locks are not
+repeated. The plan is captured again after `explain_interval` seconds.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from logging.handlers import RotatingFileHandler
+from typing import TYPE_CHECKING, Any, Optional
+
+from sqlalchemy import event
+
+from app.core.metrics import Counter
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERIES = Counter(
+    "db_slow_queries_total", "Statements slower than the slow-query threshold."
+)
+
+_LITERALS = re.compile(
+    r"""
+    '(?:[^']|'')*'              # string
+    | \$\d+(?:::\w+(?:\[\])?)?   # placeholder with its cast
+    | \b\d+(?:\.\d+)?\b         # number
+    """,
+    re.VERBOSE,
+)
+_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+_SPACES = re.compile(r"\s+")
+# writes, locks and data-modifying CTEs are not run again by EXPLAIN ANALYZE
+_UNSAFE_TO_ANALYZE = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|FOR\s+(NO\s+KEY\s+|KEY\s+)?(UPDATE|SHARE))\b",
+    re.IGNORECASE,
+)
+
+
+def normalize_sql(statement: str) -> str:
+    """The statement with literals and placeholders replaced by `?`."""
+    normalized = _LITERALS.sub("?", statement)
+    normalized = _LISTS.sub("?, ...", normalized)
+    return _SPACES.sub(" ", normalized).strip()
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Types of the parameters, without their values."""
+    if executemany:
+        rows = list(parameters)
+        return f"{len(rows)} x {parameter_shape(rows[0])}" if rows else "0 x ()"
+    if isinstance(parameters, dict):
+        return (
+            "{"
+            + ", ".join(f"{k}: {_type_name(v)}" for k, v in parameters.items())
+            + "}"
+        )
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(_type_name(v) for v in parameters) + ")"
+    return "()"
+
+
+def _type_name(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+@dataclass
+class SlowQuery:
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    parameters: str = "()"
+    plan: Optional[str] = None
+    explained_at: Optional[float] = None
+    last_seen: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+@dataclass
+class SlowQueryLog:
+    threshold_ms: float = 200.0
+    # capture plans, keep off in production
+    explain: bool = False
+    explain_interval: float = 3600.0
+    # statements kept, the lowest total time is forgotten first
+    max_entries: int = 500
+    log_path: Optional[str] = None
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backups: int = 5
+
+    _entries: dict[str, SlowQuery] = field(default_factory=dict, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _log: Optional[logging.Logger] = field(default=None, init=False, repr=False)
+    _log_pid: Optional[int] = field(default=None, init=False, repr=False)
+
+    def _file_log(self) -> Optional[logging.Logger]:
+        """The log file of the current process, opened again after a fork."""
+        if not self.log_path:
+            return None
+        pid = os.getpid()
+        if self._log_pid != pid:
+            root, extension = os.path.splitext(self.log_path)
+            handler = RotatingFileHandler(
+                f"{root}.{pid}{extension}",
+                maxBytes=self.log_max_bytes,
+                backupCount=self.log_backups,
+                encoding="utf-8",
+                delay=True,
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._log = logging.Logger(f"{__name__}.file")
+            self._log.addHandler(handler)
+            self._log_pid = pid
+        return self._log
+
+    def top(self, limit: int = 20) -> list[SlowQuery]:
+        """Statements with the highest total time first."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return sorted(entries, key=lambda entry: entry.total_ms, reverse=True)[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def record(
+        self,
+        statement: str,
+        elapsed_ms: float,
+        parameters: str,
+        plan: Optional[str] = None,
+    ) -> SlowQuery:
+        SLOW_QUERIES.inc()
+        sql = normalize_sql(statement)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(sql)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    least = min(self._entries.values(), key=lambda e: e.total_ms)
+                    del self._entries[least.sql]
+                entry = self._entries[sql] = SlowQuery(sql=sql)
+            entry.count += 1
+            entry.total_ms += elapsed_ms
+            entry.max_ms = max(entry.max_ms, elapsed_ms)
+            entry.parameters = parameters
+            entry.last_seen = now
+            if plan is not None:
+                entry.plan, entry.explained_at = plan, now
+
+        file_log = self._file_log()
+        if file_log is not None:
+            file_log.info(
+                json.dumps(
+                    {
+                        "time": now,
+                        "elapsed_ms": round(elapsed_ms, 3),
+                        "sql": sql,
+                        "parameters": parameters,
+                        "plan": plan,
+                    }
+                )
+            )
+        return entry
+
+    def needs_plan(self, statement: str) -> bool:
+        if not self.explain:
+            return False
+        entry = self._entries.get(normalize_sql(statement))
+        return (
+            entry is None
+            or entry.explained_at is None
+            or time.time() - entry.explained_at > self.explain_interval
+        )
+
+    def instrument(self, engine: "AsyncEngine") -> None:
+        """Times every statement of the engine."""
+        sync_engine = getattr(engine, "sync_engine", engine)
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+            context._slow_query_started = time.perf_counter()
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+            started = getattr(context, "_slow_query_started", None)
+            if started is None:
+                return
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if elapsed_ms < self.threshold_ms:
+                return
+
+            plan = None
+            if not many and self.needs_plan(statement):
+                plan = explain(conn.connection.dbapi_connection, statement, parameters)
+            self.record(statement, elapsed_ms, parameter_shape(parameters, many), plan)
+
+
+def explain(dbapi_connection, statement: str, parameters: Any) -> Optional[str]:
+    """Plan of the statement, run on the connection that ran it. A failure is
+    rolled back to a savepoint and does not affect the transaction."""
+    analyze = not _UNSAFE_TO_ANALYZE.search(statement)
+    options = "(ANALYZE, BUFFERS)" if analyze else ""
+    in_transaction = not getattr(dbapi_connection, "autocommit", False)
+
+    cursor = dbapi_connection.cursor()
+    try:
+        if in_transaction:
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN {options} {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception:
+            if in_transaction:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            logger.warning("Cannot explain slow statement", exc_info=True)
+            plan = None
+        if in_transaction:
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    finally:
+        cursor.close()
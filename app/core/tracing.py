@@ -0,0 +1,503 @@
+"""
+Minimal request-scoped tracing with W3C trace context propagation.
+
+Spans of a request form a tree through a context variable, so they follow
+the request into tasks, threads (`asyncio.to_thread`) and the SQLAlchemy
+event hooks. Traced:
+
+- HTTP requests, by `TracingMiddleware`, which continues the trace of an
+  incoming `traceparent` header,
+- `WordRepo.get`, `WordPgRepo.get`, `save` and `get_pages`,
+- every SQL statement, see `instrument_engine`,
+- the phases of a scrape: driver start, page load and extraction,
+- GraphQL operations and root field resolvers, see `TracingExtension`,
+- scrape jobs in the scrape workers, continued from the request that queued
+  them through the `traceparent` stored with the job.
+
+Finished spans go to the exporter of the tracer: `InMemoryExporter` for tests,
+`FileExporter` writing JSON lines, or `OTLPExporter` sending OTLP/HTTP JSON
+to a collector. Exports run in a background thread and never block requests.
+Tracing is off until `configure` is called, spans cost a context manager then.
+
+https://www.w3.org/TR/trace-context/
+https://opentelemetry.io/docs/specs/otlp/#otlphttp
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import random
+import re
+import secrets
+import threading
+import time
+import urllib.request
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Optional, Protocol, TypeVar
+
+from sqlalchemy import event
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from strawberry.extensions import SchemaExtension
+
+from app.core import config
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+AsyncFunction = TypeVar("AsyncFunction", bound=Callable[..., Awaitable])
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+# longer statements are cut in the `db.statement` attribute
+MAX_STATEMENT_LENGTH = 2000
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    # server for requests, client for SQL statements, internal otherwise
+    kind: str = "internal"
+    sampled: bool = True
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: list[Span]) -> None:
+        ...
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Span]:
+    """Remote parent span of a `traceparent` header, None if malformed."""
+    match = TRACEPARENT.match((header or "").strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return Span(
+        name="remote",
+        trace_id=trace_id,
+        span_id=span_id,
+        sampled=bool(int(flags, 16) & 1),
+    )
+
+
+@dataclass
+class Tracer:
+    # None disables tracing
+    exporter: Optional[SpanExporter] = None
+    # share of traces started here that are recorded, incoming traces keep
+    # the decision of their parent
+    sample_rate: float = 1.0
+    # spans waiting for the export thread, more are dropped
+    max_queue: int = 2048
+    batch_size: int = 512
+    export_interval: float = 5.0
+
+    _queue: deque = field(init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _wakeup: threading.Event = field(default_factory=threading.Event, init=False)
+    _thread: Optional[threading.Thread] = field(default=None, init=False)
+
+    def __post_init__(self):
+        self._queue = deque(maxlen=self.max_queue)
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: str = "internal",
+        parent: Optional[Span] = None,
+        **attributes: Any,
+    ) -> Iterator[Optional[Span]]:
+        """Runs the block in a child span of `parent`, of the current span by
+        default. Yields None when tracing is off."""
+        span = self.start_span(name, kind, parent, **attributes)
+        if span is None:
+            yield None
+            return
+
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current.reset(token)
+            self.end_span(span)
+
+    def start_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        parent: Optional[Span] = None,
+        **attributes: Any,
+    ) -> Optional[Span]:
+        """Starts a span without making it current, see `end_span`. Spans of
+        traces not sampled only carry the decision to their children."""
+        if self.exporter is None:
+            return None
+
+        parent = parent or _current.get()
+        if parent is None:
+            trace_id = secrets.token_hex(16)
+            sampled = random.random() < self.sample_rate
+        else:
+            trace_id = parent.trace_id
+            sampled = parent.sampled
+
+        return Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            kind=kind,
+            sampled=sampled,
+            attributes=attributes,
+        )
+
+    def end_span(self, span: Span) -> None:
+        if not span.sampled or self.exporter is None:
+            return
+        span.end_ns = time.time_ns()
+        self._queue.append(span)
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+        self._start_thread()
+
+    def flush(self) -> None:
+        """Exports the finished spans now, in the calling thread."""
+        with self._lock:
+            if self.exporter is None:
+                self._queue.clear()
+                return
+            while self._queue:
+                batch = [
+                    self._queue.popleft()
+                    for _ in range(min(self.batch_size, len(self._queue)))
+                ]
+                try:
+                    self.exporter.export(batch)
+                except Exception:
+                    logger.exception("Cannot export %d spans", len(batch))
+
+    def _start_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="span-exporter", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.export_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+def traced(name: str) -> Callable[[AsyncFunction], AsyncFunction]:
+    """Runs every call of the coroutine function in a span of the global tracer."""
+
+    def decorator(function: AsyncFunction) -> AsyncFunction:
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            with TRACER.span(name):
+                return await function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class InMemoryExporter:
+    """Keeps the spans in memory, for tests."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def export(self, spans: list[Span]) -> None:
+        self.spans.extend(spans)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class FileExporter:
+    """Appends the spans to a file as JSON lines."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: list[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            for span in spans:
+                file.write(json.dumps(asdict(span), default=str) + "\n")
+
+
+class OTLPExporter:
+    """Sends the spans to an OpenTelemetry collector over OTLP/HTTP JSON."""
+
+    KINDS = {"internal": 1, "server": 2, "client": 3}
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str,
+        headers: Optional[dict[str, str]] = None,
+        timeout: float = 10.0,
+    ):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.timeout = timeout
+
+    def export(self, spans: list[Span]) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(self.encode(spans)).encode(),
+            headers=self.headers,
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+    def encode(self, spans: list[Span]) -> dict:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _attributes({"service.name": self.service_name})
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [self._encode_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def _encode_span(self, span: Span) -> dict:
+        encoded = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": self.KINDS[span.kind],
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": _attributes(span.attributes),
+            # unset or error
+            "status": {"code": 2, "message": span.error} if span.error else {},
+        }
+        if span.parent_id:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+
+def _attributes(attributes: dict[str, Any]) -> list[dict]:
+    def value(v: Any) -> dict:
+        if isinstance(v, bool):
+            return {"boolValue": v}
+        if isinstance(v, int):
+            return {"intValue": str(v)}
+        if isinstance(v, float):
+            return {"doubleValue": v}
+        return {"stringValue": str(v)}
+
+    return [{"key": key, "value": value(v)} for key, v in attributes.items()]
+
+
+class TracingMiddleware:
+    """Runs every HTTP request in a server span, continuing the trace of the
+    `traceparent` header, and returns the span in the `traceparent` header
+    of the response."""
+
+    def __init__(self, app: ASGIApp, tracer: Optional[Tracer] = None):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tracer = self.tracer or TRACER
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        parent = parse_traceparent(Headers(scope=scope).get("traceparent"))
+        method = scope["method"]
+        with tracer.span(
+            f"{method} {scope['path']}",
+            kind="server",
+            parent=parent,
+            **{"http.method": method, "http.target": scope["path"]},
+        ) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_traced(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    headers = list(message.get("headers", []))
+                    headers.append((b"traceparent", span.traceparent.encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_traced)
+            finally:
+                # set by the router of the innermost app that matched
+                endpoint = scope.get("endpoint")
+                if endpoint is not None:
+                    span.name = f"{method} {endpoint.__name__}"
+
+
+class TracingExtension(SchemaExtension):
+    """Spans of GraphQL operations and of their root field resolvers, nested
+    fields run in the span of their root field."""
+
+    def on_operation(self) -> Iterator[None]:
+        with TRACER.span("graphql.operation") as span:
+            yield
+            if span is not None and self.execution_context.operation_name:
+                span.set_attribute(
+                    "graphql.operation.name", self.execution_context.operation_name
+                )
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        if info.path.prev is not None or not TRACER.enabled:
+            return _next(root, info, *args, **kwargs)
+        return self._resolve_traced(_next, root, info, *args, **kwargs)
+
+    async def _resolve_traced(self, _next, root, info, *args, **kwargs):
+        with TRACER.span(
+            f"graphql.resolve {info.field_name}", **{"graphql.field": info.field_name}
+        ):
+            result = _next(root, info, *args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+
+def instrument_engine(engine: "AsyncEngine") -> None:
+    """Traces every statement of the SQLAlchemy engine as a client span."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if not TRACER.enabled:
+            return
+        span = TRACER.start_span(
+            statement.split(None, 1)[0].upper() if statement else "SQL",
+            kind="client",
+            **{
+                "db.system": "postgresql",
+                "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            },
+        )
+        if span is not None:
+            context._trace_span = span
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            context._trace_span = None
+            span.set_attribute("db.rows", cursor.rowcount)
+            TRACER.end_span(span)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            context._trace_span = None
+            span.record_error(exception_context.original_exception)
+            TRACER.end_span(span)
+
+
+# global tracer of the process, see `configure`
+TRACER = Tracer()
+
+
+def create_exporter(
+    kind: str,
+    service_name: str,
+    file_path: Optional[str] = None,
+    otlp_endpoint: Optional[str] = None,
+    otlp_headers: Optional[dict[str, str]] = None,
+) -> Optional[SpanExporter]:
+    """Exporter of the TRACING_EXPORTER setting: none, memory, file or otlp."""
+    if kind == "memory":
+        return InMemoryExporter()
+    if kind == "file":
+        return FileExporter(file_path)
+    if kind == "otlp":
+        return OTLPExporter(otlp_endpoint, service_name, otlp_headers)
+    return None
+
+
+def configure(
+    exporter: Optional[SpanExporter],
+    sample_rate: float = 1.0,
+    export_interval: float = 5.0,
+) -> Tracer:
+    """Points the global tracer to the exporter, None turns tracing off."""
+    TRACER.flush()
+    TRACER.exporter = exporter
+    TRACER.sample_rate = sample_rate
+    TRACER.export_interval = export_interval
+    return TRACER
+
+
+def configure_from_settings() -> Tracer:
+    """Configures the global tracer with the TRACING_* settings."""
+    settings = config.settings
+    return configure(
+        create_exporter(
+            settings.TRACING_EXPORTER,
+            settings.TRACING_SERVICE_NAME,
+            file_path=settings.TRACING_FILE_PATH,
+            otlp_endpoint=settings.TRACING_OTLP_ENDPOINT,
+            otlp_headers=settings.TRACING_OTLP_HEADERS,
+        ),
+        sample_rate=settings.TRACING_SAMPLE_RATE,
+        export_interval=settings.TRACING_EXPORT_INTERVAL_SECONDS,
+    )
@@ -1,4 +1,5 @@
-from typing import List
+from enum import Enum
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -62,3 +63,78 @@ class WordEntity(BaseModel):
 
     def add_example(self, example: ExampleEntity):
         self.examples.append(example)
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class JobEntity(BaseModel):
+    """Background translation of a word missing in the database."""
+
+    id: str
+    word: str
+    sl: str
+    tl: str
+    status: JobStatus = JobStatus.PENDING
+    result: Optional[WordEntity] = None
+    error: Optional[str] = None
+    finished_at: Optional[float] = None
+
+
+class ScrapeJobEntity(BaseModel):
+    """Scrape waiting in the database queue for a scrape worker."""
+
+    job_id: int
+    word: str
+    sl: str
+    tl: str
+    priority: int = 0
+    status: JobStatus = JobStatus.PENDING
+    attempts: int = 0
+    error: Optional[str] = None
+    traceparent: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ArchivedPageEntity(BaseModel):
+    """Scraped page kept to extract it again without the browser."""
+
+    page_id: int
+    word: str
+    sl: str
+    tl: str
+    # zlib compressed HTML, see app.repo.pg.archive
+    page: bytes
+
+    class Config:
+        from_attributes = True
+
+
+class SearchHitEntity(BaseModel):
+    """Definition or example matching a full-text search query."""
+
+    word: str
+    word_language: str
+    language: str
+    kind: str
+    text: str
+    rank: float
+
+
+class SearchPageEntity(BaseModel):
+    hits: List[SearchHitEntity] = []
+    next_cursor: Optional[str] = None
+
+
+class ReverseTranslationEntity(BaseModel):
+    """Source word the translation belongs to."""
+
+    word: str
+    language: str
+    translation: str
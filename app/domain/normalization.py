@@ -0,0 +1,53 @@
+"""
+Normalization of word text into lookup keys.
+
+Variants of a word the user would consider the same ("House", " house",
+NFC and NFD forms of "café") get the same key, so they share one stored row.
+
+- `clean_word` gives the surface form to store and scrape: Unicode NFC,
+  trimmed, inner whitespace runs collapsed to a single space.
+- `normalize_word` gives the key: the cleaned form case-folded with
+  the rules of the language. Turkic languages map dotted and dotless I apart,
+  languages where full case folding merges distinct words (German "Maße" and
+  "Masse" through ß -> ss) are only lower-cased, "auto" and other languages
+  use the default Unicode case folding.
+- `normalize_keys` gives the keys a lookup matches, for "auto" the keys of
+  every rule as the language of the stored word is unknown.
+
+Keys are stored in `words.normalized`, changing the rules requires rewriting
+the column (see the migration introducing it).
+"""
+
+import re
+import unicodedata
+
+WHITESPACE = re.compile(r"\s+")
+
+# languages with dotted and dotless i as separate letters
+TURKIC_LANGUAGES = frozenset({"tr", "az", "crh", "kk", "tt"})
+TURKIC_CASE = str.maketrans({"I": "ı", "İ": "i"})
+# languages where full case folding maps distinct words to one key
+LOWER_CASE_LANGUAGES = frozenset({"de"})
+
+
+def clean_word(word: str) -> str:
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFC", word)).strip()
+
+
+def normalize_word(word: str, language: str = "auto") -> str:
+    word = clean_word(word)
+    if language in TURKIC_LANGUAGES:
+        word = word.translate(TURKIC_CASE)
+    folded = word.lower() if language in LOWER_CASE_LANGUAGES else word.casefold()
+    # case folding may decompose, e.g. "ǰ", compose again
+    return unicodedata.normalize("NFC", folded)
+
+
+def normalize_keys(word: str, language: str = "auto") -> set[str]:
+    if language != "auto":
+        return {normalize_word(word, language)}
+    return {
+        normalize_word(word),
+        normalize_word(word, "tr"),
+        normalize_word(word, "de"),
+    }
@@ -1,12 +1,105 @@
 """Main FastAPI app instance declaration."""
 
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 from app.api.api import api_router
+from app.api.deps import (
+    get_word_repo,
+    local_dictionary,
+    scrape_archive,
+    scrape_queue,
+    slow_query_log,
+)
+from app.api.handlers import admission_rejected_handler, deadline_exceeded_handler
 from app.api.v1.factory import create_app
 from app.core import config
+from app.core.admission import AdmissionRejectedException
+from app.core.resilience import DeadlineExceededException, DeadlineMiddleware
+from app.core.session import async_engine, async_read_engine
+from app.core.tracing import (
+    TRACER,
+    TracingMiddleware,
+    configure_from_settings,
+    instrument_engine,
+)
+
+logger = logging.getLogger(__name__)
+
+configure_from_settings()
+# lookups share the primary pool without a replica
+engines = [async_engine]
+if async_read_engine.sync_engine.pool is not async_engine.sync_engine.pool:
+    engines.append(async_read_engine)
+for engine in engines:
+    instrument_engine(engine)
+    if slow_query_log is not None:
+        slow_query_log.instrument(engine)
+
+
+async def refresh_suggest_index(interval: int) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await get_word_repo().rebuild_suggest_index()
+        except Exception:
+            logger.exception("Cannot rebuild autocomplete index")
+
+
+async def flush_word_stats(interval: int) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await get_word_repo().flush_stats()
+        except Exception:
+            logger.exception("Cannot flush word stats")
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    await asyncio.to_thread(local_dictionary.load)
+    await get_word_repo().rebuild_suggest_index()
+    # hot before the first request
+    warmed = await get_word_repo().warm_cache(config.settings.WORDS_CACHE_WARM_TOP_N)
+    logger.info("Warmed the word cache with %d entries", warmed)
+
+    tasks = []
+    if config.settings.SUGGEST_REFRESH_SECONDS:
+        tasks.append(
+            asyncio.create_task(
+                refresh_suggest_index(config.settings.SUGGEST_REFRESH_SECONDS)
+            )
+        )
+    if config.settings.WORDS_STATS_FLUSH_SECONDS:
+        tasks.append(
+            asyncio.create_task(
+                flush_word_stats(config.settings.WORDS_STATS_FLUSH_SECONDS)
+            )
+        )
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+    # hits counted since the last flush
+    try:
+        await get_word_repo().flush_stats()
+    except Exception:
+        logger.exception("Cannot flush word stats")
+    if scrape_queue is not None and scrape_queue.listener is not None:
+        await scrape_queue.listener.stop()
+    # snapshots of the last scrapes
+    if scrape_archive is not None:
+        await scrape_archive.join()
+    # spans of the last requests
+    await asyncio.to_thread(TRACER.flush)
+
 
 app = FastAPI(
     title=config.settings.PROJECT_NAME,
@@ -14,8 +107,11 @@ app = FastAPI(
     description=config.settings.DESCRIPTION,
     openapi_url="/openapi.json",
     docs_url="/",
+    lifespan=lifespan,
 )
 app.include_router(api_router)
+app.add_exception_handler(AdmissionRejectedException, admission_rejected_handler)
+app.add_exception_handler(DeadlineExceededException, deadline_exceeded_handler)
 
 # Sets all CORS enabled origins
 app.add_middleware(
@@ -26,9 +122,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Time budget of every request, see app.core.resilience
+app.add_middleware(
+    DeadlineMiddleware,
+    default=config.settings.REQUEST_DEADLINE_SECONDS,
+    header=config.settings.REQUEST_DEADLINE_HEADER,
+)
+
 # Guards against HTTP Host Header attacks
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=config.settings.ALLOWED_HOSTS)
 
+# Outermost, spans cover the whole request, see app.core.tracing
+app.add_middleware(TracingMiddleware)
+
 
 sub_app = create_app(config.settings.PROJECT_NAME, config.settings.VERSION)
 sub_app_prefix = "/api/v1"
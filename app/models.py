@@ -16,16 +16,64 @@ alembic upgrade head
 import uuid
 from datetime import datetime
 
-from sqlalchemy import (Column, DateTime, ForeignKey, Integer, String, Text,
-                        UniqueConstraint)
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Column,
+    Computed,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+    event,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    deferred,
+    mapped_column,
+    relationship,
+)
+
+from app.domain.normalization import normalize_word
+
+# Maps language code to postgres text search configuration, `simple` for
+# languages without stemming support. Keep in sync with migrations.
+TEXT_SEARCH_CONFIG_FUNCTION = """
+CREATE OR REPLACE FUNCTION text_search_config(language varchar)
+RETURNS regconfig LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT (CASE language
+        WHEN 'ar' THEN 'arabic' WHEN 'hy' THEN 'armenian' WHEN 'eu' THEN 'basque'
+        WHEN 'ca' THEN 'catalan' WHEN 'da' THEN 'danish' WHEN 'nl' THEN 'dutch'
+        WHEN 'en' THEN 'english' WHEN 'fi' THEN 'finnish' WHEN 'fr' THEN 'french'
+        WHEN 'de' THEN 'german' WHEN 'el' THEN 'greek' WHEN 'hi' THEN 'hindi'
+        WHEN 'hu' THEN 'hungarian' WHEN 'id' THEN 'indonesian'
+        WHEN 'ga' THEN 'irish' WHEN 'it' THEN 'italian'
+        WHEN 'lt' THEN 'lithuanian' WHEN 'ne' THEN 'nepali'
+        WHEN 'no' THEN 'norwegian' WHEN 'pt' THEN 'portuguese'
+        WHEN 'ro' THEN 'romanian' WHEN 'ru' THEN 'russian' WHEN 'sr' THEN 'serbian'
+        WHEN 'es' THEN 'spanish' WHEN 'sv' THEN 'swedish' WHEN 'ta' THEN 'tamil'
+        WHEN 'tr' THEN 'turkish' WHEN 'yi' THEN 'yiddish'
+        ELSE 'simple'
+    END)::regconfig
+$$
+"""
 
 
 class Base(DeclarativeBase):
     pass
 
 
+event.listen(Base.metadata, "before_create", DDL(TEXT_SEARCH_CONFIG_FUNCTION))
+
+
 class User(Base):
     __tablename__ = "user_model"
 
@@ -38,35 +86,80 @@ class User(Base):
     hashed_password: Mapped[str] = mapped_column(String(128), nullable=False)
 
 
+# Children of a word are read for one target language at a time, so they are
+# list partitioned by language. Rows of languages without own partition
+# go to the default one, see app.repo.pg.partitions.
+PARTITION_BY_LANGUAGE = {"postgresql_partition_by": "LIST (language)"}
+DEFAULT_PARTITION = DDL(
+    "CREATE TABLE %(table)s_default PARTITION OF %(table)s DEFAULT"
+)
+
+
+def _normalized_default(context) -> str:
+    parameters = context.get_current_parameters()
+    return normalize_word(parameters["word"], parameters["language"])
+
+
 class Word(Base):
     __tablename__ = "words"
     word_id = Column(Integer, primary_key=True)
     word = Column(Text, nullable=False)
     language = Column(String(50), nullable=False)
     last_updated = Column(DateTime, default=datetime.utcnow)
+    # lookup key, see app.domain.normalization
+    normalized = Column(Text, nullable=False, default=_normalized_default)
+
+    # not unique, rows created before normalization may share a key
+    __table_args__ = (
+        Index("ix_words_normalized_language", "normalized", "language"),
+    )
 
-    # Relationships with cascade delete
+    # Relationships with cascade delete, children are removed by the database
     definitions = relationship(
-        "Definition", back_populates="word", cascade="all, delete"
+        "Definition",
+        back_populates="word",
+        cascade="all, delete",
+        passive_deletes=True,
+    )
+    synonyms = relationship(
+        "Synonym", back_populates="word", cascade="all, delete", passive_deletes=True
     )
-    synonyms = relationship("Synonym", back_populates="word", cascade="all, delete")
     translations = relationship(
-        "Translation", back_populates="word", cascade="all, delete"
+        "Translation",
+        back_populates="word",
+        cascade="all, delete",
+        passive_deletes=True,
+    )
+    examples = relationship(
+        "Example", back_populates="word", cascade="all, delete", passive_deletes=True
     )
-    examples = relationship("Example", back_populates="word", cascade="all, delete")
 
 
 class Definition(Base):
     __tablename__ = "definitions"
-    definition_id = Column(Integer, primary_key=True)
-    word_id = Column(Integer, ForeignKey("words.word_id"))
-    language = Column(String(50), nullable=False)
+    definition_id = Column(Integer, primary_key=True, autoincrement=True)
+    word_id = Column(Integer, ForeignKey("words.word_id", ondelete="CASCADE"))
+    # partition key, keys of a partitioned table must include it
+    language = Column(String(50), primary_key=True)
     definition = Column(Text, nullable=False)
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "to_tsvector(text_search_config(language), definition)",
+                persisted=True,
+            ),
+        )
+    )
 
     __table_args__ = (
         UniqueConstraint(
             "word_id", "language", "definition", name="_word_language_definition_uc"
         ),
+        Index(
+            "ix_definitions_search_vector", "search_vector", postgresql_using="gin"
+        ),
+        PARTITION_BY_LANGUAGE,
     )
 
     # Relationship
@@ -75,15 +168,17 @@ class Definition(Base):
 
 class Synonym(Base):
     __tablename__ = "synonyms"
-    synonym_id = Column(Integer, primary_key=True)
-    word_id = Column(Integer, ForeignKey("words.word_id"))
-    language = Column(String(50), nullable=False)
+    synonym_id = Column(Integer, primary_key=True, autoincrement=True)
+    word_id = Column(Integer, ForeignKey("words.word_id", ondelete="CASCADE"))
+    # partition key, keys of a partitioned table must include it
+    language = Column(String(50), primary_key=True)
     synonym = Column(Text, nullable=False)
 
     __table_args__ = (
         UniqueConstraint(
             "word_id", "language", "synonym", name="_word_language_synonym_uc"
         ),
+        PARTITION_BY_LANGUAGE,
     )
     # Relationship
     word = relationship("Word", back_populates="synonyms")
@@ -91,15 +186,24 @@ class Synonym(Base):
 
 class Translation(Base):
     __tablename__ = "translations"
-    translation_id = Column(Integer, primary_key=True)
-    word_id = Column(Integer, ForeignKey("words.word_id"))
-    language = Column(String(50), nullable=False)
+    translation_id = Column(Integer, primary_key=True, autoincrement=True)
+    word_id = Column(Integer, ForeignKey("words.word_id", ondelete="CASCADE"))
+    # partition key, keys of a partitioned table must include it
+    language = Column(String(50), primary_key=True)
     translation = Column(Text, nullable=False)
 
     __table_args__ = (
         UniqueConstraint(
             "word_id", "language", "translation", name="_word_language_translation_uc"
         ),
+        # reverse lookup, the trigram index for partial matches needs
+        # the pg_trgm extension and is created by the migration only
+        Index(
+            "ix_translations_language_lower_translation",
+            "language",
+            func.lower(translation),
+        ),
+        PARTITION_BY_LANGUAGE,
     )
 
     # Relationship
@@ -108,16 +212,122 @@ class Translation(Base):
 
 class Example(Base):
     __tablename__ = "examples"
-    example_id = Column(Integer, primary_key=True)
-    word_id = Column(Integer, ForeignKey("words.word_id"))
-    language = Column(String(50), nullable=False)
+    example_id = Column(Integer, primary_key=True, autoincrement=True)
+    word_id = Column(Integer, ForeignKey("words.word_id", ondelete="CASCADE"))
+    # partition key, keys of a partitioned table must include it
+    language = Column(String(50), primary_key=True)
     example = Column(Text, nullable=False)
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "to_tsvector(text_search_config(language), example)", persisted=True
+            ),
+        )
+    )
 
     __table_args__ = (
         UniqueConstraint(
             "word_id", "language", "example", name="_word_language_example_uc"
         ),
+        Index("ix_examples_search_vector", "search_vector", postgresql_using="gin"),
+        PARTITION_BY_LANGUAGE,
     )
 
     # Relationship
     word = relationship("Word", back_populates="examples")
+
+
+PARTITIONED_MODELS = (Definition, Synonym, Translation, Example)
+
+for model in PARTITIONED_MODELS:
+    event.listen(model.__table__, "after_create", DEFAULT_PARTITION)
+
+
+class WordEntry(Base):
+    """Fully assembled word for one target language, served by single row reads.
+
+    Derived from the normalized tables above, which remain the source of truth.
+    """
+
+    __tablename__ = "word_entries"
+    word_id = Column(
+        Integer, ForeignKey("words.word_id", ondelete="CASCADE"), primary_key=True
+    )
+    tl = Column(String(50), primary_key=True)
+    payload = Column(JSONB, nullable=False)
+    version = Column(Integer, nullable=False, default=1)
+
+
+class WordStat(Base):
+    """Popularity of a word in one target language, see app.repo.stats."""
+
+    __tablename__ = "word_stats"
+    word_id = Column(
+        Integer, ForeignKey("words.word_id", ondelete="CASCADE"), primary_key=True
+    )
+    tl = Column(String(50), primary_key=True)
+    # hits decayed to `updated_at`
+    score = Column(Float, nullable=False)
+    hits = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+class ScrapeJob(Base):
+    """Scrape queued for the scrape workers, see app.repo.pg.queue."""
+
+    __tablename__ = "scrape_jobs"
+    job_id = Column(BigInteger, primary_key=True)
+    word = Column(Text, nullable=False)
+    normalized = Column(Text, nullable=False)
+    sl = Column(String(50), nullable=False)
+    tl = Column(String(50), nullable=False)
+    # lower runs first, see app.core.scheduler.Priority
+    priority = Column(Integer, nullable=False, default=0)
+    status = Column(String(16), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    # W3C trace context of the request that queued the job
+    traceparent = Column(String(55))
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # one active job per word and pair, concurrent misses share it
+        Index(
+            "ix_scrape_jobs_active",
+            "normalized",
+            "sl",
+            "tl",
+            unique=True,
+            postgresql_where=status.in_(("pending", "running")),
+        ),
+        # dequeue order
+        Index(
+            "ix_scrape_jobs_pending",
+            "priority",
+            "job_id",
+            postgresql_where=status == "pending",
+        ),
+    )
+
+
+class ScrapePage(Base):
+    """Compressed DOM snapshot of a scraped page, see app.repo.pg.archive."""
+
+    __tablename__ = "scrape_pages"
+    page_id = Column(BigInteger, primary_key=True)
+    word = Column(Text, nullable=False)
+    normalized = Column(Text, nullable=False)
+    sl = Column(String(50), nullable=False)
+    tl = Column(String(50), nullable=False)
+    # sha256 of the uncompressed snapshot, unchanged pages are not written again
+    digest = Column(String(64), nullable=False)
+    # zlib compressed HTML
+    page = Column(LargeBinary, nullable=False)
+    scraped_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # the last snapshot of every word and pair
+        UniqueConstraint("normalized", "sl", "tl", name="_normalized_sl_tl_page_uc"),
+    )
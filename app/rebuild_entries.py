@@ -0,0 +1,35 @@
+"""
+Rebuilds the denormalized `word_entries` table from the normalized tables.
+
+Run it once after the `word_entries` migration and whenever entries need to be
+reassembled, e.g. `python -m app.rebuild_entries --batch-size 1000`.
+Words are processed in word_id order in batches, one transaction per batch.
+"""
+
+import argparse
+import asyncio
+
+from app.core.session import get_context
+from app.repo.pg.word import WordPgRepo
+
+
+async def main(batch_size: int) -> None:
+    repo = WordPgRepo(_session_factory=get_context)
+    last_word_id, rebuilt = 0, 0
+
+    while True:
+        last_word_id = await repo.rebuild_entries(last_word_id, limit=batch_size)
+        if last_word_id is None:
+            break
+        rebuilt += 1
+        print(f"Rebuilt batch {rebuilt}, up to word_id {last_word_id}")
+
+    print("Done")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,104 @@
+"""
+In-process cache of assembled words, the tier between the snapshot and the
+database.
+
+Entries are kept per (normalized word, sl, tl) in least recently used order,
+at most `capacity` of them, and expire after `ttl` seconds, so changes made
+by other workers show up within it. Writes and deletes of this worker discard
+the affected entries right away.
+
+A worker warms the cache with the most popular entries at startup, see
+`WordRepo.warm_cache`, so it is hot before it takes traffic.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Optional
+
+from app.core.metrics import Counter
+from app.domain.entities import WordEntity
+from app.domain.normalization import normalize_word
+
+LOOKUPS = Counter(
+    "word_cache_lookups_total",
+    "Word lookups served by the in-process cache.",
+    labelnames=("result",),
+)
+
+
+@dataclass
+class WordCache:
+    capacity: int = 10000
+    ttl: float = 300
+
+    # (normalized word, sl, tl) -> (expires at, entity), oldest first
+    _entries: OrderedDict[tuple[str, str, str], tuple[float, WordEntity]] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    # (normalized word, sl) -> tls of the entries, to discard without a scan
+    _targets: dict[tuple[str, str], set[str]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    # source languages ever put, the ones "auto" discards look at
+    _languages: set[str] = field(default_factory=set, init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, word: str, sl: str, tl: str) -> Optional[WordEntity]:
+        # stored words have a language, "auto" lookups go to the database
+        if sl == "auto":
+            return None
+
+        key = (normalize_word(word, sl), sl, tl)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            self._remove(key)
+            entry = None
+
+        LOOKUPS.inc(result="miss" if entry is None else "hit")
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, word_entity: WordEntity, tl: str) -> None:
+        sl = word_entity.language
+        key = (normalize_word(word_entity.word, sl), sl, tl)
+        self._entries[key] = (time.monotonic() + self.ttl, word_entity)
+        self._entries.move_to_end(key)
+        self._targets.setdefault(key[:2], set()).add(tl)
+        self._languages.add(sl)
+        while len(self._entries) > self.capacity:
+            self._remove(next(iter(self._entries)))
+
+    def warm(self, entries: Iterable[tuple[str, str, str, dict]]) -> int:
+        """Puts (word, sl, tl, payload) entries, the most valuable first, until
+        the cache is full. Returns the number of entries put."""
+        entries = list(islice(entries, self.capacity))
+        # the least valuable ones end up first in eviction order
+        for _, _, tl, payload in reversed(entries):
+            self.put(WordEntity.model_validate(payload), tl)
+        return len(entries)
+
+    def discard(self, word: str, sl: str = "auto") -> None:
+        """Drops the word for every target language, "auto" for every language."""
+        languages = self._languages if sl == "auto" else {sl}
+        for language in languages:
+            normalized = normalize_word(word, language)
+            for tl in self._targets.get((normalized, language), set()).copy():
+                self._remove((normalized, language, tl))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._targets.clear()
+
+    def _remove(self, key: tuple[str, str, str]) -> None:
+        del self._entries[key]
+        targets = self._targets[key[:2]]
+        targets.discard(key[2])
+        if not targets:
+            del self._targets[key[:2]]
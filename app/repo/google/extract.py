@@ -0,0 +1,187 @@
+"""
+Extraction of the sections from a saved page, without the browser.
+
+Gives the texts EXTRACT_SCRIPT of app.repo.google.word reads with innerText
+from the elements of the given classes, in document order: whitespace is
+collapsed, block elements and `<br>` break lines. Styles are not applied,
+texts of elements hidden by CSS are kept.
+"""
+
+from html.parser import HTMLParser
+
+# elements without an end tag
+VOID_ELEMENTS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+# elements innerText puts on their own lines
+BLOCK_ELEMENTS = frozenset(
+    {
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "div",
+        "dd",
+        "dl",
+        "dt",
+        "figure",
+        "footer",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hr",
+        "li",
+        "main",
+        "nav",
+        "ol",
+        "p",
+        "pre",
+        "section",
+        "table",
+        "tr",
+        "ul",
+    }
+)
+# elements closed by the start of another one, e.g. `<li>` by the next `<li>`
+IMPLIED_END = {
+    # block elements close a paragraph
+    **{tag: frozenset({"p"}) for tag in BLOCK_ELEMENTS},
+    "li": frozenset({"li"}),
+    "dt": frozenset({"dt", "dd"}),
+    "dd": frozenset({"dt", "dd"}),
+    "tr": frozenset({"tr"}),
+    "td": frozenset({"td", "th"}),
+    "th": frozenset({"td", "th"}),
+    "option": frozenset({"option"}),
+}
+# implied ends do not reach past them
+SCOPE_ELEMENTS = frozenset(
+    {"html", "body", "div", "ul", "ol", "dl", "table", "select"}
+)
+# elements without rendered text
+SKIPPED_ELEMENTS = frozenset({"script", "style", "template", "noscript"})
+
+
+def inner_text(parts: list[str]) -> str:
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+class _SectionParser(HTMLParser):
+    def __init__(self, classes: dict[str, str]):
+        super().__init__(convert_charrefs=True)
+        self._sections_of = {}
+        for section, class_name in classes.items():
+            self._sections_of.setdefault(class_name, []).append(section)
+
+        self.texts: dict[str, list] = {section: [] for section in classes}
+        # open elements as (tag, slots of the texts it fills or None)
+        self._stack: list[tuple[str, object]] = []
+        # parts of the texts of the open matched elements
+        self._captures: list[list[str]] = []
+        self._skipped = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            if tag in ("br", "hr"):
+                self._append("\n")
+            return
+        self._close_implied(IMPLIED_END.get(tag, ()))
+        if tag in BLOCK_ELEMENTS:
+            self._append("\n")
+        if tag in SKIPPED_ELEMENTS:
+            self._skipped += 1
+
+        capture = None
+        class_names = dict(attrs).get("class") or ""
+        sections = [
+            section
+            for class_name in dict.fromkeys(class_names.split())
+            for section in self._sections_of.get(class_name, ())
+        ]
+        if sections:
+            slots = []
+            for section in sections:
+                slots.append((section, len(self.texts[section])))
+                self.texts[section].append(None)
+            capture = (slots, [])
+            self._captures.append(capture[1])
+        self._stack.append((tag, capture))
+
+    def handle_startendtag(self, tag, attrs):
+        # self-closing foreign elements, e.g. svg ones, hold no text
+        if tag in VOID_ELEMENTS:
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        # implicitly closed elements are closed with their parent
+        if not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, capture = self._stack.pop()
+            self._close(open_tag, capture)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self._skipped:
+            self._append(data)
+
+    def close(self):
+        super().close()
+        while self._stack:
+            self._close(*self._stack.pop())
+
+    def _close_implied(self, tags) -> None:
+        for depth in range(len(self._stack) - 1, -1, -1):
+            open_tag = self._stack[depth][0]
+            if open_tag in tags:
+                while len(self._stack) > depth:
+                    self._close(*self._stack.pop())
+                return
+            if open_tag in SCOPE_ELEMENTS:
+                return
+
+    def _close(self, tag: str, capture) -> None:
+        if tag in SKIPPED_ELEMENTS:
+            self._skipped -= 1
+        if tag in BLOCK_ELEMENTS:
+            self._append("\n")
+        if capture is not None:
+            slots, parts = capture
+            # elements are closed in reverse order, so are their captures
+            self._captures.pop()
+            text = inner_text(parts)
+            for section, index in slots:
+                self.texts[section][index] = text
+
+    def _append(self, data: str) -> None:
+        for parts in self._captures:
+            parts.append(data)
+
+
+def extract_texts(page: str, classes: dict[str, str]) -> dict[str, list[str]]:
+    """Texts of the elements of every section, keyed like `classes`."""
+    parser = _SectionParser(classes)
+    parser.feed(page)
+    parser.close()
+    return parser.texts
@@ -1,15 +1,85 @@
 import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Literal, Optional
 
 from selenium import webdriver
-from selenium.common.exceptions import (NoSuchElementException,
-                                        TimeoutException, WebDriverException)
-from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options
 
-from app.domain.entities import (DefinitionEntity, ExampleEntity,
-                                 SynonymEntity, TranslationEntity, WordEntity)
+from app.core.tracing import TRACER
+from app.domain.entities import (
+    DefinitionEntity,
+    ExampleEntity,
+    SynonymEntity,
+    TranslationEntity,
+    WordEntity,
+)
+from app.repo.google.extract import extract_texts
+
+if TYPE_CHECKING:
+    from app.repo.pg.archive import ScrapeArchivePgRepo
+
+logger = logging.getLogger(__name__)
+
+# Resources the extraction never needs, matched by Network.setBlockedURLs
+BLOCKED_URLS = (
+    # images
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.svg",
+    "*.ico",
+    # fonts
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    # media
+    "*.mp3",
+    "*.mp4",
+    "*.webm",
+    # third-party analytics, ads and fonts
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googleadservices.com*",
+    "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*",
+)
+
+# Returns rendered texts of the elements of every section, keyed like the
+# `classes` argument, the same strings WebElement.text gives one by one.
+EXTRACT_SCRIPT = """
+const classes = arguments[0];
+const texts = {};
+for (const [section, className] of Object.entries(classes)) {
+    texts[section] = Array.from(
+        document.getElementsByClassName(className),
+        (element) => element.innerText.trim(),
+    );
+}
+return texts;
+"""
+
+# Sections extracted by every script execution of `stream`, the primary
+# translation is yielded before the others are extracted
+EXTRACT_STAGES = (("translations",), ("synonyms", "examples"))
+
+# Returns the HTML of the page without the elements the extraction never reads
+SNAPSHOT_SCRIPT = """
+const root = document.documentElement.cloneNode(true);
+for (const element of root.querySelectorAll(
+    "script, style, noscript, template, link, meta, svg, iframe",
+)) {
+    element.remove();
+}
+return root.outerHTML;
+"""
 
 
 @dataclass
@@ -22,81 +92,160 @@ class GoogleWordRepo:
     synonym_class: str = "FpAlrf"
     sleep: int = 3
 
+    # lean page-load profile, blocked resources and a stripped down browser,
+    # off until `python -m app.tests.benchmarks.page_load` numbers are recorded
+    lean: bool = False
+    # with both profiles, `eager` returns on DOMContentLoaded, `none` right
+    # after the navigation
+    page_load_strategy: Literal["normal", "eager", "none"] = "normal"
+    blocked_urls: tuple[str, ...] = BLOCKED_URLS
+    window_size: str = "800,600"
+    # passed to V8 as `--js-flags`, e.g. "--max-lazy"
+    js_flags: Optional[str] = None
+    # snapshots of the extracted pages are saved to it, to extract them again
+    # without the browser, see app.reprocess_pages
+    archive: Optional["ScrapeArchivePgRepo"] = None
+
     async def get(self, word: str, sl: str, tl: str) -> Optional["WordEntity"]:
+        word_entity = WordEntity(word=word, language=sl)
+
+        try:
+            # close the browser at once if the caller gives up
+            async with aclosing(self.stream(word, sl, tl)) as sections:
+                async for section, values in sections:
+                    setattr(word_entity, section, values)
+        except WebDriverException:
+            return None
+
+        return word_entity
+
+    async def stream(
+        self, word: str, sl: str, tl: str
+    ) -> AsyncIterator[tuple[str, list]]:
+        """Yields (section, entities) pairs, the primary translation (definitions)
+        goes first. The translation elements are extracted with one script
+        execution and yielded before the synonyms and examples are extracted
+        with a second one, two WebDriver round trips whatever the number of
+        elements.
+
+        :raises WebDriverException: browser failed or page load timed out.
+        """
 
         # here is a bug with auto sl
         link = self._get_link(word, sl, tl)
         options = self._get_options()
-        driver = webdriver.Chrome(options=options)
-        word_entity = WordEntity(word=word, language=sl)
 
+        # webdriver calls are blocking, they are launched on their own thread
+        with TRACER.span("google.start_driver"):
+            driver = await asyncio.to_thread(self._start_driver, options)
+
+        page = None
         try:
-            # blocking operation need to be launched on its own thread
-            driver.get(link)
+            with TRACER.span("google.page_load", **{"http.url": link}):
+                await asyncio.to_thread(driver.get, link)
 
-            # wait for page loading
-            await asyncio.sleep(3)
+                # wait for page loading
+                await asyncio.sleep(self.sleep)
 
-            word_entity.definitions = self._get_definitions(driver, tl)
-            word_entity.synonyms = self._get_synonyms(driver, tl)
-            word_entity.translations = self._get_translations(driver, tl)
-            word_entity.examples = self._get_examples(driver, tl)
+            for stage in EXTRACT_STAGES:
+                with TRACER.span("google.extract") as span:
+                    sections = await asyncio.to_thread(
+                        self._extract_stage, driver, stage, tl
+                    )
+                    if span is not None:
+                        for section, values in sections.items():
+                            span.set_attribute(f"google.{section}", len(values))
 
-        except TimeoutException:
-            return None
-        except WebDriverException:
-            return None
-        finally:
-            driver.close()
+                if self.archive is not None and stage[-1] == "examples":
+                    with TRACER.span("google.snapshot"):
+                        page = await asyncio.to_thread(self._snapshot, driver)
 
-        return word_entity
+                for section, values in sections.items():
+                    yield section, values
+        finally:
+            await asyncio.to_thread(driver.quit)
+            # compressed and saved in background, the scrape does not wait
+            if page is not None:
+                self.archive.save_later(word, sl, tl, page)
 
     def _get_link(self, word: str, sl: str, tl: str) -> str:
         return f"https://translate.google.com/?sl={sl}&tl={tl}&text={word}&op={self.operation}"
 
-    def _get_definitions(
-        self, driver: "webdriver.Chrome", tl: str
-    ) -> list[DefinitionEntity]:
+    def _extract_stage(
+        self, driver: "webdriver.Chrome", stage: tuple[str, ...], tl: str
+    ) -> dict[str, list]:
+        """Extracts the sections of the stage with a single script execution, i.e.
+        one WebDriver round trip whatever the number of elements."""
+        classes = self._classes()
+        texts = driver.execute_script(
+            EXTRACT_SCRIPT, {section: classes[section] for section in stage}
+        )
+        return self._sections(texts, tl)
 
-        try:
-            translation = driver.find_element(By.CLASS_NAME, self.translation_class)
-        except NoSuchElementException:
-            return []
+    def extract_page(self, page: str, tl: str) -> dict[str, list]:
+        """Extracts the sections from the HTML of a saved page, like the stages of
+        `stream` do from the live one."""
+        return self._sections(extract_texts(page, self._classes()), tl)
 
-        return [DefinitionEntity(definition=translation.text, language=tl)]
+    def _snapshot(self, driver: "webdriver.Chrome") -> Optional[str]:
+        # the scrape succeeded whatever happens to its snapshot
+        try:
+            return driver.execute_script(SNAPSHOT_SCRIPT)
+        except WebDriverException:
+            logger.warning("Cannot take snapshot of the page", exc_info=True)
+            return None
 
-    def _get_translations(
-        self, driver: "webdriver.Chrome", tl: str
-    ) -> list["TranslationEntity"]:
+    def _classes(self) -> dict[str, str]:
+        return {
+            "translations": self.translation_class,
+            "synonyms": self.synonym_class,
+            "examples": self.example_class,
+        }
 
-        try:
-            translations = driver.find_elements(By.CLASS_NAME, self.translation_class)
-        except NoSuchElementException:
-            return []
+    def _sections(self, texts: dict[str, list[str]], tl: str) -> dict[str, list]:
+        """Entities of the sections `texts` holds, in the order they are yielded."""
+        sections = {}
 
-        return [
-            TranslationEntity(translation=t, language=tl)
-            for t in self._clean(translations)
-        ][1:]
+        if "translations" in texts:
+            translations = self._clean(texts["translations"])
+            # the first translation element is the primary translation
+            sections["definitions"] = [
+                DefinitionEntity(definition=t, language=tl) for t in translations[:1]
+            ]
+            sections["translations"] = [
+                TranslationEntity(translation=t, language=tl) for t in translations[1:]
+            ]
+        if "synonyms" in texts:
+            sections["synonyms"] = [
+                SynonymEntity(synonym=s, language=tl)
+                for s in self._clean(texts["synonyms"])
+            ]
+        if "examples" in texts:
+            sections["examples"] = [
+                ExampleEntity(example=e, language=tl)
+                for e in self._clean(texts["examples"])
+            ]
 
-    def _get_examples(self, driver: "webdriver.Chrome", tl: str) -> list[ExampleEntity]:
-        try:
-            examples = driver.find_elements(By.CLASS_NAME, self.example_class)
-        except NoSuchElementException:
-            return []
+        return sections
 
-        return [ExampleEntity(example=e, language=tl) for e in self._clean(examples)]
+    def _clean(self, results: list[str]) -> list[str]:
+        """Drops empty and repeated texts keeping the page order."""
+        return list(dict.fromkeys(r for r in results if r))
 
-    def _get_synonyms(self, driver: "webdriver.Chrome", tl: str) -> list[SynonymEntity]:
-        try:
-            synonyms = driver.find_elements(By.CLASS_NAME, self.synonym_class)
-        except NoSuchElementException:
-            return []
+    def _start_driver(self, options: "Options") -> "webdriver.Chrome":
+        driver = webdriver.Chrome(options=options)
 
-        return [SynonymEntity(synonym=s, language=tl) for s in self._clean(synonyms)]
+        if self.lean and self.blocked_urls:
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd(
+                    "Network.setBlockedURLs", {"urls": list(self.blocked_urls)}
+                )
+            except BaseException:
+                driver.quit()
+                raise
 
-    def _clean(self, results: list) -> set:
-        return {r.text for r in results if r.text}
+        return driver
 
     def _get_options(self) -> "Options":
         chrome_options = Options()
@@ -104,4 +253,19 @@ class GoogleWordRepo:
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.page_load_strategy = self.page_load_strategy
+
+        if not self.lean:
+            return chrome_options
+
+        chrome_options.add_argument(f'--window-size={self.window_size}')
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_argument('--mute-audio')
+        chrome_options.add_argument(
+            '--disable-features=Translate,MediaRouter,OptimizationHints'
+        )
+        chrome_options.add_argument('--disable-extensions')
+        chrome_options.add_argument('--disable-background-networking')
+        if self.js_flags:
+            chrome_options.add_argument(f'--js-flags={self.js_flags}')
         return chrome_options
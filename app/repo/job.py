@@ -0,0 +1,102 @@
+import asyncio
+import base64
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.core.resilience import deadline_scope
+from app.domain.entities import JobEntity, JobStatus, WordEntity
+
+SEPARATOR = "\x1f"
+
+
+class UndefinedJobException(Exception):
+    """Job id is malformed."""
+
+    pass
+
+
+@dataclass
+class TranslationJobRepo:
+    """Registry of background translations running on this worker.
+
+    Job id is derived from (word, sl, tl), so concurrent misses of the same word
+    share one job and any worker can tell a finished job by the stored word.
+    """
+
+    ttl: float = 600
+
+    _jobs: dict[str, JobEntity] = field(default_factory=dict)
+    _tasks: set[asyncio.Task] = field(default_factory=set)
+
+    @staticmethod
+    def make_id(word: str, sl: str, tl: str) -> str:
+        key = SEPARATOR.join((sl, tl, word)).encode()
+        return base64.urlsafe_b64encode(key).decode().rstrip("=")
+
+    @staticmethod
+    def parse_id(job_id: str) -> tuple[str, str, str]:
+        """Returns (word, sl, tl) the job was created for.
+
+        :raises UndefinedJobException: malformed job id.
+        """
+        try:
+            key = base64.urlsafe_b64decode(job_id + "=" * (-len(job_id) % 4))
+            sl, tl, word = key.decode().split(SEPARATOR, 2)
+        except ValueError:
+            raise UndefinedJobException(f"Malformed job id {job_id}") from None
+        return word, sl, tl
+
+    def get(self, job_id: str) -> Optional[JobEntity]:
+        self._prune()
+        return self._jobs.get(job_id)
+
+    def submit(
+        self,
+        word: str,
+        sl: str,
+        tl: str,
+        runner: Callable[[], Awaitable[Optional[WordEntity]]],
+    ) -> JobEntity:
+        """Starts `runner` in background unless the same translation is in progress."""
+        self._prune()
+        job_id = self.make_id(word, sl, tl)
+        job = self._jobs.get(job_id)
+
+        if job is None or job.status == JobStatus.FAILED:
+            job = JobEntity(id=job_id, word=word, sl=sl, tl=tl)
+            self._jobs[job_id] = job
+            task = asyncio.create_task(self._run(job, runner))
+            # keep a strong reference until the task is done
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        return job
+
+    async def _run(
+        self, job: JobEntity, runner: Callable[[], Awaitable[Optional[WordEntity]]]
+    ) -> None:
+        job.status = JobStatus.RUNNING
+        try:
+            # the job outlives the request that submitted it
+            with deadline_scope(None):
+                job.result = await runner()
+        except Exception as e:
+            job.error = str(e)
+        else:
+            if job.result is None:
+                job.error = "Word not found"
+
+        job.status = JobStatus.FAILED if job.error else JobStatus.DONE
+        job.finished_at = time.monotonic()
+
+    def _prune(self) -> None:
+        expired_before = time.monotonic() - self.ttl
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < expired_before
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,211 @@
+"""
+Offline dictionary provider backed by open dictionary files.
+
+Every file serves one language pair and is given as `sl:tl:path`. Supported
+formats, picked by extension:
+
+- `.json`: {"word": {"definitions": [...], "translations": [...],
+  "synonyms": [...], "examples": [...]}}, a plain list stands for translations;
+- `.tsv`: `word<TAB>translation[; translation...][<TAB>example...]`;
+- `.ifo`: StarDict dictionary of plain text articles (sametypesequence m or l),
+  with `.idx` and `.dict` or `.dict.dz` next to it.
+
+JSON and TSV entries are loaded into memory. StarDict keeps only the index in
+memory and reads articles from the memory-mapped `.dict` file on demand
+(a compressed `.dict.dz` is inflated into memory at load). Words are matched
+by their normalized form, as in the database. In every format the first
+translation is the definition, the primary translation.
+"""
+
+import csv
+import gzip
+import json
+import mmap
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+from app.domain.entities import (
+    DefinitionEntity,
+    ExampleEntity,
+    SynonymEntity,
+    TranslationEntity,
+    WordEntity,
+)
+from app.domain.normalization import normalize_word
+
+
+class InvalidDictionaryException(Exception):
+    """Dictionary file is malformed or its format is unknown."""
+
+    pass
+
+
+@dataclass
+class _Article:
+    translations: list[str] = field(default_factory=list)
+    synonyms: list[str] = field(default_factory=list)
+    examples: list[str] = field(default_factory=list)
+
+
+class _StarDict:
+    """Index of a StarDict dictionary, articles are read on demand."""
+
+    def __init__(self, ifo_path: str, language: str):
+        info = self._read_info(ifo_path)
+        base = ifo_path[: -len(".ifo")]
+        offset_format = ">Q" if info.get("idxoffsetbits") == "64" else ">I"
+        # only plain text articles are understood
+        if info.get("sametypesequence") not in ("m", "l"):
+            raise InvalidDictionaryException(
+                f"{ifo_path} must have sametypesequence=m or l"
+            )
+
+        self.index: dict[str, tuple[int, int]] = {}
+        with open(f"{base}.idx", "rb") as file:
+            data = file.read()
+        entry = struct.Struct(offset_format + "I")
+        position = 0
+        while position < len(data):
+            end = data.index(b"\0", position)
+            word = data[position:end].decode("utf-8")
+            offset, size = entry.unpack_from(data, end + 1)
+            self.index.setdefault(normalize_word(word, language), (offset, size))
+            position = end + 1 + entry.size
+
+        if os.path.exists(f"{base}.dict"):
+            with open(f"{base}.dict", "rb") as file:
+                self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        elif os.path.exists(f"{base}.dict.dz"):
+            # dictzip is gzip compatible
+            with gzip.open(f"{base}.dict.dz", "rb") as file:
+                self.data = file.read()
+        else:
+            raise InvalidDictionaryException(f"No .dict file next to {ifo_path}")
+
+    @staticmethod
+    def _read_info(ifo_path: str) -> dict[str, str]:
+        with open(ifo_path, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        if not lines or not lines[0].startswith("StarDict's dict ifo file"):
+            raise InvalidDictionaryException(f"{ifo_path} is not a StarDict .ifo")
+        return dict(line.split("=", 1) for line in lines[1:] if "=" in line)
+
+    def get(self, key: str) -> Optional[_Article]:
+        location = self.index.get(key)
+        if location is None:
+            return None
+
+        offset, size = location
+        text = bytes(self.data[offset : offset + size]).decode("utf-8")
+        # plain text article: translations, one per line or `;` separated
+        lines = [line.strip() for line in text.replace(";", "\n").splitlines()]
+        return _Article(translations=[line for line in lines if line])
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+@dataclass
+class LocalDictionaryRepo:
+    """Offline dictionaries, one or more per language pair."""
+
+    # "sl:tl:path" specs
+    dictionaries: list[str] = field(default_factory=list)
+
+    _entries: dict[tuple[str, str], list[Union[dict, _StarDict]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def load(self) -> int:
+        """Loads all the dictionaries, returns the number of entries.
+
+        :raises InvalidDictionaryException: malformed or unknown file.
+        """
+        entries = {}
+        for spec in self.dictionaries:
+            try:
+                sl, tl, path = spec.split(":", 2)
+            except ValueError:
+                raise InvalidDictionaryException(
+                    f"Dictionary {spec} must be given as sl:tl:path"
+                ) from None
+            entries.setdefault((sl, tl), []).append(self._load_file(path, sl))
+
+        self._entries = entries
+        return sum(len(d) for pair in entries.values() for d in pair)
+
+    def _load_file(self, path: str, language: str) -> Union[dict, _StarDict]:
+        if path.endswith(".ifo"):
+            return _StarDict(path, language)
+        if path.endswith(".json"):
+            return self._load_json(path, language)
+        if path.endswith(".tsv"):
+            return self._load_tsv(path, language)
+        raise InvalidDictionaryException(f"Unknown dictionary format of {path}")
+
+    @staticmethod
+    def _load_json(path: str, language: str) -> dict[str, _Article]:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+
+        articles = {}
+        for word, value in data.items():
+            if isinstance(value, list):
+                value = {"translations": value}
+            # definitions lead the translations, see the module docstring
+            translations = value.get("definitions", []) + value.get(
+                "translations", []
+            )
+            articles.setdefault(
+                normalize_word(word, language),
+                _Article(
+                    translations=translations,
+                    synonyms=value.get("synonyms", []),
+                    examples=value.get("examples", []),
+                ),
+            )
+        return articles
+
+    @staticmethod
+    def _load_tsv(path: str, language: str) -> dict[str, _Article]:
+        articles = {}
+        with open(path, encoding="utf-8", newline="") as file:
+            for row in csv.reader(file, delimiter="\t", quoting=csv.QUOTE_NONE):
+                if len(row) < 2 or row[0].startswith("#"):
+                    continue
+                translations = [t.strip() for t in row[1].split(";") if t.strip()]
+                articles.setdefault(
+                    normalize_word(row[0], language),
+                    _Article(translations=translations, examples=row[2:]),
+                )
+        return articles
+
+    async def get(self, word: str, sl: str, tl: str) -> Optional["WordEntity"]:
+        """Looks the word up in the dictionaries of the pair, in the given order.
+        Lookups are dictionary reads, cheap enough to stay on the event loop."""
+        key = normalize_word(word, sl)
+
+        for dictionary in self._entries.get((sl, tl), ()):
+            article = dictionary.get(key)
+            if article is not None and article.translations:
+                return self._to_entity(word, sl, tl, article)
+
+        return None
+
+    @staticmethod
+    def _to_entity(word: str, sl: str, tl: str, article: _Article) -> WordEntity:
+        translations = list(dict.fromkeys(article.translations))
+        return WordEntity(
+            word=word,
+            language=sl,
+            definitions=[
+                DefinitionEntity(definition=t, language=tl) for t in translations[:1]
+            ],
+            translations=[
+                TranslationEntity(translation=t, language=tl) for t in translations[1:]
+            ],
+            synonyms=[SynonymEntity(synonym=s, language=tl) for s in article.synonyms],
+            examples=[ExampleEntity(example=e, language=tl) for e in article.examples],
+        )
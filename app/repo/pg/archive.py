@@ -0,0 +1,145 @@
+"""
+Archive of scraped pages, reprocessed by `python -m app.reprocess_pages`.
+
+The scraper saves a DOM snapshot of every page it extracted, without scripts
+and styles, zlib compressed. When the class names of the sections change or
+the extraction is fixed, the words are extracted again from the archive with
+app.repo.google.extract instead of being scraped again. Only the last snapshot
+of a word and pair is kept, an unchanged snapshot is not written again.
+
+Scrapes hand their snapshot over with `save_later` once the browser is closed,
+it is compressed and saved in background, outside of the request deadline.
+"""
+
+import asyncio
+import hashlib
+import logging
+import zlib
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.resilience import deadline_scope
+from app.domain.entities import ArchivedPageEntity
+from app.domain.normalization import clean_word, normalize_word
+from app.models import ScrapePage as ScrapePageModel
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+def compress_page(page: str, level: int = 6) -> bytes:
+    return zlib.compress(page.encode(), level)
+
+
+def decompress_page(page: bytes) -> str:
+    return zlib.decompress(page).decode()
+
+
+@dataclass
+class ScrapeArchivePgRepo:
+    """Compressed snapshots of scraped pages inside database."""
+
+    _session_factory: Callable[[], AbstractAsyncContextManager["AsyncSession"]]
+    compression_level: int = 6
+
+    _tasks: set[asyncio.Task] = field(default_factory=set, init=False, repr=False)
+
+    def save_later(self, word: str, sl: str, tl: str, page: str) -> None:
+        """Saves the snapshot in background, a failure is only logged."""
+        task = asyncio.create_task(self._save_quietly(word, sl, tl, page))
+        # keep a strong reference until the task is done
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def join(self) -> None:
+        """Waits for the snapshots saved in background."""
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _save_quietly(self, word: str, sl: str, tl: str, page: str) -> None:
+        try:
+            # the snapshot outlives the request of the scrape
+            with deadline_scope(None):
+                await self.save(word, sl, tl, page)
+        except Exception:
+            logger.warning(
+                "Cannot archive page of %s %s:%s", word, sl, tl, exc_info=True
+            )
+
+    async def save(self, word: str, sl: str, tl: str, page: str) -> None:
+        """Keeps the snapshot as the last one of the word and pair."""
+        digest = hashlib.sha256(page.encode()).hexdigest()
+        # hundreds of kilobytes, off the event loop
+        compressed = await asyncio.to_thread(
+            compress_page, page, self.compression_level
+        )
+        insert_stmt = insert(ScrapePageModel).values(
+            word=clean_word(word),
+            normalized=normalize_word(word, sl),
+            sl=sl,
+            tl=tl,
+            digest=digest,
+            page=compressed,
+        )
+        insert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=["normalized", "sl", "tl"],
+            set_={
+                "word": insert_stmt.excluded.word,
+                "digest": insert_stmt.excluded.digest,
+                "page": insert_stmt.excluded.page,
+                "scraped_at": func.now(),
+            },
+            where=ScrapePageModel.digest != insert_stmt.excluded.digest,
+        )
+
+        async with self._session_factory() as session:
+            await session.execute(insert_stmt)
+
+    async def get(self, word: str, sl: str, tl: str) -> Optional[str]:
+        """The uncompressed snapshot of the word and pair."""
+        async with self._session_factory() as session:
+            page = await session.scalar(
+                select(ScrapePageModel.page).where(
+                    ScrapePageModel.normalized == normalize_word(word, sl),
+                    ScrapePageModel.sl == sl,
+                    ScrapePageModel.tl == tl,
+                )
+            )
+        return decompress_page(page) if page is not None else None
+
+    async def get_batch(
+        self,
+        after_page_id: int = 0,
+        limit: int = 100,
+        sl: Optional[str] = None,
+        tl: Optional[str] = None,
+    ) -> list[ArchivedPageEntity]:
+        """Up to `limit` compressed pages with page_id greater than
+        `after_page_id`, in page_id order."""
+        stmt = (
+            select(
+                ScrapePageModel.page_id,
+                ScrapePageModel.word,
+                ScrapePageModel.sl,
+                ScrapePageModel.tl,
+                ScrapePageModel.page,
+            )
+            .where(ScrapePageModel.page_id > after_page_id)
+            .order_by(ScrapePageModel.page_id)
+            .limit(limit)
+        )
+
+        if sl is not None:
+            stmt = stmt.where(ScrapePageModel.sl == sl)
+        if tl is not None:
+            stmt = stmt.where(ScrapePageModel.tl == tl)
+
+        async with self._session_factory() as session:
+            rows = await session.execute(stmt)
+            return [ArchivedPageEntity.model_validate(row) for row in rows]
@@ -0,0 +1,203 @@
+"""
+Language partitions of the word children tables.
+
+`definitions`, `synonyms`, `translations` and `examples` are list partitioned
+by language (see app.models), rows of languages without own partition live in
+the `<table>_default` partition. `add_language` moves a language into its own
+`<table>_<language>` partitions while the service keeps running:
+
+1. an empty table shaped like the parent is created with a CHECK constraint
+   on the language, so attaching it needs no validation scan of its rows,
+2. rows of the language are copied from the default partition in batches,
+   one transaction per batch, reads and writes go on meanwhile,
+3. one transaction blocks writes to the default partition, catches up with
+   rows changed since the copy, deletes the language from the default
+   partition and attaches the table.
+
+The last step holds its locks while it deletes the rows of the language and
+scans the default partition, so give languages their partitions early, while
+they have few rows. A language without rows is attached at once.
+"""
+
+import re
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Table, func, select, text
+
+from app.models import PARTITIONED_MODELS
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# the code ends up in table names and partition bounds, keep it strict
+LANGUAGE = re.compile(r"^[A-Za-z]{2,3}(-[A-Za-z0-9]{2,8})*$")
+
+
+class InvalidLanguageException(Exception):
+    """Language code cannot name a partition."""
+
+    pass
+
+
+@dataclass
+class PartitionPgRepo:
+    """Management of the language partitions."""
+
+    _session_factory: Callable[[], AbstractAsyncContextManager["AsyncSession"]]
+    # the final step gives up instead of queueing behind long transactions
+    lock_timeout: str = "5s"
+
+    @staticmethod
+    def partition_name(table: str, language: str) -> str:
+        """:raises InvalidLanguageException: malformed language code."""
+        if not LANGUAGE.match(language):
+            raise InvalidLanguageException(f"Cannot partition by {language!r}")
+        return f"{table}_{language.lower().replace('-', '_')}"
+
+    async def get_partitions(self) -> dict[str, dict[str, str]]:
+        """Returns partition bounds by partition name for every partitioned table,
+        e.g. {"definitions": {"definitions_default": "DEFAULT", ...}}."""
+        query = text(
+            "SELECT parent.relname, child.relname,"
+            " pg_get_expr(child.relpartbound, child.oid)"
+            " FROM pg_inherits"
+            " JOIN pg_class AS parent ON parent.oid = pg_inherits.inhparent"
+            " JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid"
+            " WHERE parent.relname = ANY(:tables) AND child.relkind = 'r'"
+            " ORDER BY 1, 2"
+        )
+        tables = [model.__tablename__ for model in PARTITIONED_MODELS]
+
+        partitions = {table: {} for table in tables}
+        async with self._session_factory() as session:
+            for table, partition, bound in await session.execute(
+                query, {"tables": tables}
+            ):
+                partitions[table][partition] = bound
+        return partitions
+
+    async def add_language(self, language: str, batch_size: int = 5000) -> int:
+        """Moves the language out of the default partitions, returns the number
+        of moved rows. Tables already partitioned for it are skipped, so an
+        interrupted run can be repeated.
+
+        :raises InvalidLanguageException: malformed language code.
+        """
+        moved = 0
+        partitions = await self.get_partitions()
+        for model in PARTITIONED_MODELS:
+            table = model.__table__
+            name = self.partition_name(table.name, language)
+            if name in partitions[table.name]:
+                continue
+
+            await self._create_detached(table, name, language)
+            await self._copy(table, name, language, batch_size)
+            moved += await self._attach(table, name, language)
+        return moved
+
+    async def _create_detached(self, table: Table, name: str, language: str) -> None:
+        async with self._session_factory() as session:
+            if await session.scalar(select(func.to_regclass(name))) is not None:
+                # left by an interrupted run
+                return
+
+            # indexes are copied, attaching adopts them instead of building
+            await session.execute(
+                text(f"CREATE TABLE {name} (LIKE {table.name} INCLUDING ALL)")
+            )
+            await session.execute(
+                text(
+                    f"ALTER TABLE {name} ADD CONSTRAINT {name}_language_check"
+                    f" CHECK (language = '{language}')"
+                )
+            )
+            # same as the parent one, attaching adopts it without validation
+            await session.execute(
+                text(
+                    f"ALTER TABLE {name} ADD CONSTRAINT {name}_word_id_fkey"
+                    " FOREIGN KEY (word_id) REFERENCES words (word_id)"
+                    " ON DELETE CASCADE"
+                )
+            )
+
+    async def _copy(
+        self, table: Table, name: str, language: str, batch_size: int
+    ) -> None:
+        """Copies rows of the language in primary key order."""
+        key = table.primary_key.columns.values()[0].name
+        columns = self._columns(table)
+        query = text(
+            f"WITH batch AS ("
+            f" SELECT {columns} FROM {table.name}_default"
+            f" WHERE language = :language AND {key} > :last_id"
+            f" ORDER BY {key} LIMIT :limit"
+            f"), copied AS ("
+            f" INSERT INTO {name} ({columns}) SELECT {columns} FROM batch"
+            f" ON CONFLICT DO NOTHING"
+            f") SELECT max({key}) FROM batch"
+        )
+
+        last_id = 0
+        while True:
+            async with self._session_factory() as session:
+                batch_last_id = await session.scalar(
+                    query,
+                    {"language": language, "last_id": last_id, "limit": batch_size},
+                )
+            if batch_last_id is None:
+                return
+            last_id = batch_last_id
+
+    async def _attach(self, table: Table, name: str, language: str) -> int:
+        """Moves the remaining rows and attaches the partition, returns the number
+        of rows removed from the default partition."""
+        default = f"{table.name}_default"
+        key = table.primary_key.columns.values()[0].name
+        columns = self._columns(table)
+        params = {"language": language}
+
+        async with self._session_factory() as session:
+            await session.execute(
+                text(f"SET LOCAL lock_timeout = '{self.lock_timeout}'")
+            )
+            # reads go on, writes wait for the attach
+            await session.execute(text(f"LOCK TABLE {default} IN EXCLUSIVE MODE"))
+
+            # rows deleted or inserted during the copy
+            await session.execute(
+                text(
+                    f"DELETE FROM {name} WHERE NOT EXISTS ("
+                    f" SELECT 1 FROM {default}"
+                    f" WHERE {default}.{key} = {name}.{key}"
+                    f" AND {default}.language = {name}.language)"
+                )
+            )
+            await session.execute(
+                text(
+                    f"INSERT INTO {name} ({columns})"
+                    f" SELECT {columns} FROM {default} WHERE language = :language"
+                    f" ON CONFLICT DO NOTHING"
+                ),
+                params,
+            )
+            result = await session.execute(
+                text(f"DELETE FROM {default} WHERE language = :language"), params
+            )
+            await session.execute(
+                text(
+                    f"ALTER TABLE {table.name} ATTACH PARTITION {name}"
+                    f" FOR VALUES IN ('{language}')"
+                )
+            )
+        return result.rowcount
+
+    @staticmethod
+    def _columns(table: Table) -> str:
+        # generated columns are computed by the target table
+        return ", ".join(
+            column.name for column in table.columns if column.computed is None
+        )
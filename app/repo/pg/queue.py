@@ -0,0 +1,286 @@
+"""
+Postgres-backed queue of scrapes, consumed by `python -m app.scrape_worker`.
+
+API workers enqueue a job for a word missing in the database and wait for it,
+browsers run in the scrape workers only. Concurrent misses of one word share
+its active job. Workers take jobs with `FOR UPDATE SKIP LOCKED`, so any number
+of them share the queue without taking a job twice, and save the scraped word
+to the database.
+
+Notifications, delivered on commit:
+
+- `scrape_jobs` with an empty payload when a job is queued, wakes idle workers,
+- `scrape_jobs_done` with the job id when a job is finished.
+
+Both sides also poll, a lost notification only delays them. A job taken by
+a worker that died is queued again after the job timeout, at most
+`max_attempts` times.
+"""
+
+import asyncio
+from collections.abc import Callable, Iterator
+from contextlib import AbstractAsyncContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import Float, Text, cast, delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.tracing import current_span
+from app.domain.entities import JobStatus, ScrapeJobEntity
+from app.domain.normalization import clean_word, normalize_word
+from app.models import ScrapeJob as ScrapeJobModel
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+JOBS_CHANNEL = "scrape_jobs"
+DONE_CHANNEL = "scrape_jobs_done"
+
+ACTIVE = (JobStatus.PENDING.value, JobStatus.RUNNING.value)
+FINISHED = (JobStatus.DONE, JobStatus.FAILED)
+
+
+def _seconds(seconds: float):
+    return func.make_interval(0, 0, 0, 0, 0, 0, cast(seconds, Float))
+
+
+@dataclass
+class NotificationListener:
+    """Dedicated LISTEN connection of a process, wakes the tasks subscribed to
+    a payload of the channel."""
+
+    engine: "AsyncEngine"
+    channel: str
+
+    _connection: Optional["AsyncConnection"] = field(default=None, init=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+    _waiters: dict[str, set[asyncio.Future]] = field(
+        default_factory=dict, init=False
+    )
+
+    async def start(self) -> None:
+        """Connects unless connected, safe to call before every wait."""
+        async with self._lock:
+            if self._connection is not None and not self._connection.closed:
+                return
+            connection = await self.engine.connect()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.add_listener(
+                self.channel, self._notified
+            )
+            self._connection = connection
+
+    async def stop(self) -> None:
+        async with self._lock:
+            if self._connection is not None:
+                # the connection is discarded, listeners do not leak to the pool
+                await self._connection.invalidate()
+                await self._connection.close()
+                self._connection = None
+
+    @contextmanager
+    def subscribe(self, payload: str) -> Iterator[asyncio.Future]:
+        """Future resolved by the next notification with the payload."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(payload, set()).add(future)
+        try:
+            yield future
+        finally:
+            waiters = self._waiters.get(payload)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[payload]
+
+    def _notified(self, connection, pid: int, channel: str, payload: str) -> None:
+        for future in self._waiters.pop(payload, ()):
+            if not future.done():
+                future.set_result(None)
+
+
+@dataclass
+class ScrapeQueuePgRepo:
+    """Scrape jobs inside database."""
+
+    _session_factory: Callable[[], AbstractAsyncContextManager["AsyncSession"]]
+    # on DONE_CHANNEL, waiters poll only without it
+    listener: Optional[NotificationListener] = None
+    poll_interval: float = 5.0
+
+    async def enqueue(self, word: str, sl: str, tl: str, priority: int = 0) -> int:
+        """Queues the scrape unless it is queued or running, returns the job id.
+        A queued job is moved up to the given priority. The worker continues
+        the current trace."""
+        span = current_span()
+        insert_stmt = insert(ScrapeJobModel).values(
+            word=clean_word(word),
+            normalized=normalize_word(word, sl),
+            sl=sl,
+            tl=tl,
+            priority=priority,
+            traceparent=span.traceparent if span else None,
+        )
+        insert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=["normalized", "sl", "tl"],
+            # literal, parameters do not match the index predicate
+            index_where=text("status IN ('pending', 'running')"),
+            set_={
+                "priority": func.least(
+                    ScrapeJobModel.priority, insert_stmt.excluded.priority
+                )
+            },
+        ).returning(ScrapeJobModel.job_id)
+
+        async with self._session_factory() as session:
+            job_id = await session.scalar(insert_stmt)
+            await session.execute(select(func.pg_notify(JOBS_CHANNEL, "")))
+        return job_id
+
+    async def dequeue(self, limit: int = 1) -> list[ScrapeJobEntity]:
+        """Takes up to `limit` pending jobs, the highest priority first."""
+        picked = (
+            select(ScrapeJobModel.job_id)
+            .where(ScrapeJobModel.status == JobStatus.PENDING.value)
+            .order_by(ScrapeJobModel.priority, ScrapeJobModel.job_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(ScrapeJobModel)
+            .where(ScrapeJobModel.job_id.in_(picked.scalar_subquery()))
+            .values(
+                status=JobStatus.RUNNING.value,
+                attempts=ScrapeJobModel.attempts + 1,
+                updated_at=func.now(),
+            )
+            .returning(ScrapeJobModel)
+        )
+
+        async with self._session_factory() as session:
+            result = await session.execute(stmt)
+            jobs = [ScrapeJobEntity.model_validate(job) for job in result.scalars()]
+        return sorted(jobs, key=lambda job: (job.priority, job.job_id))
+
+    async def finish(self, job_id: int, error: Optional[str] = None) -> None:
+        """Marks the job done, or failed with the error, and notifies waiters."""
+        async with self._session_factory() as session:
+            await session.execute(
+                update(ScrapeJobModel)
+                .where(ScrapeJobModel.job_id == job_id)
+                .values(
+                    status=(JobStatus.FAILED if error else JobStatus.DONE).value,
+                    error=error,
+                    updated_at=func.now(),
+                )
+            )
+            await session.execute(select(func.pg_notify(DONE_CHANNEL, str(job_id))))
+
+    async def release(self, job_id: int) -> None:
+        """Gives a taken job back to the queue, the attempt does not count."""
+        async with self._session_factory() as session:
+            await session.execute(
+                update(ScrapeJobModel)
+                .where(ScrapeJobModel.job_id == job_id)
+                .values(
+                    status=JobStatus.PENDING.value,
+                    attempts=ScrapeJobModel.attempts - 1,
+                    updated_at=func.now(),
+                )
+            )
+
+    async def get(self, job_id: int) -> Optional[ScrapeJobEntity]:
+        async with self._session_factory() as session:
+            job = await session.get(ScrapeJobModel, job_id)
+            return ScrapeJobEntity.model_validate(job) if job else None
+
+    async def get_latest(
+        self, word: str, sl: str, tl: str
+    ) -> Optional[ScrapeJobEntity]:
+        """The last job queued for the word and pair, finished or not."""
+        async with self._session_factory() as session:
+            job = await session.scalar(
+                select(ScrapeJobModel)
+                .where(
+                    ScrapeJobModel.normalized == normalize_word(word, sl),
+                    ScrapeJobModel.sl == sl,
+                    ScrapeJobModel.tl == tl,
+                )
+                .order_by(ScrapeJobModel.job_id.desc())
+                .limit(1)
+            )
+            return ScrapeJobEntity.model_validate(job) if job else None
+
+    async def wait(self, job_id: int, timeout: float) -> Optional[ScrapeJobEntity]:
+        """Waits for the job to finish, returns it finished or None on timeout."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        if self.listener is not None:
+            await self.listener.start()
+
+        while True:
+            subscription = (
+                nullcontext(None)
+                if self.listener is None
+                else self.listener.subscribe(str(job_id))
+            )
+            # subscribed before the check, a notification cannot slip between
+            with subscription as notified:
+                job = await self.get(job_id)
+                if job is None or job.status in FINISHED:
+                    return job
+
+                left = deadline - loop.time()
+                if left <= 0:
+                    return None
+                if notified is None:
+                    await asyncio.sleep(min(left, self.poll_interval))
+                else:
+                    await asyncio.wait(
+                        {notified}, timeout=min(left, self.poll_interval)
+                    )
+
+    async def requeue_stale(self, timeout: float, max_attempts: int) -> int:
+        """Queues again the jobs running longer than `timeout` seconds, their
+        worker is likely gone. Jobs out of attempts fail. Returns the number of
+        requeued jobs."""
+        stale = (ScrapeJobModel.status == JobStatus.RUNNING.value) & (
+            ScrapeJobModel.updated_at < func.now() - _seconds(timeout)
+        )
+
+        async with self._session_factory() as session:
+            failed = (
+                update(ScrapeJobModel)
+                .where(stale, ScrapeJobModel.attempts >= max_attempts)
+                .values(
+                    status=JobStatus.FAILED.value,
+                    error="Scrape worker timed out",
+                    updated_at=func.now(),
+                )
+                .returning(ScrapeJobModel.job_id)
+                .cte("failed")
+            )
+            await session.execute(
+                select(func.pg_notify(DONE_CHANNEL, cast(failed.c.job_id, Text)))
+            )
+
+            result = await session.execute(
+                update(ScrapeJobModel)
+                .where(stale)
+                .values(status=JobStatus.PENDING.value, updated_at=func.now())
+            )
+            if result.rowcount:
+                await session.execute(select(func.pg_notify(JOBS_CHANNEL, "")))
+        return result.rowcount
+
+    async def purge(self, older_than: float) -> int:
+        """Deletes jobs finished more than `older_than` seconds ago."""
+        async with self._session_factory() as session:
+            result = await session.execute(
+                delete(ScrapeJobModel).where(
+                    ScrapeJobModel.status.not_in(ACTIVE),
+                    ScrapeJobModel.updated_at
+                    < func.now() - _seconds(older_than),
+                )
+            )
+        return result.rowcount
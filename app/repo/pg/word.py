@@ -1,21 +1,48 @@
-from collections.abc import Callable
+import base64
+import json
+import math
+from collections.abc import AsyncIterator, Callable
 from contextlib import AbstractAsyncContextManager
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import delete, select
+from sqlalchemy import (
+    BigInteger,
+    Float,
+    String,
+    Text,
+    and_,
+    column,
+    delete,
+    func,
+    literal,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    values,
+)
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import contains_eager, joinedload
 from sqlalchemy.orm.exc import MultipleResultsFound
 
-from app.domain.entities import WordEntity
+from app.core.tracing import traced
+from app.domain.entities import (
+    ReverseTranslationEntity,
+    SearchHitEntity,
+    SearchPageEntity,
+    WordEntity,
+)
+from app.domain.normalization import clean_word, normalize_keys, normalize_word
 from app.models import Definition as DefinitionModel
 from app.models import Example as ExampleModel
 from app.models import Synonym as SynonymModel
 from app.models import Translation as TranslationModel
 from app.models import Word as WordModel
+from app.models import WordEntry as WordEntryModel
+from app.models import WordStat as WordStatModel
 
 if TYPE_CHECKING:
+    from sqlalchemy import Select, Subquery
     from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -25,64 +52,225 @@ class UndefinedWordException(BaseException):
     pass
 
 
+class InvalidCursorException(Exception):
+    """Pagination cursor is malformed."""
+
+    pass
+
+
+# WordEntity attribute, model, text and id columns of every word section
+_SECTIONS = (
+    (
+        "definitions",
+        DefinitionModel,
+        DefinitionModel.definition,
+        DefinitionModel.definition_id,
+    ),
+    ("synonyms", SynonymModel, SynonymModel.synonym, SynonymModel.synonym_id),
+    (
+        "translations",
+        TranslationModel,
+        TranslationModel.translation,
+        TranslationModel.translation_id,
+    ),
+    ("examples", ExampleModel, ExampleModel.example, ExampleModel.example_id),
+)
+_SECTION_FIELDS = {
+    attribute: text_column.key for attribute, _, text_column, _ in _SECTIONS
+}
+
+
+def _entry(word: str, language: str) -> dict:
+    return {"word": word, "language": language, **{s[0]: [] for s in _SECTIONS}}
+
+
+def _section_item(row) -> dict:
+    return {_SECTION_FIELDS[row.section]: row.text, "language": row.language}
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def encode_cursor(*values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor))
+    except ValueError:
+        raise InvalidCursorException(f"Malformed cursor {cursor}") from None
+
+
 @dataclass
 class WordPgRepo:
     """Access to word entity inside database."""
 
     _session_factory: Callable[[], AbstractAsyncContextManager["AsyncSession"]]
-
-    async def get(self, word: str, sl: str, tl: str) -> WordEntity:
+    # lookups go through it when set, e.g. to a read replica
+    _read_session_factory: Optional[
+        Callable[[], AbstractAsyncContextManager["AsyncSession"]]
+    ] = None
+    # word popularity halves in this many seconds without hits
+    stats_half_life: float = 7 * 24 * 3600
+
+    def _read_session(self) -> AbstractAsyncContextManager["AsyncSession"]:
+        if self._read_session_factory is None:
+            return self._session_factory()
+        return self._read_session_factory()
+
+    @traced("WordPgRepo.get")
+    async def get(
+        self, word: str, sl: str, tl: str, primary: bool = False
+    ) -> WordEntity:
         """Retrieves a WordEntity from the database based on the provided word, source
-        language (sl), and target language (tl). The method performs an inner join with
-        the DefinitionModel to ensure the existence of a definition for the word in the target
-        language, which implies the presence of a translation.
-        Synonyms, translations, and examples are joined using left joins, allowing
-        their absence.
+        language (sl), and target language (tl).
+
+        Reads the assembled entry from `word_entries` with a single indexed lookup.
+        Words saved before the table was introduced and not backfilled yet
+        are assembled from the normalized tables. `primary` reads from the primary
+        instead of the read session, for words another process has just saved.
         """
-        async with self._session_factory() as session:
+        session_factory = self._session_factory if primary else self._read_session
+        async with session_factory() as session:
+            query = (
+                select(WordEntryModel.payload)
+                .join(WordModel, WordModel.word_id == WordEntryModel.word_id)
+                .where(
+                    WordModel.normalized.in_(normalize_keys(word, sl)),
+                    WordEntryModel.tl == tl,
+                )
+                .limit(1)
+            )
+
+            if sl != "auto":
+                query = query.where(WordModel.language == sl)
+
+            payload = (await session.execute(query)).scalar()
 
-            # do an inner join with the table defenition with the assumption,
-            # that the absence of a defenition means the absence of a translation
-            # left join for other cases
+            if payload is not None:
+                return WordEntity.model_validate(payload)
+
+            return await self._get_normalized(session, word, sl, tl)
+
+    async def get_many(
+        self, word: str, sl: str, tls: list[str]
+    ) -> dict[str, WordEntity]:
+        """Retrieves the word for several target languages at once.
+
+        Entries of all the targets are read with one query, targets missing
+        in `word_entries` are assembled from the normalized tables with one
+        query per section filtered by all of them. Targets without
+        a definition are absent from the result.
+        """
+        async with self._read_session() as session:
             query = (
-                select(WordModel)
-                .join(
-                    DefinitionModel,
-                    (WordModel.word_id == DefinitionModel.word_id)
-                    & (DefinitionModel.language == tl),
-                )
-                .options(contains_eager(WordModel.definitions))
-                .join(
-                    SynonymModel,
-                    (WordModel.word_id == SynonymModel.word_id)
-                    & (SynonymModel.language == tl),
-                    isouter=True,
-                )
-                .options(contains_eager(WordModel.synonyms))
-                .join(
-                    TranslationModel,
-                    (WordModel.word_id == TranslationModel.word_id)
-                    & (TranslationModel.language == tl),
-                    isouter=True,
-                )
-                .options(contains_eager(WordModel.translations))
-                .join(
-                    ExampleModel,
-                    (WordModel.word_id == ExampleModel.word_id)
-                    & (ExampleModel.language == tl),
-                    isouter=True,
-                )
-                .options(contains_eager(WordModel.examples))
-                .where(WordModel.word == word)
+                select(WordEntryModel.tl, WordEntryModel.payload)
+                .join(WordModel, WordModel.word_id == WordEntryModel.word_id)
+                .where(
+                    WordModel.normalized.in_(normalize_keys(word, sl)),
+                    WordEntryModel.tl.in_(tls),
+                )
+                .order_by(WordModel.word_id)
             )
 
             if sl != "auto":
                 query = query.where(WordModel.language == sl)
 
-            result = await session.execute(query)
-            word = result.scalars().first()
+            words = {}
+            for tl, payload in await session.execute(query):
+                words.setdefault(tl, WordEntity.model_validate(payload))
+
+            missing = [tl for tl in tls if tl not in words]
+            if missing:
+                words.update(
+                    await self._get_normalized_many(session, word, sl, missing)
+                )
 
-            return WordEntity.model_validate(word) if word else None
+            return words
+
+    async def _get_normalized_many(
+        self, session: "AsyncSession", word: str, sl: str, tls: list[str]
+    ) -> dict[str, WordEntity]:
+        """Assembles WordEntities of the targets from the normalized tables.
+
+        Sections are read as plain rows and validated once into entities,
+        without materializing ORM objects. Targets without a definition are
+        absent from the result.
+        """
+        rows = await session.execute(self._normalized_query(word, sl, *tls))
+
+        entries = {}
+        for row in rows:
+            entry = entries.setdefault(
+                (row.word_id, row.language),
+                _entry(row.word, row.word_language),
+            )
+            entry[row.section].append(_section_item(row))
+
+        words = {}
+        # ordered by word_id, the oldest word wins as in `get`
+        for (_, tl), entry in entries.items():
+            # absence of a definition means the absence of a translation
+            if tl not in words and entry["definitions"]:
+                words[tl] = WordEntity.model_validate(entry)
+
+        return words
+
+    async def _get_normalized(
+        self, session: "AsyncSession", word: str, sl: str, tl: str
+    ) -> Optional[WordEntity]:
+        """Assembles a WordEntity from the normalized tables."""
+        return (await self._get_normalized_many(session, word, sl, [tl])).get(tl)
+
+    @staticmethod
+    def _sections(sections, *criteria) -> "Subquery":
+        """Rows of the given sections as (section, word_id, language, text,
+        row_id). Every section table is filtered by `criteria` built for its
+        model, e.g. on the target language to limit the scans to its partitions.
+        """
+        return union_all(
+            *(
+                select(
+                    literal(attribute).label("section"),
+                    model.word_id,
+                    model.language,
+                    text_column.label("text"),
+                    id_column.label("row_id"),
+                ).where(*(criterion(model) for criterion in criteria))
+                for attribute, model, text_column, id_column in sections
+            )
+        ).subquery()
+
+    @classmethod
+    def _normalized_query(cls, word: str, sl: str, *tls: str) -> "Select":
+        """Sections of the words matching `word` in the target languages joined
+        with their word, one row per section item instead of the product of all
+        the sections.
+        """
+        word_ids = select(WordModel.word_id).where(
+            WordModel.normalized.in_(normalize_keys(word, sl))
+        )
+
+        if sl != "auto":
+            word_ids = word_ids.where(WordModel.language == sl)
+
+        rows = cls._sections(
+            _SECTIONS,
+            lambda model: model.word_id.in_(word_ids),
+            lambda model: model.language.in_(tls),
+        )
+
+        return (
+            select(
+                rows,
+                WordModel.word,
+                WordModel.language.label("word_language"),
+            )
+            .join(WordModel, WordModel.word_id == rows.c.word_id)
+            .order_by(rows.c.word_id, rows.c.row_id)
+        )
 
     async def get_id(self, word: str, sl: str) -> int:
         """Retrieves the unique identifier (ID) of a word from the database based on
@@ -91,7 +279,9 @@ class WordPgRepo:
         its language match the given parameters.
         """
         async with self._session_factory() as session:
-            query = select(WordModel.word_id).where(WordModel.word == word)
+            query = select(WordModel.word_id).where(
+                WordModel.normalized.in_(normalize_keys(word, sl))
+            )
 
             if sl != "auto":
                 query = query.where(WordModel.language == sl)
@@ -110,29 +300,63 @@ class WordPgRepo:
         """Deletes a word and its related data (definitions, synonyms, translations,
             and examples) from the database based on the provided word ID.
 
-        This method executes multiple delete operations to remove all associated data
-        from the related tables (ExampleModel, TranslationModel, SynonymModel, DefinitionModel)
-        before finally deleting the word from the WordModel. The deletions are not done via
-        cascade delete in the database, but rather through individual delete statements
-        in this method."""
+        Related data is removed by `ON DELETE CASCADE` foreign keys, so this is
+        a single statement looking up child rows by their word_id indexes."""
 
         async with self._session_factory() as session:
-            # This one should be improved by delete cascade.
-            # Due to problems with cascade declaration here is a fast approach
-            await session.execute(
-                delete(ExampleModel).where(WordModel.word_id == word_id)
-            )
-            await session.execute(
-                delete(TranslationModel).where(WordModel.word_id == word_id)
+            await session.execute(delete(WordModel).where(WordModel.word_id == word_id))
+
+    async def delete_words(self, words: list[str], sl: str) -> int:
+        """Deletes given words with their related data in one transaction.
+
+        Returns the number of deleted words."""
+
+        async with self._session_factory() as session:
+            stmt = (
+                delete(WordModel)
+                .where(
+                    WordModel.normalized.in_(
+                        {key for w in words for key in normalize_keys(w, sl)}
+                    )
+                )
+                .returning(WordModel.word_id)
             )
-            await session.execute(
-                delete(SynonymModel).where(WordModel.word_id == word_id)
+
+            if sl != "auto":
+                stmt = stmt.where(WordModel.language == sl)
+
+            result = await session.execute(stmt)
+            return len(result.all())
+
+    async def delete_filtered(self, word_filter: str, sl: str, limit: int) -> int:
+        """Deletes at most `limit` words containing `word_filter` substring
+        with their related data in one transaction.
+
+        Returns the number of deleted words, call it until zero to delete them all."""
+
+        async with self._session_factory() as session:
+            ids = (
+                select(WordModel.word_id)
+                .where(
+                    WordModel.normalized.like(
+                        f"%{escape_like(normalize_word(word_filter, sl))}%"
+                    )
+                )
+                .order_by(WordModel.word_id)
+                .limit(limit)
             )
-            await session.execute(
-                delete(DefinitionModel).where(WordModel.word_id == word_id)
+
+            if sl != "auto":
+                ids = ids.where(WordModel.language == sl)
+
+            result = await session.execute(
+                delete(WordModel)
+                .where(WordModel.word_id.in_(ids.scalar_subquery()))
+                .returning(WordModel.word_id)
             )
-            await session.execute(delete(WordModel).where(WordModel.word_id == word_id))
+            return len(result.all())
 
+    @traced("WordPgRepo.get_pages")
     async def get_pages(
         self,
         page: int,
@@ -142,7 +366,7 @@ class WordPgRepo:
         include_synonyms: Optional[bool] = False,
         include_translations: Optional[bool] = False,
         include_examples: Optional[bool] = False,
-    ) -> list["WordModel"]:
+    ) -> list[WordEntity]:
         """Retrieves a paginated list of words from the database,
         with optional filters and related data.
 
@@ -151,28 +375,308 @@ class WordPgRepo:
         is included based on the respective boolean flags.
         """
 
-        async with self._session_factory() as session:
-            stmt = select(WordModel).order_by(WordModel.word)
+        async with self._read_session() as session:
+            stmt = select(
+                WordModel.word_id, WordModel.word, WordModel.language
+            ).order_by(WordModel.word)
 
             if word_filter:
                 stmt = stmt.where(WordModel.word.ilike(f"%{word_filter}%"))
 
-            if include_definitions:
-                stmt = stmt.options(joinedload(WordModel.definitions))
-            if include_synonyms:
-                stmt = stmt.options(joinedload(WordModel.synonyms))
-            if include_translations:
-                stmt = stmt.options(joinedload(WordModel.translations))
-            if include_examples:
-                stmt = stmt.options(joinedload(WordModel.examples))
-
             stmt = stmt.offset((page - 1) * page_size).limit(page_size)
 
-            result = await session.execute(stmt)
+            entries = {
+                row.word_id: _entry(row.word, row.language)
+                for row in await session.execute(stmt)
+            }
+
+            sections = [
+                section
+                for section, include in zip(
+                    _SECTIONS,
+                    (
+                        include_definitions,
+                        include_synonyms,
+                        include_translations,
+                        include_examples,
+                    ),
+                )
+                if include
+            ]
+            if entries and sections:
+                rows = self._sections(
+                    sections, lambda model: model.word_id.in_(entries)
+                )
+                query = select(rows).order_by(rows.c.word_id, rows.c.row_id)
+                for row in await session.execute(query):
+                    entries[row.word_id][row.section].append(_section_item(row))
+
+            return [WordEntity.model_validate(entry) for entry in entries.values()]
+
+    async def search(
+        self, query: str, language: str, limit: int = 20, after: Optional[str] = None
+    ) -> SearchPageEntity:
+        """Ranked full-text search over definitions and examples in `language`.
+
+        Matches are found through the GIN indexes on the generated `search_vector`
+        columns, `query` uses web search syntax (quotes, `or`, `-`). Results are
+        ordered by rank and paginated by keyset: pass `next_cursor` of a page as
+        `after` to get the next one.
+
+        :raises InvalidCursorException: malformed `after`.
+        """
+        tsquery = func.websearch_to_tsquery(func.text_search_config(language), query)
+
+        def matches(model, text_column, id_column, kind: str):
+            return select(
+                literal(kind).label("kind"),
+                id_column.label("row_id"),
+                model.word_id,
+                model.language,
+                text_column.label("text"),
+                func.ts_rank(model.search_vector, tsquery, type_=Float).label("rank"),
+            ).where(
+                model.language == language,
+                model.search_vector.op("@@")(tsquery),
+            )
+
+        hits = union_all(
+            matches(
+                DefinitionModel,
+                DefinitionModel.definition,
+                DefinitionModel.definition_id,
+                "definition",
+            ),
+            matches(
+                ExampleModel, ExampleModel.example, ExampleModel.example_id, "example"
+            ),
+        ).subquery()
+
+        stmt = (
+            select(hits, WordModel.word, WordModel.language.label("word_language"))
+            .join(WordModel, WordModel.word_id == hits.c.word_id)
+            .order_by(hits.c.rank.desc(), hits.c.kind, hits.c.row_id)
+            .limit(limit + 1)
+        )
+
+        if after:
+            try:
+                rank, kind, row_id = decode_cursor(after)
+            except (TypeError, ValueError):
+                raise InvalidCursorException(f"Malformed cursor {after}") from None
+            stmt = stmt.where(
+                or_(
+                    hits.c.rank < rank,
+                    and_(
+                        hits.c.rank == rank,
+                        tuple_(hits.c.kind, hits.c.row_id) > tuple_(kind, row_id),
+                    ),
+                )
+            )
+
+        async with self._read_session() as session:
+            rows = (await session.execute(stmt)).all()
+
+        page = SearchPageEntity(
+            hits=[
+                SearchHitEntity(
+                    word=row.word,
+                    word_language=row.word_language,
+                    language=row.language,
+                    kind=row.kind,
+                    text=row.text,
+                    rank=row.rank,
+                )
+                for row in rows[:limit]
+            ]
+        )
+
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            page.next_cursor = encode_cursor(last.rank, last.kind, last.row_id)
+
+        return page
+
+    async def reverse_lookup(
+        self,
+        translations: list[str],
+        language: str,
+        sl: str = "auto",
+        partial: bool = False,
+        limit: int = 20,
+    ) -> dict[str, list[ReverseTranslationEntity]]:
+        """Finds source words having any of `translations` into `language`.
+
+        All the translations are looked up with one query. Exact matches are
+        case-insensitive and use the (language, lower(translation)) index,
+        `partial` matches substrings through the trigram index. Returns at most
+        `limit` words per translation, keyed by the given translation.
+        """
+        if not translations:
+            return {}
+
+        patterns = {
+            term: f"%{escape_like(term.lower())}%" if partial else term.lower()
+            for term in translations
+        }
+        terms = values(
+            column("term", Text), column("pattern", Text), name="terms"
+        ).data(list(patterns.items()))
+
+        lowered = func.lower(TranslationModel.translation)
+        condition = (
+            lowered.like(terms.c.pattern, escape="\\")
+            if partial
+            else lowered == terms.c.pattern
+        )
+
+        hits = (
+            select(
+                terms.c.term,
+                WordModel.word,
+                WordModel.language,
+                TranslationModel.translation,
+                func.row_number()
+                .over(
+                    partition_by=terms.c.term,
+                    order_by=(WordModel.word, TranslationModel.translation_id),
+                )
+                .label("position"),
+            )
+            .select_from(terms)
+            .join(TranslationModel, condition)
+            .join(WordModel, WordModel.word_id == TranslationModel.word_id)
+            .where(TranslationModel.language == language)
+        )
+
+        if sl != "auto":
+            hits = hits.where(WordModel.language == sl)
+
+        hits = hits.subquery()
+        stmt = (
+            select(hits.c.term, hits.c.word, hits.c.language, hits.c.translation)
+            .where(hits.c.position <= limit)
+            .order_by(hits.c.term, hits.c.position)
+        )
+
+        async with self._read_session() as session:
+            rows = (await session.execute(stmt)).all()
+
+        words = {term: [] for term in translations}
+        for row in rows:
+            words[row.term].append(
+                ReverseTranslationEntity(
+                    word=row.word, language=row.language, translation=row.translation
+                )
+            )
+        return words
+
+    async def get_hot_entries(
+        self, top_n: int
+    ) -> AsyncIterator[tuple[str, str, str, dict]]:
+        """Yields (word, sl, tl, payload) of up to `top_n` most popular entries of
+        every language pair, the most popular first. Entries without hits follow
+        the popular ones, the most recently updated first."""
+
+        ranked = (
+            select(
+                WordModel.word,
+                WordModel.language,
+                WordEntryModel.tl,
+                WordEntryModel.payload,
+                func.row_number()
+                .over(
+                    partition_by=(WordModel.language, WordEntryModel.tl),
+                    order_by=(
+                        func.coalesce(self._decayed_score(), 0).desc(),
+                        WordModel.last_updated.desc(),
+                        WordModel.word_id.desc(),
+                    ),
+                )
+                .label("position"),
+            )
+            .join(WordModel, WordModel.word_id == WordEntryModel.word_id)
+            .outerjoin(
+                WordStatModel,
+                (WordStatModel.word_id == WordEntryModel.word_id)
+                & (WordStatModel.tl == WordEntryModel.tl),
+            )
+        )
+        ranked = ranked.subquery()
+
+        async with self._session_factory() as session:
+            result = await session.stream(
+                select(
+                    ranked.c.word, ranked.c.language, ranked.c.tl, ranked.c.payload
+                )
+                .where(ranked.c.position <= top_n)
+                .order_by(ranked.c.position)
+                .execution_options(yield_per=1000)
+            )
+            async for row in result:
+                yield tuple(row)
+
+    async def save_stats(
+        self, counts: dict[tuple[str, str, str], int], batch_size: int = 500
+    ) -> None:
+        """Adds hits per (normalized word, sl, tl) to the decayed popularity scores,
+        one upsert per batch. Hits of words that are not stored are ignored."""
+        items = list(counts.items())
+
+        for start in range(0, len(items), batch_size):
+            hits = values(
+                column("normalized", Text),
+                column("language", String),
+                column("tl", String),
+                column("hits", BigInteger),
+                name="hits",
+            ).data([(*key, count) for key, count in items[start : start + batch_size]])
+
+            insert_stmt = insert(WordStatModel).from_select(
+                ["word_id", "tl", "score", "hits"],
+                select(WordModel.word_id, hits.c.tl, hits.c.hits, hits.c.hits).join(
+                    WordModel,
+                    (WordModel.normalized == hits.c.normalized)
+                    & (WordModel.language == hits.c.language),
+                ),
+            )
+            # decay the stored score to now, then add the new hits
+            insert_stmt = insert_stmt.on_conflict_do_update(
+                index_elements=[WordStatModel.word_id, WordStatModel.tl],
+                set_={
+                    "score": self._decayed_score() + insert_stmt.excluded.score,
+                    "hits": WordStatModel.hits + insert_stmt.excluded.hits,
+                    "updated_at": func.now(),
+                },
+            )
 
-            return result.unique().scalars().all()
-            # return [WordEntity.model_validate(word) for word in words]
+            async with self._session_factory() as session:
+                await session.execute(insert_stmt)
+
+    def _decayed_score(self):
+        """Stored score decayed from its `updated_at` to now."""
+        age = func.extract("epoch", func.now() - WordStatModel.updated_at)
+        return WordStatModel.score * func.exp(
+            -math.log(2) / self.stats_half_life * age
+        )
+
+    async def get_suggest_entries(self) -> list[tuple[str, str, float]]:
+        """Returns (word, language, popularity) of every stored word, popularity
+        is the number of target languages the word is stored in."""
+
+        async with self._read_session() as session:
+            result = await session.execute(
+                select(
+                    WordModel.word,
+                    WordModel.language,
+                    func.count(DefinitionModel.language.distinct()),
+                )
+                .outerjoin(DefinitionModel, DefinitionModel.word_id == WordModel.word_id)
+                .group_by(WordModel.word_id)
+            )
+            return [tuple(row) for row in result]
 
+    @traced("WordPgRepo.save")
     async def save(self, word: WordEntity):
         """Saves a WordEntity instance into the database.
 
@@ -184,53 +688,190 @@ class WordPgRepo:
         async with self._session_factory() as session:
             # Check if the word already exists
             stmt = select(WordModel).where(
-                WordModel.word == word.word, WordModel.language == word.language
+                WordModel.normalized == normalize_word(word.word, word.language),
+                WordModel.language == word.language,
             )
+            # the oldest one if variants were stored before normalization
+            stmt = stmt.order_by(WordModel.word_id).limit(1)
             result = await session.execute(stmt)
             word_record = result.scalar_one_or_none()
 
             if word_record is None:
                 # Create a new WordModel instance
-                word_record = WordModel(word=word.word, language=word.language)
+                word_record = WordModel(
+                    word=clean_word(word.word), language=word.language
+                )
                 session.add(word_record)
                 await session.commit()
 
         async with self._session_factory() as session:
+            await self._insert_sections(session, word_record.word_id, word)
+            await session.commit()
+
+    async def replace(self, word: WordEntity, tl: str) -> None:
+        """Replaces the sections of the word in `tl` with the ones of `word`
+        in one transaction, e.g. extracted again from an archived page.
 
-            # Insert/Ignore Definitions
-            for definition in word.definitions:
-                insert_stmt = insert(DefinitionModel).values(
-                    definition=definition.definition,
-                    word_id=word_record.word_id,
-                    language=definition.language,
+        Rows of `tl` absent from `word` are deleted, the word is created if it
+        does not exist yet. Readers see either the old or the new sections.
+        """
+        async with self._session_factory() as session:
+            word_id = await session.scalar(
+                select(WordModel.word_id)
+                .where(
+                    WordModel.normalized == normalize_word(word.word, word.language),
+                    WordModel.language == word.language,
                 )
-                await session.execute(insert_stmt.on_conflict_do_nothing())
+                .order_by(WordModel.word_id)
+                .limit(1)
+            )
 
-            # Insert/Ignore Synonyms
-            for synonym in word.synonyms:
-                insert_stmt = insert(SynonymModel).values(
-                    synonym=synonym.synonym,
-                    word_id=word_record.word_id,
-                    language=synonym.language,
+            if word_id is None:
+                word_record = WordModel(
+                    word=clean_word(word.word), language=word.language
                 )
-                await session.execute(insert_stmt.on_conflict_do_nothing())
+                session.add(word_record)
+                await session.flush()
+                word_id = word_record.word_id
 
-            # Insert/Ignore Translations
-            for translation in word.translations:
-                insert_stmt = insert(TranslationModel).values(
-                    translation=translation.translation,
-                    word_id=word_record.word_id,
-                    language=translation.language,
+            for _, model, _, _ in _SECTIONS:
+                await session.execute(
+                    delete(model).where(model.word_id == word_id, model.language == tl)
                 )
-                await session.execute(insert_stmt.on_conflict_do_nothing())
+            await session.execute(
+                delete(WordEntryModel).where(
+                    WordEntryModel.word_id == word_id, WordEntryModel.tl == tl
+                )
+            )
+            await self._insert_sections(session, word_id, word)
+            await session.commit()
 
-            # Insert/Ignore Examples
-            for example in word.examples:
-                insert_stmt = insert(ExampleModel).values(
-                    example=example.example,
-                    word_id=word_record.word_id,
-                    language=example.language,
+    async def _insert_sections(
+        self, session: "AsyncSession", word_id: int, word: WordEntity
+    ) -> None:
+        """Adds the sections of the word missing in the database and rebuilds
+        the entries of its target languages."""
+
+        # Insert/Ignore Definitions
+        for definition in word.definitions:
+            insert_stmt = insert(DefinitionModel).values(
+                definition=definition.definition,
+                word_id=word_id,
+                language=definition.language,
+            )
+            await session.execute(insert_stmt.on_conflict_do_nothing())
+
+        # Insert/Ignore Synonyms
+        for synonym in word.synonyms:
+            insert_stmt = insert(SynonymModel).values(
+                synonym=synonym.synonym,
+                word_id=word_id,
+                language=synonym.language,
+            )
+            await session.execute(insert_stmt.on_conflict_do_nothing())
+
+        # Insert/Ignore Translations
+        for translation in word.translations:
+            insert_stmt = insert(TranslationModel).values(
+                translation=translation.translation,
+                word_id=word_id,
+                language=translation.language,
+            )
+            await session.execute(insert_stmt.on_conflict_do_nothing())
+
+        # Insert/Ignore Examples
+        for example in word.examples:
+            insert_stmt = insert(ExampleModel).values(
+                example=example.example,
+                word_id=word_id,
+                language=example.language,
+            )
+            await session.execute(insert_stmt.on_conflict_do_nothing())
+
+        for tl in {definition.language for definition in word.definitions}:
+            await self._save_entry(session, word_id, tl)
+
+    async def _save_entry(self, session: "AsyncSession", word_id: int, tl: str):
+        """Rebuilds the `word_entries` row of the word from the normalized tables."""
+
+        word_entity = await self._load_entity(session, word_id, tl)
+        if word_entity is None:
+            return
+
+        insert_stmt = insert(WordEntryModel).values(
+            word_id=word_id, tl=tl, payload=word_entity.model_dump(mode="json")
+        )
+        await session.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=[WordEntryModel.word_id, WordEntryModel.tl],
+                set_={
+                    "payload": insert_stmt.excluded.payload,
+                    "version": WordEntryModel.version + 1,
+                },
+            )
+        )
+
+    async def _load_entity(
+        self, session: "AsyncSession", word_id: int, tl: str
+    ) -> Optional[WordEntity]:
+        word_record = await session.get(WordModel, word_id)
+        if word_record is None:
+            return None
+
+        sections = {}
+        for attribute, model in (
+            ("definitions", DefinitionModel),
+            ("synonyms", SynonymModel),
+            ("translations", TranslationModel),
+            ("examples", ExampleModel),
+        ):
+            result = await session.execute(
+                select(model)
+                .where(model.word_id == word_id, model.language == tl)
+                .order_by(*model.__table__.primary_key.columns)
+            )
+            sections[attribute] = result.scalars().all()
+
+        # absence of a definition means the absence of a translation
+        if not sections["definitions"]:
+            return None
+
+        return WordEntity.model_validate(
+            {"word": word_record.word, "language": word_record.language, **sections}
+        )
+
+    async def rebuild_entries(
+        self, after_word_id: int = 0, limit: int = 500
+    ) -> Optional[int]:
+        """Rebuilds `word_entries` of up to `limit` words with word_id greater than
+        `after_word_id` in one transaction.
+
+        Returns the greatest word_id of the batch, words without a definition
+        included, or None when there is nothing left.
+        """
+
+        async with self._session_factory() as session:
+            word_ids = (
+                await session.scalars(
+                    select(WordModel.word_id)
+                    .where(WordModel.word_id > after_word_id)
+                    .order_by(WordModel.word_id)
+                    .limit(limit)
                 )
-                await session.execute(insert_stmt.on_conflict_do_nothing())
+            ).all()
+            if not word_ids:
+                return None
+
+            result = await session.execute(
+                select(DefinitionModel.word_id, DefinitionModel.language)
+                .where(DefinitionModel.word_id.in_(word_ids))
+                .distinct()
+                .order_by(DefinitionModel.word_id)
+            )
+
+            for word_id, tl in result.all():
+                await self._save_entry(session, word_id, tl)
 
             await session.commit()
+
+        return word_ids[-1]
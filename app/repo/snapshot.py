@@ -0,0 +1,229 @@
+"""
+Read-only snapshot of hot dictionary entries shared by worker processes.
+
+The snapshot is a single file written by `python -m app.build_snapshot` and
+memory-mapped by every worker, so the entries live once in the page cache
+whatever the number of workers. Layout, little-endian:
+
+    header   magic (8 bytes), entry count (u64)
+    index    count * (key offset u64, key length u32, payload offset u64,
+             payload length u32), ordered by key bytes
+    keys     "sl\\x1ftl\\x1fnormalized word" utf-8 strings
+    payloads WordEntity JSON documents
+
+A lookup is a binary search over the index that copies only the probed keys,
+the payload is copied once out of the mapping and parsed.
+
+The builder writes a temporary file next to the snapshot and renames it over
+the old one. Readers notice the new inode within `check_interval` seconds and
+map it; the previous mapping stays valid until it is closed.
+
+Entries are as fresh as the last build. Words deleted through a worker, by
+list or by filter, are hidden by that worker until the next snapshot, other
+workers serve them until then. A file that is not a valid snapshot is logged
+and ignored, lookups go to the database.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.core.metrics import Counter
+from app.domain.entities import WordEntity
+from app.domain.normalization import normalize_word
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"WSNAP001"
+HEADER = struct.Struct("<8sQ")
+INDEX_ENTRY = struct.Struct("<QIQI")
+SEPARATOR = "\x1f"
+
+LOOKUPS = Counter(
+    "word_snapshot_lookups_total",
+    "Word lookups served by the snapshot.",
+    labelnames=("result",),
+)
+
+
+class InvalidSnapshotException(Exception):
+    """File is not a word snapshot."""
+
+    pass
+
+
+def make_key(word: str, sl: str, tl: str) -> bytes:
+    return SEPARATOR.join((sl, tl, normalize_word(word, sl))).encode()
+
+
+def write_snapshot(path: str, entries: Iterable[tuple[str, str, str, dict]]) -> int:
+    """Atomically replaces the snapshot at `path` by (word, sl, tl, payload)
+    entries. Returns the number of written entries."""
+    items = sorted(
+        (make_key(word, sl, tl), json.dumps(payload, separators=(",", ":")).encode())
+        for word, sl, tl, payload in entries
+    )
+
+    keys_offset = HEADER.size + INDEX_ENTRY.size * len(items)
+    payloads_offset = keys_offset + sum(len(key) for key, _ in items)
+
+    index, key_position, payload_position = [], keys_offset, payloads_offset
+    for key, payload in items:
+        index.append(
+            INDEX_ENTRY.pack(key_position, len(key), payload_position, len(payload))
+        )
+        key_position += len(key)
+        payload_position += len(payload)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(HEADER.pack(MAGIC, len(items)))
+            file.writelines(index)
+            file.writelines(key for key, _ in items)
+            file.writelines(payload for _, payload in items)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return len(items)
+
+
+class _Mapping:
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self.inode = os.fstat(file.fileno()).st_ino
+            self.mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.mm) < HEADER.size or not self._is_complete():
+            self.mm.close()
+            raise InvalidSnapshotException(f"{path} is not a word snapshot")
+
+    def _is_complete(self) -> bool:
+        magic, self.count = HEADER.unpack_from(self.mm)
+        index_end = HEADER.size + self.count * INDEX_ENTRY.size
+        if magic != MAGIC or index_end > len(self.mm):
+            return False
+        if not self.count:
+            return True
+        # payloads are written in index order, the last one ends the file
+        _, _, payload_offset, payload_length = INDEX_ENTRY.unpack_from(
+            self.mm, index_end - INDEX_ENTRY.size
+        )
+        return payload_offset + payload_length == len(self.mm)
+
+    def find(self, key: bytes) -> Optional[bytes]:
+        mm, low, high = self.mm, 0, self.count
+
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_length, payload_offset, payload_length = (
+                INDEX_ENTRY.unpack_from(mm, HEADER.size + middle * INDEX_ENTRY.size)
+            )
+            probe = mm[key_offset : key_offset + key_length]
+
+            if probe < key:
+                low = middle + 1
+            elif probe > key:
+                high = middle
+            else:
+                return mm[payload_offset : payload_offset + payload_length]
+
+        return None
+
+
+@dataclass
+class WordSnapshot:
+    """Reader of the snapshot file, a missing file is an empty snapshot."""
+
+    path: str
+    check_interval: float = 5.0
+
+    _mapping: Optional[_Mapping] = field(default=None, init=False, repr=False)
+    _checked_at: float = field(default=float("-inf"), init=False, repr=False)
+    _invalid_inode: Optional[int] = field(default=None, init=False, repr=False)
+    # (normalized word, sl) deleted since the snapshot was mapped,
+    # "auto" hides any sl
+    _deleted: set[tuple[str, str]] = field(default_factory=set, init=False)
+    # (normalized substring, sl) of the filters deleted words matched
+    _deleted_filters: set[tuple[str, str]] = field(default_factory=set, init=False)
+
+    def get(self, word: str, sl: str, tl: str) -> Optional[WordEntity]:
+        mapping = self._current()
+        if mapping is None or sl == "auto":
+            return None
+        deleted = {(normalize_word(word, sl), sl), (normalize_word(word), "auto")}
+        if deleted & self._deleted or self._matches_deleted_filter(word, sl):
+            return None
+
+        payload = mapping.find(make_key(word, sl, tl))
+        LOOKUPS.inc(result="miss" if payload is None else "hit")
+
+        if payload is None:
+            return None
+        return WordEntity.model_validate_json(payload)
+
+    def discard(self, word: str, sl: str = "auto") -> None:
+        """Hides the word until the next snapshot is mapped."""
+        self._deleted.add((normalize_word(word, sl), sl))
+
+    def discard_matching(self, word_filter: str, sl: str = "auto") -> None:
+        """Hides the words containing `word_filter`, as matched by
+        `WordPgRepo.delete_filtered`, until the next snapshot is mapped."""
+        self._deleted_filters.add((normalize_word(word_filter, sl), sl))
+
+    def _matches_deleted_filter(self, word: str, sl: str) -> bool:
+        return any(
+            deleted_sl in (sl, "auto") and substring in normalize_word(word, deleted_sl)
+            for substring, deleted_sl in self._deleted_filters
+        )
+
+    def _current(self) -> Optional[_Mapping]:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._mapping
+        self._checked_at = now
+
+        try:
+            inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            self._mapping = None
+            return None
+        except OSError:
+            logger.warning("Cannot stat snapshot %s", self.path, exc_info=True)
+            self._mapping = None
+            return None
+
+        if self._mapping is None or self._mapping.inode != inode:
+            if inode == self._invalid_inode:
+                return None
+            try:
+                mapping = _Mapping(self.path)
+            except (InvalidSnapshotException, ValueError, OSError):
+                logger.warning(
+                    "Ignoring invalid snapshot %s", self.path, exc_info=True
+                )
+                # not mapped again until it is replaced
+                self._invalid_inode, self._mapping = inode, None
+                return None
+            # a rebuild no longer holds the deleted words, the first snapshot
+            # mapped may
+            if self._mapping is not None:
+                self._deleted.clear()
+                self._deleted_filters.clear()
+            # the previous mapping is unmapped when garbage collected
+            self._mapping = mapping
+
+        return self._mapping
@@ -0,0 +1,50 @@
+"""
+Word popularity, counted in memory and flushed to the `word_stats` table.
+
+`WordRepo` counts every served (word, sl, tl). The counts stay in the worker
+and are flushed periodically in batched upserts, each flush adds them to
+an exponentially decayed score: without hits a score halves every
+`WORDS_STATS_HALF_LIFE_SECONDS`. The scores rank the entries of the snapshot
+and of the cache warmed at startup.
+"""
+
+from collections import Counter as CounterDict
+from dataclasses import dataclass, field
+
+from app.core.metrics import Counter
+from app.domain.normalization import normalize_word
+
+DROPPED = Counter(
+    "word_stats_dropped_total",
+    "Word hits not counted because too many words wait for a flush.",
+)
+
+
+@dataclass
+class WordStats:
+    # bounds the memory between flushes
+    max_keys: int = 100000
+
+    # (normalized word, sl, tl) -> hits since the last flush
+    _counts: CounterDict[tuple[str, str, str]] = field(
+        default_factory=CounterDict, init=False, repr=False
+    )
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def record(self, word: str, sl: str, tl: str) -> None:
+        key = (normalize_word(word, sl), sl, tl)
+        if key not in self._counts and len(self._counts) >= self.max_keys:
+            DROPPED.inc()
+            return
+        self._counts[key] += 1
+
+    def drain(self) -> dict[tuple[str, str, str], int]:
+        """Returns the counts since the last drain and starts over."""
+        counts, self._counts = self._counts, CounterDict()
+        return dict(counts)
+
+    def restore(self, counts: dict[tuple[str, str, str], int]) -> None:
+        """Gives back drained counts that could not be flushed."""
+        self._counts.update(counts)
@@ -0,0 +1,180 @@
+"""
+In-memory prefix index of stored words for autocomplete.
+
+Words of every source language are kept in a sorted list of casefolded keys,
+a prefix is answered with bisect: the matching keys form one contiguous range.
+Matches are ordered by popularity, the number of target languages the word is
+stored in plus the lookups served by this worker, then alphabetically.
+
+Ranked matches of prefixes shorter than `cached_prefix_length` or matching more
+than `max_candidates` words are cached, so a popular word is never missed for
+sorting after thousands of others. Saved words are merged into the cached
+rankings, deleted ones drop the rankings of their prefixes; lookups counted
+meanwhile do not reorder them.
+
+The index is per worker process. It is rebuilt from the database at startup
+and periodically, and updated in place on save and delete in between, so
+changes made by other workers show up after the next rebuild. Lookups counted
+by the worker are kept across rebuilds.
+"""
+
+import bisect
+import heapq
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+# sorts after the keys starting with any prefix
+_KEY_END = "\U0010ffff"
+
+
+@dataclass
+class SuggestIndex:
+    # prefixes matching more words than this are ranked once and cached
+    max_candidates: int = 5000
+    cached_prefix_length: int = 3
+    cached_limit: int = 50
+
+    # language -> sorted [(key, word)]
+    _words: dict[str, list[tuple[str, str]]] = field(default_factory=dict)
+    # (language, word) -> popularity
+    _popularity: dict[tuple[str, str], float] = field(
+        default_factory=lambda: defaultdict(float)
+    )
+    # (language, word) -> lookups served by this worker
+    _touches: dict[tuple[str, str], int] = field(
+        default_factory=lambda: defaultdict(int)
+    )
+    # (language, prefix) -> sorted [(-popularity, key, word, language)]
+    _cache: dict[tuple[str, str], list[tuple[float, str, str, str]]] = field(
+        default_factory=dict
+    )
+
+    def __len__(self) -> int:
+        return sum(len(words) for words in self._words.values())
+
+    def rebuild(self, entries: Iterable[tuple[str, str, float]]) -> None:
+        """Replaces the index by (word, language, popularity) entries."""
+        words = defaultdict(list)
+        popularity = defaultdict(float)
+
+        for word, language, score in entries:
+            words[language].append((word.casefold(), word))
+            popularity[language, word] = score + self._touches.get((language, word), 0)
+
+        for language_words in words.values():
+            language_words.sort()
+
+        self._words, self._popularity = dict(words), popularity
+        self._touches = defaultdict(
+            int,
+            {entry: n for entry, n in self._touches.items() if entry in popularity},
+        )
+        self._cache = {}
+
+    def add(self, word: str, language: str, popularity: float = 0) -> None:
+        words = self._words.setdefault(language, [])
+        item = (word.casefold(), word)
+        position = bisect.bisect_left(words, item)
+        self._popularity[language, word] = max(
+            self._popularity[language, word],
+            popularity + self._touches.get((language, word), 0),
+        )
+
+        if position == len(words) or words[position] != item:
+            words.insert(position, item)
+            ranked_item = (-self._popularity[language, word], *item, language)
+            for key in self._cache_keys(item[0], language):
+                ranked = self._cache.get(key)
+                if ranked is not None:
+                    bisect.insort(ranked, ranked_item)
+                    del ranked[self.cached_limit :]
+
+    def remove(self, word: str, language: str = "auto") -> None:
+        for language in self._languages(language):
+            words = self._words[language]
+            item = (word.casefold(), word)
+            position = bisect.bisect_left(words, item)
+
+            if position < len(words) and words[position] == item:
+                del words[position]
+                self._popularity.pop((language, word), None)
+                self._touches.pop((language, word), None)
+                for key in self._cache_keys(item[0], language):
+                    self._cache.pop(key, None)
+
+    def remove_matching(self, word_filter: str, language: str = "auto") -> None:
+        """Removes words containing `word_filter` case-insensitively."""
+        word_filter = word_filter.casefold()
+
+        for language in self._languages(language):
+            words = self._words[language]
+            removed = [item for item in words if word_filter in item[0]]
+            if not removed:
+                continue
+            self._words[language] = [
+                item for item in words if word_filter not in item[0]
+            ]
+            for _, word in removed:
+                self._popularity.pop((language, word), None)
+                self._touches.pop((language, word), None)
+            self._cache.clear()
+
+    def touch(self, word: str, language: str) -> None:
+        """Counts a lookup of the word, if it is in the index."""
+        if (language, word) in self._popularity:
+            self._popularity[language, word] += 1
+            self._touches[language, word] += 1
+
+    def suggest(
+        self, prefix: str, language: str = "auto", limit: int = 10
+    ) -> list[tuple[str, str]]:
+        """Returns up to `limit` (word, language) starting with `prefix`,
+        the most popular first."""
+        prefix = prefix.casefold()
+        ranges = [
+            (sl, *self._range(self._words[sl], prefix))
+            for sl in self._languages(language)
+        ]
+
+        key = (language, prefix)
+        if key in self._cache and limit <= self.cached_limit:
+            ranked = self._cache[key]
+        elif limit <= self.cached_limit and (
+            len(prefix) < self.cached_prefix_length
+            or sum(end - start for _, start, end in ranges) > self.max_candidates
+        ):
+            ranked = self._cache[key] = self._rank(ranges, self.cached_limit)
+        else:
+            ranked = self._rank(ranges, limit)
+
+        return [(word, language) for _, _, word, language in ranked[:limit]]
+
+    def _rank(
+        self, ranges: list[tuple[str, int, int]], limit: int
+    ) -> list[tuple[float, str, str, str]]:
+        candidates = (
+            (-self._popularity.get((language, word), 0), key, word, language)
+            for language, start, end in ranges
+            for key, word in self._words[language][start:end]
+        )
+        return heapq.nsmallest(limit, candidates)
+
+    @staticmethod
+    def _range(words: list[tuple[str, str]], prefix: str) -> tuple[int, int]:
+        """Positions of the first and past the last key starting with `prefix`."""
+        return (
+            bisect.bisect_left(words, (prefix,)),
+            bisect.bisect_left(words, (prefix + _KEY_END,)),
+        )
+
+    def _cache_keys(self, key: str, language: str) -> Iterator[tuple[str, str]]:
+        """Cache keys of the rankings a word with this key can be part of."""
+        for length in range(len(key) + 1):
+            yield language, key[:length]
+            yield "auto", key[:length]
+
+    def _languages(self, language: str) -> list[str]:
+        if language == "auto":
+            return list(self._words)
+        return [language] if language in self._words else []
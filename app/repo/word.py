@@ -1,9 +1,74 @@
-from dataclasses import dataclass
-from typing import Optional
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import aclosing, nullcontext
+from dataclasses import dataclass, field
+from typing import Optional, TypeVar, Union
 
-from app.domain.entities import WordEntity
+from selenium.common.exceptions import WebDriverException
+
+from app.core.admission import AdmissionLimiter, AdmissionRejectedException
+from app.core.metrics import Counter, Histogram
+from app.core.resilience import (
+    CircuitBreaker,
+    DeadlineExceededException,
+    bound_timeout,
+    check_deadline,
+    with_deadline,
+)
+from app.core.scheduler import Priority, ScrapeQueueTimeoutException, ScrapeScheduler
+from app.core.tracing import traced
+from app.domain.entities import (
+    JobStatus,
+    ReverseTranslationEntity,
+    SearchPageEntity,
+    WordEntity,
+)
+from app.repo.cache import WordCache
 from app.repo.google.word import GoogleWordRepo
+from app.repo.local.word import LocalDictionaryRepo
+from app.repo.pg.queue import ScrapeQueuePgRepo
 from app.repo.pg.word import WordPgRepo
+from app.repo.snapshot import WordSnapshot
+from app.repo.stats import WordStats
+from app.repo.suggest import SuggestIndex
+
+T = TypeVar("T")
+
+DEFAULT_PROVIDER_CHAIN = ["local", "scraper"]
+
+PROVIDER_LOOKUPS = Counter(
+    "word_provider_lookups_total",
+    "Word lookups per provider and result: hit, miss, error or cancelled.",
+    labelnames=("provider", "result"),
+)
+PROVIDER_LATENCY = Histogram(
+    "word_provider_latency_seconds",
+    "Word lookup latency per provider.",
+    labelnames=("provider",),
+)
+
+
+def record_lookup(provider: str, seconds: float, result: str) -> None:
+    PROVIDER_LOOKUPS.inc(provider=provider, result=result)
+    PROVIDER_LATENCY.observe(seconds, provider=provider)
+
+
+async def observe(
+    provider: str, awaitable: Awaitable[Optional[T]]
+) -> Optional[T]:
+    """Awaits a provider lookup recording its latency and result."""
+    started = time.perf_counter()
+    result = "error"
+    try:
+        value = await awaitable
+        result = "miss" if value is None else "hit"
+        return value
+    except asyncio.CancelledError:
+        result = "cancelled"
+        raise
+    finally:
+        record_lookup(provider, time.perf_counter() - started, result)
 
 
 @dataclass
@@ -12,18 +77,388 @@ class WordRepo:
 
     pg_repo: "WordPgRepo"
     google_repo: "GoogleWordRepo"
+    scheduler: Optional["ScrapeScheduler"] = None
+    suggest_index: Optional["SuggestIndex"] = None
+    snapshot: Optional["WordSnapshot"] = None
+    breaker: Optional["CircuitBreaker"] = None
+    local_repo: Optional["LocalDictionaryRepo"] = None
+    cache: Optional["WordCache"] = None
+    stats: Optional["WordStats"] = None
+    # scrapes go to the scrape workers when set, see app.repo.pg.queue
+    scrape_queue: Optional["ScrapeQueuePgRepo"] = None
+    scrape_wait: float = 15.0
+    # in-flight limits of database lookups and of scrapes, see app.core.admission
+    db_limiter: Optional["AdmissionLimiter"] = None
+    scrape_limiter: Optional["AdmissionLimiter"] = None
+    # providers asked on a database miss per "sl:tl" pair or "default"
+    provider_chain: dict[str, list[str]] = field(
+        default_factory=lambda: {"default": DEFAULT_PROVIDER_CHAIN}
+    )
+
+    @traced("WordRepo.get")
+    async def get(
+        self, word: str, sl: str, tl: str, priority: Priority = Priority.INTERACTIVE
+    ) -> WordEntity:
+        """Looks the word up in the database and scrapes it on a miss.
 
-    async def get(self, word: str, sl: str, tl: str) -> WordEntity:
-        word_entity = await self.pg_repo.get(word, sl, tl)
+        :raises AdmissionRejectedException: too many lookups or scrapes in flight.
+        :raises ScrapeQueueTimeoutException: scrape did not get a scheduler slot.
+        :raises CircuitOpenException: scraping provider is failing.
+        :raises DeadlineExceededException: request deadline exceeded.
+        """
+        word_entity = await self.lookup(word, sl, tl)
 
         if word_entity is None:
-            word_entity = await self.google_repo.get(word, sl, tl)
+            word_entity = await self.fetch(word, sl, tl, priority)
+        elif self.suggest_index is not None:
+            self.suggest_index.touch(word_entity.word, word_entity.language)
 
-        if word_entity:
-            await self.pg_repo.save(word_entity)
+        if word_entity is not None and self.stats is not None:
+            self.stats.record(word_entity.word, word_entity.language, tl)
 
         return word_entity
 
+    async def get_many(
+        self,
+        word: str,
+        sl: str,
+        tls: list[str],
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> dict[str, WordEntity]:
+        """Looks the word up for several target languages and scrapes the missing
+        ones concurrently, each scrape admitted by the scheduler on its own.
+        Targets that cannot be scraped are absent from the result.
+
+        When the provider is failing or the deadline runs out, the stored targets
+        are returned without the missing ones; the error is raised only if
+        nothing is stored.
+
+        :raises ScrapeQueueTimeoutException: scrape did not get a scheduler slot.
+        :raises CircuitOpenException: scraping provider is failing.
+        :raises DeadlineExceededException: request deadline exceeded.
+        """
+        words = await self.lookup_many(word, sl, tls)
+
+        if self.suggest_index is not None and words:
+            word_entity = next(iter(words.values()))
+            self.suggest_index.touch(word_entity.word, word_entity.language)
+
+        missing = [tl for tl in tls if tl not in words]
+        fetched = await asyncio.gather(
+            *(self.fetch(word, sl, tl, priority) for tl in missing),
+            return_exceptions=True,
+        )
+
+        for tl, word_entity in zip(missing, fetched):
+            if isinstance(
+                word_entity, (AdmissionRejectedException, DeadlineExceededException)
+            ):
+                # serve what is stored instead of failing the whole request
+                if not words:
+                    raise word_entity
+            elif isinstance(word_entity, BaseException):
+                raise word_entity
+            elif word_entity is not None:
+                words[tl] = word_entity
+
+        if self.stats is not None:
+            for tl, word_entity in words.items():
+                self.stats.record(word_entity.word, word_entity.language, tl)
+
+        return {tl: words[tl] for tl in tls if tl in words}
+
+    async def lookup(self, word: str, sl: str, tl: str) -> Optional[WordEntity]:
+        """Looks the word up in the snapshot of hot entries, in the cache, then
+        in the database.
+
+        :raises AdmissionRejectedException: too many database lookups in flight.
+        :raises DeadlineExceededException: request deadline exceeded.
+        """
+        if self.snapshot is not None:
+            word_entity = self.snapshot.get(word, sl, tl)
+            if word_entity is not None:
+                return word_entity
+
+        if self.cache is not None:
+            word_entity = self.cache.get(word, sl, tl)
+            if word_entity is not None:
+                return word_entity
+
+        async with self._admit(self.db_limiter):
+            word_entity = await observe(
+                "postgres", with_deadline(self.pg_repo.get(word, sl, tl))
+            )
+        if word_entity is not None and self.cache is not None:
+            self.cache.put(word_entity, tl)
+        return word_entity
+
+    async def lookup_many(
+        self, word: str, sl: str, tls: list[str]
+    ) -> dict[str, WordEntity]:
+        """Looks the word up in the snapshot of hot entries, in the cache, then
+        in the database, for several target languages.
+
+        :raises AdmissionRejectedException: too many database lookups in flight.
+        """
+        words = {}
+        for tl in tls:
+            word_entity = None
+            if self.snapshot is not None:
+                word_entity = self.snapshot.get(word, sl, tl)
+            if word_entity is None and self.cache is not None:
+                word_entity = self.cache.get(word, sl, tl)
+            if word_entity is not None:
+                words[tl] = word_entity
+
+        missing = [tl for tl in tls if tl not in words]
+        if missing:
+            async with self._admit(self.db_limiter):
+                stored = await with_deadline(
+                    self.pg_repo.get_many(word, sl, missing)
+                )
+            if self.cache is not None:
+                for tl, word_entity in stored.items():
+                    self.cache.put(word_entity, tl)
+            words.update(stored)
+
+        return words
+
+    async def fetch(
+        self, word: str, sl: str, tl: str, priority: Priority = Priority.INTERACTIVE
+    ) -> Optional[WordEntity]:
+        """Asks the providers of the pair in chain order and saves the first
+        found word to the database.
+
+        :raises ScrapeQueueTimeoutException: scrape did not get a scheduler slot.
+        :raises AdmissionRejectedException: too many scrapes in flight.
+        """
+        for provider in self._providers(sl, tl):
+            if provider == "local":
+                word_entity = await self._get_local(word, sl, tl)
+            elif self.scrape_queue is not None:
+                async with self._admit(self.scrape_limiter):
+                    word_entity = await observe(
+                        "queue", self._scrape_queued(word, sl, tl, priority)
+                    )
+                if word_entity:
+                    # saved by the scrape worker
+                    self._saved(word_entity)
+                    return word_entity
+            else:
+                async with self._admit(self.scrape_limiter):
+                    word_entity = await observe(
+                        "scraper", self._scrape(word, sl, tl, priority)
+                    )
+
+            if word_entity:
+                await self.save(word_entity)
+                return word_entity
+
+        return None
+
+    @staticmethod
+    def _admit(limiter: Optional["AdmissionLimiter"]):
+        return nullcontext() if limiter is None else limiter.slot()
+
+    def _providers(self, sl: str, tl: str) -> list[str]:
+        return self.provider_chain.get(
+            f"{sl}:{tl}", self.provider_chain.get("default", DEFAULT_PROVIDER_CHAIN)
+        )
+
+    async def _get_local(self, word: str, sl: str, tl: str) -> Optional[WordEntity]:
+        if self.local_repo is None:
+            return None
+        return await observe("local", self.local_repo.get(word, sl, tl))
+
+    async def stream(
+        self, word: str, sl: str, tl: str, priority: Priority = Priority.INTERACTIVE
+    ) -> AsyncIterator[tuple[str, Union[WordEntity, list]]]:
+        """Yields ("entity", WordEntity) on a database or local dictionary hit.
+        When the word has to be scraped, yields (section, entities) pairs while it
+        is scraped, then the complete ("entity", WordEntity) after it is saved.
+        Scrapes left to the scrape workers yield the entity only.
+        Yields nothing if the word cannot be found.
+
+        :raises ScrapeQueueTimeoutException: scrape did not get a scheduler slot.
+        :raises CircuitOpenException: scraping provider is failing.
+        :raises DeadlineExceededException: request deadline exceeded.
+        """
+        word_entity = await self.lookup(word, sl, tl)
+
+        if word_entity:
+            yield "entity", word_entity
+            return
+
+        for provider in self._providers(sl, tl):
+            if provider == "local":
+                word_entity = await self._get_local(word, sl, tl)
+                if word_entity:
+                    await self.save(word_entity)
+                    yield "entity", word_entity
+                    return
+            elif self.scrape_queue is not None:
+                async with self._admit(self.scrape_limiter):
+                    word_entity = await observe(
+                        "queue", self._scrape_queued(word, sl, tl, priority)
+                    )
+                if word_entity:
+                    self._saved(word_entity)
+                    yield "entity", word_entity
+                return
+            else:
+                scrape = self._stream_scrape(word, sl, tl, priority)
+                async with self._admit(self.scrape_limiter), aclosing(scrape) as items:
+                    async for item in items:
+                        yield item
+                return
+
+    async def _stream_scrape(
+        self, word: str, sl: str, tl: str, priority: Priority
+    ) -> AsyncIterator[tuple[str, Union[WordEntity, list]]]:
+        if self.breaker is not None:
+            self.breaker.check()
+
+        word_entity = WordEntity(word=word, language=sl)
+        slot = (
+            nullcontext()
+            if self.scheduler is None
+            else self.scheduler.slot(sl, tl, priority)
+        )
+
+        async with slot:
+            if self.breaker is not None:
+                self.breaker.allow()
+            # None when the client went away, it says nothing about the provider
+            success = None
+            started = time.perf_counter()
+
+            try:
+                async with aclosing(self.google_repo.stream(word, sl, tl)) as sections:
+                    while True:
+                        try:
+                            section, values = await with_deadline(anext(sections))
+                        except StopAsyncIteration:
+                            break
+                        setattr(word_entity, section, values)
+                        yield section, values
+                success = True
+            except WebDriverException:
+                success = False
+                return
+            except DeadlineExceededException:
+                success = False
+                raise
+            finally:
+                if self.breaker is not None:
+                    self.breaker.record(success)
+                record_lookup(
+                    "scraper",
+                    time.perf_counter() - started,
+                    {None: "cancelled", False: "error", True: "hit"}[success],
+                )
+
+        await self.save(word_entity)
+        yield "entity", word_entity
+
+    async def save(self, word_entity: WordEntity) -> None:
+        await self.pg_repo.save(word_entity)
+        self._saved(word_entity)
+
+    def _saved(self, word_entity: WordEntity) -> None:
+        """Updates the in-process indexes after the word is saved."""
+        if self.cache is not None:
+            self.cache.discard(word_entity.word, word_entity.language)
+
+        if self.suggest_index is not None:
+            self.suggest_index.add(
+                word_entity.word,
+                word_entity.language,
+                len({d.language for d in word_entity.definitions}),
+            )
+
+    async def suggest(
+        self, prefix: str, sl: str = "auto", limit: int = 10
+    ) -> list[tuple[str, str]]:
+        """(word, language) of stored words starting with `prefix`, the most
+        popular first. Empty if the index is not configured."""
+        if self.suggest_index is None:
+            return []
+        return self.suggest_index.suggest(prefix, sl, limit)
+
+    async def rebuild_suggest_index(self) -> None:
+        if self.suggest_index is not None:
+            self.suggest_index.rebuild(await self.pg_repo.get_suggest_entries())
+
+    async def warm_cache(self, top_n: int) -> int:
+        """Loads up to `top_n` most popular entries of every language pair into
+        the cache, returns the number of loaded entries."""
+        if self.cache is None or not top_n:
+            return 0
+        # ordered by rank, the most popular of every pair come first
+        entries = [entry async for entry in self.pg_repo.get_hot_entries(top_n)]
+        return self.cache.warm(entries)
+
+    async def flush_stats(self) -> None:
+        """Writes the hits counted since the last flush to the database, they are
+        kept for the next flush if the write fails."""
+        if self.stats is None:
+            return
+        counts = self.stats.drain()
+        if not counts:
+            return
+        try:
+            await self.pg_repo.save_stats(counts)
+        except BaseException:
+            self.stats.restore(counts)
+            raise
+
+    async def _scrape(
+        self, word: str, sl: str, tl: str, priority: Priority
+    ) -> Optional[WordEntity]:
+        # fail fast before waiting for a scheduler slot
+        if self.breaker is not None:
+            self.breaker.check()
+
+        if self.scheduler is None:
+            return await self._call_provider(word, sl, tl)
+
+        return await self.scheduler.run(
+            lambda: self._call_provider(word, sl, tl), sl, tl, priority
+        )
+
+    async def _scrape_queued(
+        self, word: str, sl: str, tl: str, priority: Priority
+    ) -> Optional[WordEntity]:
+        """Queues the scrape for the scrape workers and waits for the saved word.
+
+        :raises ScrapeQueueTimeoutException: no worker finished it in time.
+        :raises DeadlineExceededException: request deadline exceeded.
+        """
+        job_id = await with_deadline(
+            self.scrape_queue.enqueue(word, sl, tl, int(priority))
+        )
+        job = await self.scrape_queue.wait(job_id, bound_timeout(self.scrape_wait))
+        if job is None:
+            # request budget ran out before the wait timeout
+            check_deadline()
+            raise ScrapeQueueTimeoutException()
+        if job.status != JobStatus.DONE:
+            return None
+        # the worker saved it on the primary, a replica may not have it yet
+        return await with_deadline(self.pg_repo.get(word, sl, tl, primary=True))
+
+    async def _call_provider(
+        self, word: str, sl: str, tl: str
+    ) -> Optional[WordEntity]:
+        def scrape():
+            return with_deadline(self.google_repo.get(word, sl, tl))
+
+        if self.breaker is None:
+            return await scrape()
+
+        # provider returns None when the browser fails
+        return await self.breaker.run(scrape, is_failure=lambda result: result is None)
+
     async def delete(self, word: str, sl: str) -> None:
         """Idempotent delete function.
 
@@ -37,6 +472,82 @@ class WordRepo:
 
         await self.pg_repo.delete(id)
 
+        if self.suggest_index is not None:
+            self.suggest_index.remove(word, sl)
+        if self.snapshot is not None:
+            self.snapshot.discard(word, sl)
+        if self.cache is not None:
+            self.cache.discard(word, sl)
+
+    async def bulk_delete(
+        self,
+        words: Optional[list[str]] = None,
+        word_filter: Optional[str] = None,
+        sl: str = "auto",
+        batch_size: int = 500,
+    ) -> int:
+        """Deletes words by list and/or by substring filter.
+
+        Each batch of at most `batch_size` words is deleted in its own transaction,
+        so locks are held briefly. Returns the number of deleted words.
+        """
+        deleted = 0
+
+        for start in range(0, len(words or []), batch_size):
+            batch = words[start : start + batch_size]
+            deleted += await self.pg_repo.delete_words(batch, sl)
+
+        if word_filter:
+            while True:
+                batch_deleted = await self.pg_repo.delete_filtered(
+                    word_filter, sl, batch_size
+                )
+                deleted += batch_deleted
+                if batch_deleted < batch_size:
+                    break
+
+        if self.suggest_index is not None:
+            for word in words or []:
+                self.suggest_index.remove(word, sl)
+            if word_filter:
+                self.suggest_index.remove_matching(word_filter, sl)
+        if self.snapshot is not None:
+            for word in words or []:
+                self.snapshot.discard(word, sl)
+            if word_filter:
+                self.snapshot.discard_matching(word_filter, sl)
+        if self.cache is not None:
+            for word in words or []:
+                self.cache.discard(word, sl)
+            if word_filter:
+                self.cache.clear()
+
+        return deleted
+
+    async def search(
+        self, query: str, language: str, limit: int = 20, after: Optional[str] = None
+    ) -> SearchPageEntity:
+        """Full-text search over stored definitions and examples.
+
+        :raises InvalidCursorException: malformed `after`.
+        """
+        async with self._admit(self.db_limiter):
+            return await self.pg_repo.search(query, language, limit, after)
+
+    async def reverse_lookup(
+        self,
+        translations: list[str],
+        language: str,
+        sl: str = "auto",
+        partial: bool = False,
+        limit: int = 20,
+    ) -> dict[str, list[ReverseTranslationEntity]]:
+        """Source words of stored translations into `language`, keyed by translation."""
+        async with self._admit(self.db_limiter):
+            return await self.pg_repo.reverse_lookup(
+                translations, language, sl, partial, limit
+            )
+
     async def get_pages(
         self,
         page: int,
@@ -46,7 +557,7 @@ class WordRepo:
         include_synonyms: Optional[bool] = False,
         include_translations: Optional[bool] = False,
         include_examples: Optional[bool] = False,
-    ) -> list["WordModel"]:
+    ) -> list[WordEntity]:
 
         return await self.pg_repo.get_pages(
             page,
@@ -0,0 +1,121 @@
+"""
+Extracts the archived scraped pages again and replaces their words with the
+result, see app.repo.pg.archive.
+
+Run it after the class names of the sections changed or the extraction was
+fixed, e.g. `python -m app.reprocess_pages --processes 8 --synonym-class Xyz`.
+Pages are read in page_id order in batches and parsed by a pool of processes
+while the previous batch is saved, every word in its own transaction, so the
+archive takes minutes of CPU instead of scraping it again. API workers see
+the new words once their caches expire.
+
+Pages giving no definition, e.g. with a wrong translation class, leave their
+word untouched. With `--dry-run` nothing is replaced, the texts each word would
+gain or lose are printed instead, to check new class names or extraction
+changes against the stored words first.
+"""
+
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from typing import Optional
+
+from app.core.session import get_context
+from app.domain.entities import ArchivedPageEntity, WordEntity
+from app.repo.google.word import GoogleWordRepo
+from app.repo.pg.archive import ScrapeArchivePgRepo, decompress_page
+from app.repo.pg.word import WordPgRepo
+
+
+def extract(repo: GoogleWordRepo, page: ArchivedPageEntity) -> Optional[WordEntity]:
+    """Runs in the pool processes."""
+    sections = repo.extract_page(decompress_page(page.page), page.tl)
+    if not sections["definitions"]:
+        return None
+    return WordEntity(word=page.word, language=page.sl, **sections)
+
+
+def diff(
+    old: Optional[WordEntity], new: WordEntity
+) -> dict[str, tuple[list[str], list[str]]]:
+    """The texts added and removed per section, only for the changed sections."""
+    changes = {}
+    for section in ("definitions", "synonyms", "translations", "examples"):
+        field = section[:-1]
+        before = [getattr(i, field) for i in getattr(old, section)] if old else []
+        after = [getattr(i, field) for i in getattr(new, section)]
+        added = [text for text in after if text not in before]
+        removed = [text for text in before if text not in after]
+        if added or removed:
+            changes[section] = (added, removed)
+    return changes
+
+
+async def main(args: argparse.Namespace) -> None:
+    repo = GoogleWordRepo(
+        translation_class=args.translation_class,
+        example_class=args.example_class,
+        synonym_class=args.synonym_class,
+    )
+    archive = ScrapeArchivePgRepo(_session_factory=get_context)
+    pg_repo = WordPgRepo(_session_factory=get_context)
+    loop = asyncio.get_running_loop()
+
+    after_page_id, replaced, empty = 0, 0, 0
+    verb = "changed" if args.dry_run else "replaced"
+    extracted: list[tuple[ArchivedPageEntity, Optional[WordEntity]]] = []
+    with ProcessPoolExecutor(args.processes) as pool:
+        while True:
+            pages = await archive.get_batch(
+                after_page_id, args.batch_size, args.sl, args.tl
+            )
+            extraction = asyncio.gather(
+                *(loop.run_in_executor(pool, extract, repo, page) for page in pages)
+            )
+
+            for page, word in extracted:
+                if word is None:
+                    empty += 1
+                elif not args.dry_run:
+                    await pg_repo.replace(word, page.tl)
+                    replaced += 1
+                elif changes := diff(
+                    await pg_repo.get(page.word, page.sl, page.tl), word
+                ):
+                    print(f"{page.word} {page.sl}:{page.tl}")
+                    for section, (added, removed) in changes.items():
+                        print(f"  {section}: +{added} -{removed}")
+                    replaced += 1
+            if extracted:
+                print(
+                    f"Up to page_id {after_page_id}:"
+                    f" {replaced} words {verb}, {empty} pages without definition"
+                )
+
+            extracted = list(zip(pages, await extraction))
+            if not pages:
+                break
+            after_page_id = pages[-1].page_id
+
+    print("Done")
+
+
+if __name__ == "__main__":
+    defaults = {f.name: f.default for f in fields(GoogleWordRepo)}
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--sl", help="only the pages of this source language")
+    parser.add_argument("--tl", help="only the pages of this target language")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="print the changes of every word instead of replacing it",
+    )
+    for name in ("translation_class", "example_class", "synonym_class"):
+        parser.add_argument(f"--{name.replace('_', '-')}", default=defaults[name])
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -0,0 +1,218 @@
+"""
+Scrapes the words queued by the API workers, e.g.
+`python -m app.scrape_worker --concurrency 4`. Run as many processes as the
+scraping provider allows, they share the queue, see app.repo.pg.queue.
+"""
+
+import argparse
+import asyncio
+import logging
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core import config
+from app.core.metrics import Counter
+from app.core.resilience import CircuitBreaker, CircuitOpenException
+from app.core.session import async_engine, get_context, get_read_context
+from app.core.tracing import (
+    TRACER,
+    configure_from_settings,
+    instrument_engine,
+    parse_traceparent,
+)
+from app.domain.entities import ScrapeJobEntity
+from app.repo.google.word import GoogleWordRepo
+from app.repo.pg.archive import ScrapeArchivePgRepo
+from app.repo.pg.queue import JOBS_CHANNEL, NotificationListener, ScrapeQueuePgRepo
+from app.repo.pg.word import WordPgRepo
+
+logger = logging.getLogger(__name__)
+
+JOBS = Counter(
+    "scrape_worker_jobs_total",
+    "Scrape jobs handled by the workers: done, not_found or failed.",
+    labelnames=("result",),
+)
+
+
+@dataclass
+class ScrapeWorker:
+    queue: "ScrapeQueuePgRepo"
+    pg_repo: "WordPgRepo"
+    google_repo: "GoogleWordRepo"
+    concurrency: int = 2
+    breaker: Optional["CircuitBreaker"] = None
+    # wakes idle consumers when a job is queued, they poll only without it
+    listener: Optional["NotificationListener"] = None
+    job_timeout: float = 120.0
+    max_attempts: int = 3
+    retention: float = 24 * 3600
+
+    async def run(self) -> None:
+        """Consumes the queue until cancelled."""
+        if self.listener is not None:
+            await self.listener.start()
+        try:
+            await asyncio.gather(
+                *(self._consume() for _ in range(self.concurrency)),
+                self._maintain(),
+            )
+        finally:
+            if self.listener is not None:
+                await self.listener.stop()
+
+    async def run_once(self) -> bool:
+        """Scrapes one job, returns False when the queue is empty."""
+        # leave the jobs to workers whose provider works
+        await self._wait_breaker()
+
+        jobs = await self.queue.dequeue()
+        if not jobs:
+            return False
+
+        job = jobs[0]
+        try:
+            with TRACER.span(
+                "scrape_worker.job",
+                parent=parse_traceparent(job.traceparent),
+                **{
+                    "scrape.job_id": job.job_id,
+                    "scrape.sl": job.sl,
+                    "scrape.tl": job.tl,
+                },
+            ):
+                await self._scrape(job)
+        except (asyncio.CancelledError, CircuitOpenException):
+            await asyncio.shield(self.queue.release(job.job_id))
+            raise
+        except Exception as e:
+            logger.exception("Cannot scrape %r", job.word)
+            JOBS.inc(result="failed")
+            await self.queue.finish(job.job_id, error=str(e) or type(e).__name__)
+        return True
+
+    async def _wait_breaker(self) -> None:
+        while self.breaker is not None:
+            try:
+                self.breaker.check()
+                return
+            except CircuitOpenException as e:
+                await asyncio.sleep(e.retry_after)
+
+    async def _scrape(self, job: ScrapeJobEntity) -> None:
+        async def scrape():
+            return await self.google_repo.get(job.word, job.sl, job.tl)
+
+        if self.breaker is None:
+            word_entity = await scrape()
+        else:
+            # provider returns None when the browser fails
+            word_entity = await self.breaker.run(
+                scrape, is_failure=lambda result: result is None
+            )
+
+        if word_entity is None:
+            JOBS.inc(result="not_found")
+            await self.queue.finish(job.job_id, error="Word not found")
+            return
+
+        await self.pg_repo.save(word_entity)
+        JOBS.inc(result="done")
+        await self.queue.finish(job.job_id)
+
+    async def _consume(self) -> None:
+        while True:
+            subscription = (
+                nullcontext(None)
+                if self.listener is None
+                else self.listener.subscribe("")
+            )
+            # subscribed before the dequeue, a job queued between is not missed
+            with subscription as queued:
+                try:
+                    if await self.run_once():
+                        continue
+                except CircuitOpenException:
+                    # another consumer probes the half-open provider
+                    await asyncio.sleep(1)
+                    continue
+                except Exception:
+                    logger.exception("Cannot take a scrape job")
+
+                if queued is None:
+                    await asyncio.sleep(self.queue.poll_interval)
+                else:
+                    await asyncio.wait({queued}, timeout=self.queue.poll_interval)
+
+    async def _maintain(self) -> None:
+        while True:
+            try:
+                requeued = await self.queue.requeue_stale(
+                    self.job_timeout, self.max_attempts
+                )
+                if requeued:
+                    logger.warning("Requeued %d stale scrape jobs", requeued)
+                await self.queue.purge(self.retention)
+            except Exception:
+                logger.exception("Cannot maintain the scrape queue")
+            await asyncio.sleep(self.job_timeout / 2)
+
+
+async def main(concurrency: int) -> None:
+    configure_from_settings()
+    instrument_engine(async_engine)
+
+    archive = (
+        ScrapeArchivePgRepo(_session_factory=get_context)
+        if config.settings.SCRAPE_ARCHIVE_PAGES
+        else None
+    )
+    worker = ScrapeWorker(
+        queue=ScrapeQueuePgRepo(
+            _session_factory=get_context,
+            poll_interval=config.settings.SCRAPE_WORKER_POLL_SECONDS,
+        ),
+        pg_repo=WordPgRepo(
+            _session_factory=get_context, _read_session_factory=get_read_context
+        ),
+        google_repo=GoogleWordRepo(
+            lean=config.settings.SCRAPE_LEAN_PROFILE,
+            page_load_strategy=config.settings.SCRAPE_PAGE_LOAD_STRATEGY,
+            window_size=config.settings.SCRAPE_WINDOW_SIZE,
+            js_flags=config.settings.SCRAPE_JS_FLAGS,
+            archive=archive,
+        ),
+        concurrency=concurrency,
+        breaker=CircuitBreaker(
+            "scrape",
+            failure_rate=config.settings.SCRAPE_BREAKER_FAILURE_RATE,
+            window=config.settings.SCRAPE_BREAKER_WINDOW,
+            min_calls=config.settings.SCRAPE_BREAKER_MIN_CALLS,
+            open_seconds=config.settings.SCRAPE_BREAKER_OPEN_SECONDS,
+        ),
+        listener=NotificationListener(async_engine, JOBS_CHANNEL),
+        job_timeout=config.settings.SCRAPE_JOB_TIMEOUT_SECONDS,
+        max_attempts=config.settings.SCRAPE_JOB_MAX_ATTEMPTS,
+        retention=config.settings.SCRAPE_JOB_RETENTION_SECONDS,
+    )
+    try:
+        await worker.run()
+    finally:
+        if archive is not None:
+            await archive.join()
+        await asyncio.to_thread(TRACER.flush)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=config.settings.SCRAPE_WORKER_CONCURRENCY,
+        help="scrapes run at once by this process",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.concurrency))
@@ -0,0 +1,167 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+
+from app.api.deps import get_job_repo, get_word_repo
+from app.domain.entities import (
+    DefinitionEntity,
+    JobStatus,
+    ScrapeJobEntity,
+    WordEntity,
+)
+from app.main import sub_app
+from app.repo.job import TranslationJobRepo
+
+
+class MissingWordRepo:
+    scrape_queue = None
+
+    def __init__(self):
+        self.fetched = asyncio.Event()
+        self.fetch_calls = 0
+
+    async def lookup(self, word, sl, tl):
+        return None
+
+    async def fetch(self, word, sl, tl):
+        self.fetch_calls += 1
+        await self.fetched.wait()
+        return WordEntity(
+            word=word,
+            language=sl,
+            definitions=[DefinitionEntity(definition="maison", language=tl)],
+        )
+
+
+@pytest.fixture
+def word_repo():
+    repo = MissingWordRepo()
+    jobs = TranslationJobRepo()
+    sub_app.dependency_overrides[get_word_repo] = lambda: repo
+    sub_app.dependency_overrides[get_job_repo] = lambda: jobs
+    yield repo
+    sub_app.dependency_overrides.clear()
+
+
+async def test_get_word_async_miss(client, word_repo):
+    params = {"sl": "en", "tl": "fr"}
+    headers = {"Prefer": "respond-async"}
+
+    response = await client.get("/api/v1/words/house", params=params, headers=headers)
+    assert response.status_code == HTTPStatus.ACCEPTED
+    job = response.json()
+    assert job["status"] in ("pending", "running")
+    assert response.headers["Location"].endswith(f"/api/v1/jobs/{job['id']}")
+
+    # same translation shares the job
+    response = await client.get("/api/v1/words/house", params=params, headers=headers)
+    assert response.json()["id"] == job["id"]
+
+    word_repo.fetched.set()
+    await asyncio.sleep(0)
+
+    response = await client.get(f"/api/v1/jobs/{job['id']}")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["status"] == "done"
+    assert response.json()["word"]["definitions"] == [{"definition": "maison"}]
+    assert word_repo.fetch_calls == 1
+
+
+class PartlyStoredWordRepo(MissingWordRepo):
+    async def lookup_many(self, word, sl, tls):
+        stored = WordEntity(
+            word=word,
+            language=sl,
+            definitions=[DefinitionEntity(definition="Haus", language="de")],
+        )
+        return {"de": stored} if "de" in tls else {}
+
+
+async def test_get_word_many_async_returns_stored_targets_with_jobs(client):
+    repo, jobs = PartlyStoredWordRepo(), TranslationJobRepo()
+    sub_app.dependency_overrides[get_word_repo] = lambda: repo
+    sub_app.dependency_overrides[get_job_repo] = lambda: jobs
+
+    response = await client.get(
+        "/api/v1/words/house",
+        params={"sl": "en", "tl": "fr,de"},
+        headers={"Prefer": "respond-async"},
+    )
+    sub_app.dependency_overrides.clear()
+    repo.fetched.set()
+
+    assert response.status_code == HTTPStatus.ACCEPTED
+    body = response.json()
+    assert list(body) == ["fr", "de"]
+    assert body["fr"]["id"] == TranslationJobRepo.make_id("house", "en", "fr")
+    assert body["fr"]["status"] in ("pending", "running")
+    assert body["de"]["definitions"] == [{"definition": "Haus"}]
+
+
+async def test_get_job_of_another_worker_is_pending(client, word_repo):
+    job_id = TranslationJobRepo.make_id("house", "en", "fr")
+
+    response = await client.get(f"/api/v1/jobs/{job_id}")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["status"] == "pending"
+    assert word_repo.fetch_calls == 0
+
+
+async def test_get_malformed_job(client, word_repo):
+    response = await client.get("/api/v1/jobs/not-a-job")
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+class FakeScrapeQueue:
+    def __init__(self, job):
+        self.job = job
+
+    async def get_latest(self, word, sl, tl):
+        return self.job
+
+
+@pytest.mark.parametrize(
+    "status, error", [(JobStatus.RUNNING, None), (JobStatus.FAILED, "Timeout")]
+)
+async def test_get_job_of_another_worker_from_the_scrape_queue(
+    client, word_repo, status, error
+):
+    word_repo.scrape_queue = FakeScrapeQueue(
+        ScrapeJobEntity(
+            job_id=1, word="house", sl="en", tl="fr", status=status, error=error
+        )
+    )
+    job_id = TranslationJobRepo.make_id("house", "en", "fr")
+
+    response = await client.get(f"/api/v1/jobs/{job_id}")
+
+    assert response.json()["status"] == status.value
+    assert response.json()["error"] == error
+
+
+class PrimaryPgRepo:
+    async def get(self, word, sl, tl, primary=False):
+        assert primary
+        return WordEntity(
+            word=word,
+            language=sl,
+            definitions=[DefinitionEntity(definition="maison", language=tl)],
+        )
+
+
+async def test_get_job_done_on_another_worker_reads_the_primary(client, word_repo):
+    word_repo.scrape_queue = FakeScrapeQueue(
+        ScrapeJobEntity(
+            job_id=1, word="house", sl="en", tl="fr", status=JobStatus.DONE
+        )
+    )
+    word_repo.pg_repo = PrimaryPgRepo()
+    job_id = TranslationJobRepo.make_id("house", "en", "fr")
+
+    response = await client.get(f"/api/v1/jobs/{job_id}")
+
+    assert response.json()["status"] == "done"
+    assert response.json()["word"]["definitions"] == [{"definition": "maison"}]
@@ -1,12 +1,34 @@
-from fastapi.testclient import TestClient
+import asyncio
+import json
 from unittest.mock import AsyncMock
-from app.main import app
-from app.api.deps import get_word_repo  # Import your FastAPI app and dependency
-from app.api.v1.schemas import WordSchema, DefinitionSchema, SynonymSchema, TranslationSchema, ExampleSchema
-import pytest_asyncio
 
-from fastapi.testclient import TestClient
 import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from selenium.common.exceptions import WebDriverException
+from sqlalchemy import select
+
+from app.api.deps import get_word_repo  # Import your FastAPI app and dependency
+from app.api.v1.schemas import (
+    DefinitionSchema,
+    ExampleSchema,
+    SynonymSchema,
+    TranslationSchema,
+    WordSchema,
+)
+from app.core.resilience import CircuitBreaker
+from app.core.session import get_context
+from app.domain.entities import DefinitionEntity, ExampleEntity, WordEntity
+from app.main import app, sub_app
+from app.models import Translation as TranslationModel
+from app.models import Word as WordModel
+from app.models import WordStat as WordStatModel
+from app.repo.cache import WordCache
+from app.repo.pg.word import WordPgRepo
+from app.repo.stats import WordStats
+from app.repo.suggest import SuggestIndex
+from app.repo.word import PROVIDER_LOOKUPS, WordRepo
+
 
 class MockRepo:
     async def get(self, word_text, sl, tl):
@@ -19,13 +41,14 @@ class MockRepo:
             examples=[ExampleSchema(example="Hello, how are you?")]
         )
 from collections.abc import AsyncGenerator
-from httpx import AsyncClient
-
-import pytest
-import httpx
 from http import HTTPStatus
 from unittest.mock import AsyncMock
 
+import httpx
+import pytest
+from httpx import AsyncClient
+
+
 @pytest.fixture
 async def async_client():
     async with httpx.AsyncClient(app=app, base_url="http://test") as client:
@@ -57,3 +80,367 @@ async def test_get_word_success(client):
 #     assert response.json() == {"detail": "Word not found"}
 
 # Additional async tests can be added similarly
+
+
+async def test_bulk_delete_words(client, session):
+    session.add_all(
+        [
+            WordModel(word="apple", language="en"),
+            WordModel(word="pear", language="en"),
+            WordModel(word="plum", language="en"),
+        ]
+    )
+    await session.commit()
+
+    response = await client.post(
+        "/api/v1/words:bulk-delete", json={"words": ["apple", "pear"], "sl": "en"}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"deleted": 2}
+
+
+async def test_bulk_delete_words_requires_selector(client):
+    response = await client.post("/api/v1/words:bulk-delete", json={"sl": "en"})
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+class FakePgRepo:
+    def __init__(self, stored=None):
+        self.stored = stored
+        self.saved = []
+
+    async def get(self, word, sl, tl):
+        return self.stored
+
+    async def save(self, word):
+        self.saved.append(word)
+
+
+class FakeGoogleRepo:
+    def __init__(self, known=("fr",)):
+        self.known = known
+        self.scraped = []
+
+    async def get(self, word, sl, tl):
+        self.scraped.append(tl)
+        if tl not in self.known:
+            return None
+        return WordEntity(
+            word=word,
+            language=sl,
+            definitions=[DefinitionEntity(definition=f"{word}-{tl}", language=tl)],
+        )
+
+    async def stream(self, word, sl, tl):
+        yield "definitions", [DefinitionEntity(definition="maison", language=tl)]
+        yield "examples", [ExampleEntity(example="Ma maison.", language=tl)]
+
+
+def parse_events(body: str) -> list[tuple[str, object]]:
+    events = []
+    for chunk in body.strip().split("\n\n"):
+        event, data = chunk.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data[6:])))
+    return events
+
+
+async def test_stream_word_miss(client):
+    pg_repo = FakePgRepo()
+    repo = WordRepo(pg_repo=pg_repo, google_repo=FakeGoogleRepo())
+    sub_app.dependency_overrides[get_word_repo] = lambda: repo
+
+    response = await client.get("/api/v1/words/house/stream?sl=en&tl=fr")
+    sub_app.dependency_overrides.clear()
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    assert [event for event, _ in events] == ["definitions", "examples", "entity"]
+    assert events[0][1] == [{"definition": "maison"}]
+    assert events[2][1]["examples"] == [{"example": "Ma maison."}]
+    assert pg_repo.saved[0].definitions[0].definition == "maison"
+
+
+async def test_stream_word_hit(client):
+    stored = WordEntity(
+        word="house",
+        language="en",
+        definitions=[DefinitionEntity(definition="maison", language="fr")],
+    )
+    repo = WordRepo(pg_repo=FakePgRepo(stored), google_repo=FakeGoogleRepo())
+    sub_app.dependency_overrides[get_word_repo] = lambda: repo
+
+    response = await client.get("/api/v1/words/house/stream?sl=en&tl=fr")
+    sub_app.dependency_overrides.clear()
+
+    events = parse_events(response.text)
+    assert [event for event, _ in events] == ["entity"]
+    assert events[0][1]["definitions"] == [{"definition": "maison"}]
+
+
+class BrokenStreamGoogleRepo(FakeGoogleRepo):
+    async def stream(self, word, sl, tl):
+        yield "definitions", [DefinitionEntity(definition="maison", language=tl)]
+        raise WebDriverException("tab crashed")
+
+
+async def test_stream_word_ends_with_error_after_a_failed_scrape(client):
+    pg_repo = FakePgRepo()
+    repo = WordRepo(pg_repo=pg_repo, google_repo=BrokenStreamGoogleRepo())
+    sub_app.dependency_overrides[get_word_repo] = lambda: repo
+
+    response = await client.get("/api/v1/words/house/stream?sl=en&tl=fr")
+    sub_app.dependency_overrides.clear()
+
+    events = parse_events(response.text)
+    assert [event for event, _ in events] == ["definitions", "error"]
+    assert events[1][1] == {"detail": "Scraping failed"}
+    assert pg_repo.saved == []
+
+
+async def test_get_word_many_targets(client):
+    google_repo = FakeGoogleRepo(known=("de",))
+    repo = WordRepo(
+        pg_repo=WordPgRepo(_session_factory=get_context),
+        google_repo=google_repo,
+    )
+    await repo.pg_repo.save(
+        WordEntity(
+            word="house",
+            language="en",
+            definitions=[DefinitionEntity(definition="maison", language="fr")],
+        )
+    )
+    sub_app.dependency_overrides[get_word_repo] = lambda: repo
+
+    response = await client.get("/api/v1/words/house?sl=en&tl=fr,de&tl=es&tl=fr")
+    sub_app.dependency_overrides.clear()
+
+    assert response.status_code == HTTPStatus.OK
+    words = response.json()
+    assert list(words) == ["fr", "de"]
+    assert words["fr"]["definitions"] == [{"definition": "maison"}]
+    assert words["de"]["definitions"] == [{"definition": "house-de"}]
+    assert sorted(google_repo.scraped) == ["de", "es"]
+
+
+async def test_reverse_lookup_words(client, session):
+    house = WordModel(word="house", language="en")
+    session.add_all(
+        [
+            house,
+            TranslationModel(translation="maison", language="fr", word=house),
+        ]
+    )
+    await session.commit()
+
+    response = await client.get(
+        "/api/v1/words:reverse",
+        params={"translation": ["Maison", "chien"], "language": "fr"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        "Maison": [{"word": "house", "language": "en", "translation": "maison"}],
+        "chien": [],
+    }
+
+
+async def test_reverse_lookup_graphql(client, session):
+    house = WordModel(word="house", language="en")
+    session.add_all(
+        [
+            house,
+            TranslationModel(translation="maison", language="fr", word=house),
+        ]
+    )
+    await session.commit()
+
+    query = """
+        { reverse(translations: ["mais"], language: "fr", partial: true) {
+            translation words { word language } } }
+    """
+    response = await client.post("/api/v1/graphql", json={"query": query})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["data"]["reverse"] == [
+        {"translation": "mais", "words": [{"word": "house", "language": "en"}]}
+    ]
+
+
+@pytest.mark.parametrize(
+    "arguments, message",
+    [
+        ('translations: ["maison"], first: 101', "first must be between 1 and 100"),
+        (
+            f"translations: {json.dumps(['maison'] * 101)}",
+            "translations accepts at most 100 values",
+        ),
+    ],
+)
+async def test_reverse_lookup_graphql_rejects_unbounded_arguments(
+    client, arguments, message
+):
+    query = f'{{ reverse({arguments}, language: "fr") {{ translation }} }}'
+    response = await client.post("/api/v1/graphql", json={"query": query})
+
+    assert response.json()["data"] is None
+    assert response.json()["errors"][0]["message"] == message
+
+
+@pytest.mark.parametrize("first", [0, 101])
+async def test_search_graphql_rejects_out_of_range_first(client, first):
+    query = (
+        f'{{ search(query: "house", language: "en", first: {first})'
+        " { nextCursor } }"
+    )
+    response = await client.post("/api/v1/graphql", json={"query": query})
+
+    assert response.json()["data"] is None
+    assert response.json()["errors"][0]["message"] == (
+        "first must be between 1 and 100"
+    )
+
+
+async def test_suggest_words(client):
+    repo = WordRepo(
+        pg_repo=WordPgRepo(_session_factory=get_context),
+        google_repo=FakeGoogleRepo(),
+        suggest_index=SuggestIndex(),
+    )
+    await repo.save(
+        WordEntity(
+            word="house",
+            language="en",
+            definitions=[DefinitionEntity(definition="maison", language="fr")],
+        )
+    )
+    await repo.pg_repo.save(WordEntity(word="hotel", language="en"))
+    await repo.rebuild_suggest_index()
+    await repo.save(WordEntity(word="hose", language="en"))
+    sub_app.dependency_overrides[get_word_repo] = lambda: repo
+
+    response = await client.get("/api/v1/words:suggest?prefix=ho&sl=en&limit=2")
+    await repo.delete("house", "en")
+    after_delete = await client.get("/api/v1/words:suggest?prefix=ho&sl=en")
+    sub_app.dependency_overrides.clear()
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == [
+        {"word": "house", "language": "en"},
+        {"word": "hose", "language": "en"},
+    ]
+    assert [w["word"] for w in after_delete.json()] == ["hose", "hotel"]
+
+
+async def test_get_word_fails_fast_when_breaker_is_open(client):
+    google_repo = FakeGoogleRepo(known=())
+    repo = WordRepo(
+        pg_repo=FakePgRepo(),
+        google_repo=google_repo,
+        breaker=CircuitBreaker("test-api", window=2, min_calls=2),
+    )
+    sub_app.dependency_overrides[get_word_repo] = lambda: repo
+
+    responses = [
+        await client.get("/api/v1/words/house?sl=en&tl=fr") for _ in range(3)
+    ]
+    sub_app.dependency_overrides.clear()
+
+    assert [r.status_code for r in responses] == [
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+    ]
+    assert responses[2].headers["Retry-After"] == "30"
+    assert google_repo.scraped == ["fr", "fr"]
+
+
+class SlowPgRepo(FakePgRepo):
+    async def get(self, word, sl, tl):
+        await asyncio.sleep(1)
+
+
+async def test_get_word_deadline_from_header(client):
+    repo = WordRepo(pg_repo=SlowPgRepo(), google_repo=FakeGoogleRepo())
+    sub_app.dependency_overrides[get_word_repo] = lambda: repo
+
+    response = await client.get(
+        "/api/v1/words/house?sl=en&tl=fr", headers={"X-Request-Timeout": "0.05"}
+    )
+    sub_app.dependency_overrides.clear()
+
+    assert response.status_code == HTTPStatus.GATEWAY_TIMEOUT
+
+
+class FakeLocalRepo:
+    async def get(self, word, sl, tl):
+        if word != "dog":
+            return None
+        return WordEntity(
+            word=word,
+            language=sl,
+            definitions=[DefinitionEntity(definition="chien", language=tl)],
+        )
+
+
+async def test_get_word_provider_chain(client):
+    pg_repo = FakePgRepo()
+    google_repo = FakeGoogleRepo(known=("fr",))
+    repo = WordRepo(
+        pg_repo=pg_repo,
+        google_repo=google_repo,
+        local_repo=FakeLocalRepo(),
+        provider_chain={"default": ["local", "scraper"], "en:de": ["scraper"]},
+    )
+    local_hits = PROVIDER_LOOKUPS.value(provider="local", result="hit")
+    sub_app.dependency_overrides[get_word_repo] = lambda: repo
+
+    dog = await client.get("/api/v1/words/dog?sl=en&tl=fr")
+    cat = await client.get("/api/v1/words/cat?sl=en&tl=fr")
+    dog_de = await client.get("/api/v1/words/dog?sl=en&tl=de")
+    sub_app.dependency_overrides.clear()
+
+    assert dog.json()["definitions"] == [{"definition": "chien"}]
+    assert cat.json()["definitions"] == [{"definition": "cat-fr"}]
+    assert dog_de.status_code == HTTPStatus.NOT_FOUND
+    # the local dictionary answered dog, en:fr went to the scraper for cat only
+    assert google_repo.scraped == ["fr", "de"]
+    assert [w.word for w in pg_repo.saved] == ["dog", "cat"]
+    assert PROVIDER_LOOKUPS.value(provider="local", result="hit") == local_hits + 1
+
+
+async def test_get_word_counts_hits_and_warms_cache(client, session):
+    repo = WordRepo(
+        pg_repo=WordPgRepo(_session_factory=get_context),
+        google_repo=FakeGoogleRepo(known=()),
+        cache=WordCache(),
+        stats=WordStats(),
+    )
+    await repo.save(
+        WordEntity(
+            word="house",
+            language="en",
+            definitions=[DefinitionEntity(definition="maison", language="fr")],
+        )
+    )
+    sub_app.dependency_overrides[get_word_repo] = lambda: repo
+
+    responses = [
+        await client.get("/api/v1/words/House?sl=en&tl=fr") for _ in range(3)
+    ]
+    sub_app.dependency_overrides.clear()
+
+    assert [r.status_code for r in responses] == [HTTPStatus.OK] * 3
+    await repo.flush_stats()
+    stat = (await session.execute(select(WordStatModel))).scalar_one()
+    assert (stat.tl, stat.hits) == ("fr", 3)
+
+    # a fresh worker starts with the popular entries cached
+    fresh = WordRepo(
+        pg_repo=repo.pg_repo, google_repo=FakeGoogleRepo(), cache=WordCache()
+    )
+    assert await fresh.warm_cache(top_n=10) == 1
+    assert fresh.cache.get("house", "en", "fr").definitions[0].definition == "maison"
@@ -0,0 +1,102 @@
+"""
+DOM extraction cost of GoogleWordRepo on recorded pages.
+
+Record pages once (needs network), then benchmark offline:
+
+    python -m app.tests.benchmarks.extraction --pages pages --record house:en:fr
+    python -m app.tests.benchmarks.extraction --pages pages
+
+Every recorded page is opened from disk in headless Chrome and extracted
+`--repeat` times with a WebElement read per element (find_elements and .text,
+as it was done at first) and with the staged script executions
+`GoogleWordRepo.stream` uses, the primary translation being available after
+the first one.
+"""
+
+import argparse
+import pathlib
+import statistics
+import time
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+from app.repo.google.word import EXTRACT_STAGES, GoogleWordRepo
+
+
+def extract_per_element(driver: "webdriver.Chrome", repo: GoogleWordRepo) -> int:
+    """Returns the number of WebDriver round trips made."""
+    round_trips = 0
+    for class_name in (
+        repo.translation_class,
+        repo.translation_class,
+        repo.synonym_class,
+        repo.example_class,
+    ):
+        elements = driver.find_elements(By.CLASS_NAME, class_name)
+        round_trips += 1
+        for element in elements:
+            # .text is read twice by the filter in _clean
+            element.text and element.text
+            round_trips += 2
+    return round_trips
+
+
+def record(driver: "webdriver.Chrome", repo: GoogleWordRepo, pages, spec: str):
+    word, sl, tl = spec.split(":")
+    driver.get(repo._get_link(word, sl, tl))
+    time.sleep(repo.sleep)
+    path = pages / f"{sl}-{tl}-{word}.html"
+    path.write_text(driver.page_source)
+    print(f"Recorded {path}")
+
+
+def benchmark(driver: "webdriver.Chrome", repo: GoogleWordRepo, page, repeat: int):
+    driver.get(page.resolve().as_uri())
+
+    per_element, primary, staged = [], [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        round_trips = extract_per_element(driver, repo)
+        per_element.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for stage in EXTRACT_STAGES:
+            repo._extract_stage(driver, stage, "xx")
+            if stage == EXTRACT_STAGES[0]:
+                primary.append(time.perf_counter() - started)
+        staged.append(time.perf_counter() - started)
+
+    print(
+        f"{page.name}: per element {statistics.median(per_element) * 1000:.1f}ms"
+        f" ({round_trips} round trips), staged"
+        f" {statistics.median(staged) * 1000:.1f}ms with the primary translation"
+        f" after {statistics.median(primary) * 1000:.1f}ms"
+        f" ({len(EXTRACT_STAGES)} round trips)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=pathlib.Path, required=True)
+    parser.add_argument("--record", action="append", metavar="WORD:SL:TL")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    repo = GoogleWordRepo()
+    driver = webdriver.Chrome(options=repo._get_options())
+    try:
+        if args.record:
+            args.pages.mkdir(parents=True, exist_ok=True)
+            for spec in args.record:
+                record(driver, repo, args.pages, spec)
+            return
+
+        for page in sorted(args.pages.glob("*.html")):
+            benchmark(driver, repo, page, args.repeat)
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Word lookup latency during a concurrent login storm.
+
+Run against a started service with an existing user and a word already stored in
+the database, e.g.:
+
+    python -m app.tests.benchmarks.login_storm --email a@b.c --password secret
+
+The script samples `GET /api/v1/words/{word}` latency twice: on an idle service
+and while `--logins` concurrent clients hammer `/auth/access-token`. With password
+hashing off the event loop both p99 values should stay close to each other.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(samples: list[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+async def sample_lookups(
+    client: httpx.AsyncClient, args: argparse.Namespace
+) -> list[float]:
+    latencies = []
+    for _ in range(args.lookups):
+        started = time.perf_counter()
+        await client.get(
+            f"/api/v1/words/{args.word}", params={"sl": args.sl, "tl": args.tl}
+        )
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def login_forever(client: httpx.AsyncClient, args: argparse.Namespace):
+    while True:
+        await client.post(
+            "/auth/access-token",
+            data={"username": args.email, "password": args.password},
+        )
+
+
+def report(name: str, latencies: list[float]):
+    print(
+        f"{name:>12}: p50={statistics.median(latencies) * 1000:.1f}ms "
+        f"p99={percentile(latencies, 0.99) * 1000:.1f}ms"
+    )
+
+
+async def main(args: argparse.Namespace):
+    async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+        report("idle", await sample_lookups(client, args))
+
+        storm = [
+            asyncio.create_task(login_forever(client, args))
+            for _ in range(args.logins)
+        ]
+        try:
+            report("login storm", await sample_lookups(client, args))
+        finally:
+            for task in storm:
+                task.cancel()
+            await asyncio.gather(*storm, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--word", default="house")
+    parser.add_argument("--sl", default="en")
+    parser.add_argument("--tl", default="fr")
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--logins", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+"""
+Bytes downloaded and time-to-extract of the lean page-load profile against
+the plain headless browser.
+
+Needs Chrome and network access:
+
+    python -m app.tests.benchmarks.page_load --word house --sl en --tl fr
+
+For every profile a fresh browser loads the word page `--repeat` times. Time is
+measured from navigation start until the translation element is rendered and
+extracted, bytes are the encoded sizes reported by the network log.
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+
+from app.repo.google.word import EXTRACT_STAGES, GoogleWordRepo
+
+
+def downloaded_bytes(driver) -> int:
+    total = 0
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        if message["method"] == "Network.loadingFinished":
+            total += message["params"]["encodedDataLength"]
+    return total
+
+
+def measure(repo: GoogleWordRepo, link: str) -> tuple[float, int]:
+    options = repo._get_options()
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    driver = repo._start_driver(options)
+
+    try:
+        started = time.perf_counter()
+        driver.get(link)
+        WebDriverWait(driver, 30).until(
+            expected_conditions.presence_of_element_located(
+                (By.CLASS_NAME, repo.translation_class)
+            )
+        )
+        for stage in EXTRACT_STAGES:
+            repo._extract_stage(driver, stage, "xx")
+        elapsed = time.perf_counter() - started
+        # let late requests finish to count them
+        time.sleep(2)
+        return elapsed, downloaded_bytes(driver)
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--word", default="house")
+    parser.add_argument("--sl", default="en")
+    parser.add_argument("--tl", default="fr")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, repo in (
+        ("plain", GoogleWordRepo()),
+        ("lean", GoogleWordRepo(lean=True, page_load_strategy="eager")),
+    ):
+        link = repo._get_link(args.word, args.sl, args.tl)
+        samples = [measure(repo, link) for _ in range(args.repeat)]
+        seconds = statistics.median(elapsed for elapsed, _ in samples)
+        size = statistics.median(size for _, size in samples)
+        print(f"{name}: time-to-extract {seconds * 1000:.0f}ms, {size / 1024:.0f}KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+CPU time and allocations of mapping word rows to entities.
+
+Run against a database with the schema created, e.g. the docker compose one:
+
+    python -m app.tests.benchmarks.row_mapping --items 10 --repeat 200
+
+A word with `--items` rows in every section is stored without its
+`word_entries` row, then read `--repeat` times by the normalized lookup and
+by a page of `get_pages` with all the sections, once through ORM objects
+(joined eager loads and `from_attributes` validation, as it was done before)
+and once through plain rows validated once into entities (used now). The word
+is deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import select
+from sqlalchemy.orm import contains_eager, joinedload
+
+from app.core.session import get_context
+from app.domain.entities import (
+    DefinitionEntity,
+    ExampleEntity,
+    SynonymEntity,
+    TranslationEntity,
+    WordEntity,
+)
+from app.domain.normalization import normalize_word
+from app.models import Definition as DefinitionModel
+from app.models import Example as ExampleModel
+from app.models import Synonym as SynonymModel
+from app.models import Translation as TranslationModel
+from app.models import Word as WordModel
+from app.models import WordEntry as WordEntryModel
+from app.repo.pg.word import WordPgRepo
+
+WORD, SL, TL = "benchmark", "en", "fr"
+
+
+async def orm_lookup(repo: WordPgRepo) -> WordEntity:
+    query = (
+        select(WordModel)
+        .join(
+            DefinitionModel,
+            (WordModel.word_id == DefinitionModel.word_id)
+            & (DefinitionModel.language == TL),
+        )
+        .options(contains_eager(WordModel.definitions))
+        .where(WordModel.normalized == normalize_word(WORD, SL))
+    )
+    for relationship, model in (
+        (WordModel.synonyms, SynonymModel),
+        (WordModel.translations, TranslationModel),
+        (WordModel.examples, ExampleModel),
+    ):
+        query = query.join(
+            model,
+            (WordModel.word_id == model.word_id) & (model.language == TL),
+            isouter=True,
+        ).options(contains_eager(relationship))
+
+    async with get_context() as session:
+        result = await session.execute(query)
+        return WordEntity.model_validate(result.unique().scalars().first())
+
+
+async def row_lookup(repo: WordPgRepo) -> WordEntity:
+    async with get_context() as session:
+        return await repo._get_normalized(session, WORD, SL, TL)
+
+
+async def orm_pages(repo: WordPgRepo) -> list[WordEntity]:
+    async with get_context() as session:
+        result = await session.execute(
+            select(WordModel)
+            .where(WordModel.word == WORD)
+            .options(
+                joinedload(WordModel.definitions),
+                joinedload(WordModel.synonyms),
+                joinedload(WordModel.translations),
+                joinedload(WordModel.examples),
+            )
+            .limit(10)
+        )
+        return [
+            WordEntity.model_validate(word) for word in result.unique().scalars()
+        ]
+
+
+async def row_pages(repo: WordPgRepo) -> list[WordEntity]:
+    return await repo.get_pages(1, 10, WORD, True, True, True, True)
+
+
+async def measure(name: str, read, repo: WordPgRepo, repeat: int):
+    expected = await read(repo)
+
+    started = time.process_time()
+    for _ in range(repeat):
+        await read(repo)
+    cpu = (time.process_time() - started) / repeat
+
+    tracemalloc.start()
+    await read(repo)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:>12}: {cpu * 1000:.2f}ms CPU per call,"
+        f" {peak / 1024:.0f}KiB allocated at peak"
+    )
+    return expected
+
+
+async def main(args: argparse.Namespace):
+    repo = WordPgRepo(_session_factory=get_context)
+    items = range(args.items)
+    await repo.save(
+        WordEntity(
+            word=WORD,
+            language=SL,
+            definitions=[
+                DefinitionEntity(definition=f"d{i}", language=TL) for i in items
+            ],
+            synonyms=[SynonymEntity(synonym=f"s{i}", language=TL) for i in items],
+            translations=[
+                TranslationEntity(translation=f"t{i}", language=TL) for i in items
+            ],
+            examples=[ExampleEntity(example=f"e{i}", language=TL) for i in items],
+        )
+    )
+    word_id = await repo.get_id(WORD, SL)
+    async with get_context() as session:
+        # read from the normalized tables
+        await session.execute(
+            WordEntryModel.__table__.delete().where(WordEntryModel.word_id == word_id)
+        )
+        await session.commit()
+
+    try:
+        orm = await measure("orm lookup", orm_lookup, repo, args.repeat)
+        rows = await measure("row lookup", row_lookup, repo, args.repeat)
+        assert {s.synonym for s in orm.synonyms} == {s.synonym for s in rows.synonyms}
+
+        await measure("orm pages", orm_pages, repo, args.repeat)
+        await measure("row pages", row_pages, repo, args.repeat)
+    finally:
+        await repo.delete(word_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -46,7 +46,7 @@ async def session(test_db_setup_sessionmaker) -> AsyncGenerator[AsyncSession, No
         yield session
 
         # delete all data from all tables after test
-        for name, table in Base.metadata.tables.items():
+        for table in reversed(Base.metadata.sorted_tables):
             await session.execute(delete(table))
         await session.commit()
 
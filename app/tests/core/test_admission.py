@@ -0,0 +1,81 @@
+import asyncio
+from contextlib import AsyncExitStack
+from http import HTTPStatus
+
+import pytest
+
+from app.api.deps import graphql_limiter
+from app.core.admission import SHED, AdmissionLimiter, AdmissionRejectedException
+from app.domain.entities import WordEntity
+from app.repo.cache import WordCache
+from app.repo.word import WordRepo
+
+
+async def test_rejects_after_max_wait():
+    limiter = AdmissionLimiter("test-wait", limit=1, max_wait=0.05, retry_after=3)
+    shed = SHED.value(name="test-wait", reason="timeout")
+
+    async with limiter.slot():
+        with pytest.raises(AdmissionRejectedException) as e:
+            async with limiter.slot():
+                pass
+
+    assert e.value.retry_after == 3
+    assert SHED.value(name="test-wait", reason="timeout") == shed + 1
+    # freed slot admits right away
+    async with limiter.slot():
+        pass
+
+
+async def test_rejects_right_away_when_queue_is_full():
+    limiter = AdmissionLimiter("test-queue", limit=1, max_wait=5, max_queue=1)
+    release = asyncio.Event()
+
+    async def hold():
+        async with limiter.slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    waiter = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    assert limiter.waiting == 1
+
+    with pytest.raises(AdmissionRejectedException):
+        await asyncio.wait_for(limiter.slot().__aenter__(), 0.01)
+    assert SHED.value(name="test-queue", reason="queue_full") == 1
+
+    release.set()
+    await asyncio.gather(holder, waiter)
+    assert limiter.waiting == 0
+
+
+class BlockedPgRepo:
+    async def get(self, word, sl, tl):
+        raise AssertionError("database is not asked on a cache hit")
+
+
+async def test_cache_hits_flow_while_database_lookups_are_shed():
+    db_limiter = AdmissionLimiter("test-db", limit=1, max_wait=0, max_queue=0)
+    cache = WordCache()
+    cache.put(WordEntity(word="apple", language="en"), "fr")
+    repo = WordRepo(
+        pg_repo=BlockedPgRepo(), google_repo=None, cache=cache, db_limiter=db_limiter
+    )
+
+    async with db_limiter.slot():
+        assert (await repo.lookup("apple", "en", "fr")).word == "apple"
+        with pytest.raises(AdmissionRejectedException):
+            await repo.lookup("pear", "en", "fr")
+
+
+async def test_graphql_is_shed_with_retry_after(client, monkeypatch):
+    monkeypatch.setattr(graphql_limiter, "max_wait", 0)
+    query = "{ words { word } }"
+
+    async with AsyncExitStack() as stack:
+        for _ in range(graphql_limiter.limit):
+            await stack.enter_async_context(graphql_limiter.slot())
+        response = await client.post("/api/v1/graphql", json={"query": query})
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from app.core import resilience
+from app.core.resilience import (
+    BreakerState,
+    CircuitBreaker,
+    CircuitOpenException,
+    DeadlineExceededException,
+    deadline_scope,
+    remaining,
+    with_deadline,
+)
+
+
+async def succeed():
+    return "ok"
+
+
+async def fail():
+    raise RuntimeError("provider is down")
+
+
+async def test_breaker_opens_on_failure_rate():
+    breaker = CircuitBreaker("test-open", failure_rate=0.5, window=4, min_calls=4)
+
+    for factory in (succeed, fail, succeed):
+        try:
+            await breaker.run(factory)
+        except RuntimeError:
+            pass
+    assert breaker.state == BreakerState.CLOSED
+
+    # results matching is_failure count as failures too
+    await breaker.run(succeed, is_failure=lambda result: result == "ok")
+    assert breaker.state == BreakerState.OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenException) as exc_info:
+        await breaker.run(lambda: calls.append(1))
+    assert calls == []
+    assert exc_info.value.retry_after == 30
+
+
+async def test_breaker_half_open_probe(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now)
+    breaker = CircuitBreaker("test-probe", min_calls=1, open_seconds=10)
+
+    with pytest.raises(RuntimeError):
+        await breaker.run(fail)
+    assert breaker.state == BreakerState.OPEN
+
+    now += 10
+    breaker.allow()
+    assert breaker.state == BreakerState.HALF_OPEN
+    # one probe at a time
+    with pytest.raises(CircuitOpenException):
+        breaker.allow()
+    breaker.record(success=False)
+    assert breaker.state == BreakerState.OPEN
+
+    now += 10
+    assert await breaker.run(succeed) == "ok"
+    assert breaker.state == BreakerState.CLOSED
+
+
+async def test_deadline():
+    assert remaining() is None
+
+    with deadline_scope(10):
+        with deadline_scope(60):
+            assert remaining() <= 10
+        with deadline_scope(None):
+            assert remaining() is None
+
+        with deadline_scope(0.01):
+            with pytest.raises(DeadlineExceededException):
+                await with_deadline(asyncio.sleep(1))
+
+        assert await with_deadline(succeed()) == "ok"
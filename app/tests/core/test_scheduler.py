@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from app.core.metrics import REGISTRY
+from app.core.scheduler import Priority, ScrapeQueueTimeoutException, ScrapeScheduler
+
+
+def make_scheduler(**kwargs) -> ScrapeScheduler:
+    params = dict(
+        max_concurrency=1,
+        max_concurrency_per_pair=1,
+        rate=1000,
+        burst=1000,
+        queue_timeout=1,
+    )
+    params.update(kwargs)
+    return ScrapeScheduler(**params)
+
+
+async def test_interactive_before_background():
+    scheduler = make_scheduler()
+    order = []
+    release = asyncio.Event()
+
+    async def job(name: str):
+        order.append(name)
+        await release.wait()
+
+    first = asyncio.create_task(scheduler.run(lambda: job("first"), "en", "fr"))
+    await asyncio.sleep(0)
+    background = asyncio.create_task(
+        scheduler.run(lambda: job("background"), "en", "fr", Priority.BACKGROUND)
+    )
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(
+        scheduler.run(lambda: job("interactive"), "en", "fr")
+    )
+    await asyncio.sleep(0)
+
+    assert scheduler.queue_depth == 2
+    release.set()
+    await asyncio.gather(first, background, interactive)
+
+    assert order == ["first", "interactive", "background"]
+
+
+async def test_per_pair_limit_does_not_block_other_pairs():
+    scheduler = make_scheduler(max_concurrency=2)
+    release = asyncio.Event()
+
+    async with scheduler.slot("en", "fr"):
+        # same pair has to wait, another pair gets the second slot
+        with pytest.raises(ScrapeQueueTimeoutException):
+            await scheduler.run(release.wait, "en", "fr", timeout=0.05)
+
+        async with scheduler.slot("en", "de", timeout=0.05):
+            pass
+
+
+async def test_token_bucket_limits_rate():
+    scheduler = make_scheduler(max_concurrency=10, rate=1, burst=1)
+
+    async with scheduler.slot("en", "fr"):
+        pass
+
+    with pytest.raises(ScrapeQueueTimeoutException):
+        async with scheduler.slot("en", "de", timeout=0.05):
+            pass
+
+    assert scheduler.queue_depth == 0
+    assert 'scrape_queue_timeouts_total{priority="interactive"}' in REGISTRY.render()
@@ -0,0 +1,101 @@
+import os
+from http import HTTPStatus
+
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api import deps
+from app.core import config
+from app.core.session import sqlalchemy_database_uri
+from app.core.slow_queries import SlowQueryLog, normalize_sql, parameter_shape
+
+
+@pytest_asyncio.fixture
+async def engine():
+    # listeners stay on the engine, keep them off the shared one
+    engine = create_async_engine(sqlalchemy_database_uri)
+    yield engine
+    await engine.dispose()
+
+
+def test_normalize_sql():
+    assert normalize_sql(
+        "SELECT words.word_id FROM words\n  WHERE words.normalized = $1::VARCHAR"
+        " AND words.word_id IN ($2::INTEGER, $3::INTEGER, $4::INTEGER)"
+        " AND words.language = 'en' LIMIT 10"
+    ) == (
+        "SELECT words.word_id FROM words WHERE words.normalized = ?"
+        " AND words.word_id IN (?, ...) AND words.language = ? LIMIT ?"
+    )
+
+
+def test_parameter_shape():
+    assert (
+        parameter_shape(("apple", 1, None, [1, 2])) == "(str, int, NoneType, list[2])"
+    )
+    assert parameter_shape([("a", 1), ("b", 2)], executemany=True) == "2 x (str, int)"
+    assert parameter_shape({"word": "apple"}) == "{word: str}"
+
+
+async def test_slow_select_is_explained_with_analyze(engine, tmp_path):
+    log = SlowQueryLog(threshold_ms=0, explain=True, log_path=tmp_path / "slow.log")
+    log.instrument(engine)
+
+    async with engine.connect() as conn:
+        for limit in (1, 2):
+            await conn.execute(
+                text("SELECT word FROM words WHERE word = :word LIMIT :limit"),
+                {"word": "apple", "limit": limit},
+            )
+
+    [entry] = [e for e in log.top() if e.sql.startswith("SELECT word FROM")]
+    assert entry.sql == "SELECT word FROM words WHERE word = ? LIMIT ?"
+    assert entry.count == 2
+    assert entry.parameters == "(str, int)"
+    assert "Execution Time" in entry.plan
+    log_file = tmp_path / f"slow.{os.getpid()}.log"
+    assert log_file.read_text().count(entry.sql) == 2
+
+
+async def test_slow_write_is_explained_without_running_it_again(engine):
+    log = SlowQueryLog(threshold_ms=0, explain=True)
+    log.instrument(engine)
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "INSERT INTO words (word, language, normalized)"
+                " VALUES (:word, 'en', :word)"
+            ),
+            {"word": "lantern"},
+        )
+        # the transaction is still usable
+        rows = await conn.execute(
+            text("SELECT count(*) FROM words WHERE word = 'lantern'")
+        )
+        assert rows.scalar() == 1
+
+    [entry] = [e for e in log.top() if e.sql.startswith("INSERT")]
+    assert "Execution Time" not in entry.plan
+    assert "Insert on words" in entry.plan
+
+
+async def test_slow_queries_endpoint_requires_superuser(
+    client, default_user, default_user_headers, monkeypatch
+):
+    monkeypatch.setattr(deps, "slow_query_log", SlowQueryLog(threshold_ms=0))
+    deps.slow_query_log.record("SELECT * FROM users LIMIT 1", 5, "()")
+    deps.slow_query_log.record("SELECT * FROM words LIMIT 2", 12, "()")
+
+    response = await client.get("/admin/slow-queries", headers=default_user_headers)
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+    monkeypatch.setattr(config.settings, "FIRST_SUPERUSER_EMAIL", default_user.email)
+    response = await client.get("/admin/slow-queries", headers=default_user_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert [(q["sql"], q["total_ms"]) for q in response.json()] == [
+        ("SELECT * FROM words LIMIT ?", 12),
+        ("SELECT * FROM users LIMIT ?", 5),
+    ]
@@ -0,0 +1,147 @@
+import pytest
+
+from app.core import tracing
+from app.core.session import get_context
+from app.core.tracing import (
+    TRACER,
+    InMemoryExporter,
+    OTLPExporter,
+    Span,
+    parse_traceparent,
+)
+from app.domain.entities import DefinitionEntity, WordEntity
+from app.repo.pg.queue import ScrapeQueuePgRepo
+from app.repo.pg.word import WordPgRepo
+from app.scrape_worker import ScrapeWorker
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemoryExporter()
+    tracing.configure(exporter)
+    yield exporter
+    tracing.configure(None)
+
+
+def finished(exporter: InMemoryExporter) -> dict[str, Span]:
+    TRACER.flush()
+    return {span.name: span for span in exporter.spans}
+
+
+def test_parse_traceparent():
+    parent = parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01")
+    assert (parent.trace_id, parent.span_id, parent.sampled) == (
+        TRACE_ID,
+        PARENT_ID,
+        True,
+    )
+    assert not parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00").sampled
+    assert parse_traceparent(f"00-{'0' * 32}-{PARENT_ID}-01") is None
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent(None) is None
+
+
+async def test_request_continues_incoming_trace(client, exporter):
+    await WordPgRepo(_session_factory=get_context).save(
+        WordEntity(
+            word="lantern",
+            language="en",
+            definitions=[DefinitionEntity(definition="lanterne", language="fr")],
+        )
+    )
+    TRACER.flush()
+    exporter.clear()
+
+    response = await client.get(
+        "/api/v1/words/lantern?sl=en&tl=fr",
+        headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+    )
+    assert response.status_code == 200
+
+    spans = finished(exporter)
+    server = spans["GET get_word"]
+    assert server.kind == "server"
+    assert server.parent_id == PARENT_ID
+    assert server.attributes["http.status_code"] == 200
+    assert response.headers["traceparent"] == server.traceparent
+
+    repo, pg = spans["WordRepo.get"], spans["WordPgRepo.get"]
+    assert repo.parent_id == server.span_id
+    assert pg.parent_id == repo.span_id
+    statements = [span for span in exporter.spans if span.kind == "client"]
+    assert statements
+    assert all(span.parent_id == pg.span_id for span in statements)
+    assert {span.trace_id for span in exporter.spans} == {TRACE_ID}
+
+
+async def test_unsampled_trace_is_not_exported(client, exporter):
+    await client.post(
+        "/api/v1/graphql",
+        json={"query": "{ words { word } }"},
+        headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-00"},
+    )
+
+    assert finished(exporter) == {}
+
+
+async def test_graphql_resolvers_are_traced(client, exporter):
+    await client.post("/api/v1/graphql", json={"query": "{ words { word } }"})
+
+    spans = finished(exporter)
+    resolver = spans["graphql.resolve words"]
+    assert resolver.parent_id == spans["graphql.operation"].span_id
+    assert spans["WordPgRepo.get_pages"].parent_id == resolver.span_id
+
+
+class FakeGoogleRepo:
+    async def get(self, word, sl, tl):
+        return None
+
+
+async def test_scrape_worker_continues_trace_of_request(exporter):
+    queue = ScrapeQueuePgRepo(_session_factory=get_context)
+    worker = ScrapeWorker(
+        queue=queue,
+        pg_repo=WordPgRepo(_session_factory=get_context),
+        google_repo=FakeGoogleRepo(),
+    )
+
+    with TRACER.span("request") as request:
+        await queue.enqueue("apple", "en", "fr")
+    assert await worker.run_once()
+
+    job = finished(exporter)["scrape_worker.job"]
+    assert (job.trace_id, job.parent_id) == (request.trace_id, request.span_id)
+
+
+def test_otlp_encoding():
+    span = Span(
+        name="WordRepo.get",
+        trace_id=TRACE_ID,
+        span_id="b7ad6b7169203331",
+        parent_id=PARENT_ID,
+        start_ns=1,
+        end_ns=2,
+        attributes={"rows": 3, "cached": False, "word": "apple"},
+        error="ValueError: boom",
+    )
+
+    encoded = OTLPExporter("http://collector:4318/", "words").encode([span])
+
+    resource = encoded["resourceSpans"][0]
+    assert resource["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "words"}}
+    ]
+    otlp_span = resource["scopeSpans"][0]["spans"][0]
+    assert otlp_span["parentSpanId"] == PARENT_ID
+    assert otlp_span["kind"] == 1
+    assert otlp_span["startTimeUnixNano"] == "1"
+    assert otlp_span["attributes"] == [
+        {"key": "rows", "value": {"intValue": "3"}},
+        {"key": "cached", "value": {"boolValue": False}},
+        {"key": "word", "value": {"stringValue": "apple"}},
+    ]
+    assert otlp_span["status"] == {"code": 2, "message": "ValueError: boom"}
@@ -0,0 +1,46 @@
+import pytest
+
+from app.domain.normalization import clean_word, normalize_keys, normalize_word
+
+
+@pytest.mark.parametrize(
+    "word, expected",
+    [
+        ("  house ", "house"),
+        ("ice\t \ncream", "ice cream"),
+        ("café", "café"),
+    ],
+)
+def test_clean_word(word: str, expected: str):
+    assert clean_word(word) == expected
+
+
+@pytest.mark.parametrize(
+    "word, language, expected",
+    [
+        ("House", "en", "house"),
+        (" HOUSE  ", "auto", "house"),
+        ("Café", "fr", "café"),
+        ("Straße", "auto", "strasse"),
+        ("Straße", "de", "straße"),
+        ("MASSE", "de", "masse"),
+        ("Istanbul", "en", "istanbul"),
+        ("Istanbul", "tr", "ıstanbul"),
+        ("İzmir", "tr", "izmir"),
+        ("İzmir", "az", "izmir"),
+    ],
+)
+def test_normalize_word(word: str, language: str, expected: str):
+    assert normalize_word(word, language) == expected
+
+
+def test_normalize_word_is_idempotent():
+    for word in ("Straße", "Café", "ǰ", "İzmir"):
+        key = normalize_word(word, "tr")
+        assert normalize_word(key, "tr") == key
+
+
+def test_normalize_keys():
+    assert normalize_keys("Straße", "de") == {"straße"}
+    assert normalize_keys("Straße") == {"strasse", "straße"}
+    assert normalize_keys("Istanbul") == {"istanbul", "ıstanbul"}
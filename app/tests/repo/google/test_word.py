@@ -0,0 +1,259 @@
+import asyncio
+
+from selenium.common.exceptions import WebDriverException
+
+from app.core.resilience import deadline_scope, with_deadline
+from app.domain.entities import (
+    DefinitionEntity,
+    ExampleEntity,
+    SynonymEntity,
+    TranslationEntity,
+    WordEntity,
+)
+from app.repo.google import word as google_word
+from app.repo.google.extract import extract_texts
+from app.repo.google.word import EXTRACT_SCRIPT, SNAPSHOT_SCRIPT, GoogleWordRepo
+from app.repo.pg.archive import ScrapeArchivePgRepo
+
+
+class FakeDriver:
+    """Records WebDriver calls, answers the extraction script with page texts."""
+
+    def __init__(self, texts: dict[str, list[str]]):
+        self.texts = texts
+        self.calls = []
+
+    def get(self, link):
+        self.calls.append(("get", link))
+
+    def execute_script(self, script, classes):
+        self.calls.append(("execute_script", classes))
+        assert script == EXTRACT_SCRIPT
+        return {section: self.texts[name] for section, name in classes.items()}
+
+    def execute_cdp_cmd(self, command, params):
+        self.calls.append(("execute_cdp_cmd", command, params))
+
+    def quit(self):
+        self.calls.append(("quit",))
+
+
+PAGE = {
+    "HwtZe": ["maison", "", "domicile", "maison", "foyer"],
+    "FpAlrf": ["logement", "logement", "demeure"],
+    "me82ge": ["Ma maison est grande.", "Une maison de campagne."],
+}
+
+
+async def test_get_extracts_in_two_round_trips(monkeypatch):
+    driver = FakeDriver(PAGE)
+    monkeypatch.setattr(google_word.webdriver, "Chrome", lambda options: driver)
+
+    word = await GoogleWordRepo(sleep=0).get("house", "en", "fr")
+
+    assert word == WordEntity(
+        word="house",
+        language="en",
+        definitions=[DefinitionEntity(definition="maison", language="fr")],
+        translations=[
+            TranslationEntity(translation="domicile", language="fr"),
+            TranslationEntity(translation="foyer", language="fr"),
+        ],
+        synonyms=[
+            SynonymEntity(synonym="logement", language="fr"),
+            SynonymEntity(synonym="demeure", language="fr"),
+        ],
+        examples=[
+            ExampleEntity(example="Ma maison est grande.", language="fr"),
+            ExampleEntity(example="Une maison de campagne.", language="fr"),
+        ],
+    )
+    assert [call[0] for call in driver.calls if call[0] != "execute_cdp_cmd"] == [
+        "get",
+        "execute_script",
+        "execute_script",
+        "quit",
+    ]
+
+
+async def test_stream_yields_primary_translation_before_other_sections(
+    monkeypatch,
+):
+    driver = FakeDriver(PAGE)
+    monkeypatch.setattr(google_word.webdriver, "Chrome", lambda options: driver)
+
+    stream = GoogleWordRepo(sleep=0).stream("house", "en", "fr")
+    section, values = await anext(stream)
+
+    assert (section, values) == (
+        "definitions",
+        [DefinitionEntity(definition="maison", language="fr")],
+    )
+    # synonyms and examples are not extracted yet
+    assert driver.calls[-1] == ("execute_script", {"translations": "HwtZe"})
+    assert [section async for section, _ in stream] == [
+        "translations",
+        "synonyms",
+        "examples",
+    ]
+    assert driver.calls[-2] == (
+        "execute_script",
+        {"synonyms": "FpAlrf", "examples": "me82ge"},
+    )
+
+
+async def test_get_uses_configured_classes(monkeypatch):
+    driver = FakeDriver({"t": [], "s": [], "e": ["Un exemple."]})
+    monkeypatch.setattr(google_word.webdriver, "Chrome", lambda options: driver)
+    repo = GoogleWordRepo(
+        translation_class="t", synonym_class="s", example_class="e", sleep=0
+    )
+
+    word = await repo.get("example", "en", "fr")
+
+    assert word.definitions == []
+    assert word.examples == [ExampleEntity(example="Un exemple.", language="fr")]
+
+
+async def test_lean_profile(monkeypatch):
+    driver = FakeDriver(PAGE)
+    started_with = []
+
+    def chrome(options):
+        started_with.append(options)
+        return driver
+
+    monkeypatch.setattr(google_word.webdriver, "Chrome", chrome)
+
+    await GoogleWordRepo(
+        sleep=0, lean=True, page_load_strategy="eager", js_flags="--max-lazy"
+    ).get("house", "en", "fr")
+    await GoogleWordRepo(sleep=0).get("house", "en", "fr")
+    await GoogleWordRepo(sleep=0, page_load_strategy="eager").get("house", "en", "fr")
+
+    lean, plain, plain_eager = started_with
+    assert lean.page_load_strategy == "eager"
+    assert "--window-size=800,600" in lean.arguments
+    assert "--js-flags=--max-lazy" in lean.arguments
+    assert plain.page_load_strategy == "normal"
+    assert "--window-size=800,600" not in plain.arguments
+    assert plain_eager.page_load_strategy == "eager"
+
+    blocked = [call for call in driver.calls if call[0] == "execute_cdp_cmd"]
+    assert len(blocked) == 2
+    assert "*.woff2" in blocked[1][2]["urls"]
+
+
+HTML = """
+<html><body>
+<script>document.write('<span class="HwtZe">script</span>')</script>
+<div class="HwtZe"> maison </div>
+<div class="HwtZe"></div>
+<div class="row"><span class="HwtZe">domicile</span><span class="HwtZe">maison
+</span></div>
+<ul><li class="FpAlrf extra">logement<li class="FpAlrf">logement<li class="FpAlrf">
+demeure</ul>
+<div class="me82ge">Ma <b>maison</b> est grande.</div>
+<div class="me82ge">Une maison<br>de campagne &amp; <i>foyer</i></div>
+<p><span class="HwtZe">foyer</p>
+</body></html>
+"""
+
+
+def test_extract_texts_as_inner_text():
+    texts = extract_texts(HTML, {"t": "HwtZe", "s": "FpAlrf", "e": "me82ge"})
+
+    assert texts == {
+        "t": ["maison", "", "domicile", "maison", "foyer"],
+        "s": ["logement", "logement", "demeure"],
+        "e": ["Ma maison est grande.", "Une maison\nde campagne & foyer"],
+    }
+
+
+def test_extract_texts_of_nested_matches():
+    texts = extract_texts(
+        '<div class="a">x<div class="a">y</div></div><p class="b">z</p>',
+        {"outer": "a", "other": "b"},
+    )
+
+    assert texts == {"outer": ["x\ny", "y"], "other": ["z"]}
+
+
+async def test_extract_page_gives_the_sections_of_a_live_page(monkeypatch):
+    driver = FakeDriver(PAGE)
+    monkeypatch.setattr(google_word.webdriver, "Chrome", lambda options: driver)
+    repo = GoogleWordRepo(sleep=0)
+    live = await repo.get("house", "en", "fr")
+
+    sections = repo.extract_page(HTML, "fr")
+
+    assert sections["definitions"] == live.definitions
+    assert sections["translations"] == live.translations
+    assert sections["synonyms"] == live.synonyms
+    assert sections["examples"][0] == live.examples[0]
+
+
+class SnapshotDriver(FakeDriver):
+    def __init__(self, texts, fails: bool = False):
+        super().__init__(texts)
+        self.fails = fails
+
+    def execute_script(self, script, *args):
+        if script == SNAPSHOT_SCRIPT:
+            self.calls.append(("snapshot",))
+            if self.fails:
+                raise WebDriverException("page is gone")
+            return HTML
+        return super().execute_script(script, *args)
+
+
+class SlowArchive(ScrapeArchivePgRepo):
+    def __init__(self, fails: bool = False):
+        super().__init__(_session_factory=None)
+        self.pages = []
+        self.fails = fails
+
+    async def save(self, word, sl, tl, page):
+        await asyncio.sleep(0.05)
+        if self.fails:
+            raise ConnectionError("database is gone")
+        self.pages.append((word, sl, tl, page))
+
+
+async def test_get_archives_the_page_in_background(monkeypatch):
+    driver = SnapshotDriver(PAGE)
+    monkeypatch.setattr(google_word.webdriver, "Chrome", lambda options: driver)
+    archive = SlowArchive()
+
+    repo = GoogleWordRepo(sleep=0, archive=archive)
+    # the scrape does not wait for the archiving
+    with deadline_scope(0.03):
+        word = await with_deadline(repo.get("house", "en", "fr"))
+
+    assert word.definitions[0].definition == "maison"
+    assert [call[0] for call in driver.calls][-3:] == [
+        "execute_script",
+        "snapshot",
+        "quit",
+    ]
+    assert archive.pages == []
+    await archive.join()
+    assert archive.pages == [("house", "en", "fr", HTML)]
+
+
+async def test_get_succeeds_without_its_snapshot(monkeypatch):
+    driver = SnapshotDriver(PAGE, fails=True)
+    monkeypatch.setattr(google_word.webdriver, "Chrome", lambda options: driver)
+    archive = SlowArchive()
+
+    word = await GoogleWordRepo(sleep=0, archive=archive).get("house", "en", "fr")
+    await archive.join()
+
+    assert word.definitions[0].definition == "maison"
+    assert archive.pages == []
+
+    driver.fails, archive.fails = False, True
+    word = await GoogleWordRepo(sleep=0, archive=archive).get("house", "en", "fr")
+    await archive.join()
+
+    assert word.definitions[0].definition == "maison"
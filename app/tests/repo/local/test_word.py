@@ -0,0 +1,101 @@
+import gzip
+import json
+import struct
+
+import pytest
+
+from app.domain.entities import (
+    DefinitionEntity,
+    ExampleEntity,
+    SynonymEntity,
+    TranslationEntity,
+)
+from app.repo.local.word import InvalidDictionaryException, LocalDictionaryRepo
+
+
+def write_stardict(directory, articles: dict[str, str], compress=False) -> str:
+    index, data = b"", b""
+    for word in sorted(articles, key=lambda w: w.encode()):
+        article = articles[word].encode()
+        index += word.encode() + b"\0" + struct.pack(">II", len(data), len(article))
+        data += article
+
+    (directory / "dict.ifo").write_text(
+        "StarDict's dict ifo file\nversion=2.4.2\n"
+        f"wordcount={len(articles)}\nidxfilesize={len(index)}\n"
+        "sametypesequence=m\n"
+    )
+    (directory / "dict.idx").write_bytes(index)
+    if compress:
+        (directory / "dict.dict.dz").write_bytes(gzip.compress(data))
+    else:
+        (directory / "dict.dict").write_bytes(data)
+    return str(directory / "dict.ifo")
+
+
+async def test_json_dictionary(tmp_path):
+    path = tmp_path / "en-fr.json"
+    path.write_text(
+        json.dumps(
+            {
+                "House": {
+                    "definitions": ["maison"],
+                    "translations": ["domicile", "maison"],
+                    "synonyms": ["demeure"],
+                    "examples": ["Ma maison."],
+                },
+                "dog": ["chien"],
+            }
+        )
+    )
+    repo = LocalDictionaryRepo([f"en:fr:{path}"])
+    assert repo.load() == 2
+
+    word = await repo.get("house", "en", "fr")
+    assert word.word == "house"
+    assert word.definitions == [DefinitionEntity(definition="maison", language="fr")]
+    assert word.translations == [
+        TranslationEntity(translation="domicile", language="fr")
+    ]
+    assert word.synonyms == [SynonymEntity(synonym="demeure", language="fr")]
+    assert word.examples == [ExampleEntity(example="Ma maison.", language="fr")]
+
+    assert (await repo.get("dog", "en", "fr")).definitions[0].definition == "chien"
+    assert await repo.get("dog", "en", "de") is None
+    assert await repo.get("cat", "en", "fr") is None
+
+
+async def test_tsv_dictionary(tmp_path):
+    path = tmp_path / "en-de.tsv"
+    path.write_text("# comment\nhouse\tHaus; Gebäude\tDas Haus.\ncat\n")
+    repo = LocalDictionaryRepo([f"en:de:{path}"])
+    repo.load()
+
+    word = await repo.get("house", "en", "de")
+    assert word.definitions[0].definition == "Haus"
+    assert [t.translation for t in word.translations] == ["Gebäude"]
+    assert [e.example for e in word.examples] == ["Das Haus."]
+    assert await repo.get("cat", "en", "de") is None
+
+
+@pytest.mark.parametrize("compress", [False, True])
+async def test_stardict_dictionary(tmp_path, compress):
+    path = write_stardict(
+        tmp_path, {"house": "casa\nvivienda", "dog": "perro; can"}, compress
+    )
+    repo = LocalDictionaryRepo([f"en:es:{path}"])
+    assert repo.load() == 2
+
+    word = await repo.get("Dog", "en", "es")
+    assert word.definitions[0].definition == "perro"
+    assert [t.translation for t in word.translations] == ["can"]
+    assert (await repo.get("house", "en", "es")).definitions[0].definition == "casa"
+
+
+def test_invalid_dictionaries(tmp_path):
+    (tmp_path / "words.xml").write_text("<words/>")
+
+    with pytest.raises(InvalidDictionaryException):
+        LocalDictionaryRepo([f"en:fr:{tmp_path / 'words.xml'}"]).load()
+    with pytest.raises(InvalidDictionaryException):
+        LocalDictionaryRepo([str(tmp_path / "words.xml")]).load()
@@ -0,0 +1,153 @@
+import argparse
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import reprocess_pages
+from app.core.session import get_context
+from app.domain.entities import (
+    DefinitionEntity,
+    SynonymEntity,
+    TranslationEntity,
+    WordEntity,
+)
+from app.models import ScrapePage as ScrapePageModel
+from app.repo.pg.archive import ScrapeArchivePgRepo, decompress_page
+from app.repo.pg.word import WordPgRepo
+
+PAGE = """
+<div class="new-translation">maison</div>
+<div class="new-translation">domicile</div>
+<div class="FpAlrf">logement</div>
+"""
+
+
+async def test_save_keeps_the_last_page(session: AsyncSession):
+    archive = ScrapeArchivePgRepo(_session_factory=get_context)
+
+    await archive.save("House ", "en", "fr", "<p>old</p>")
+    await archive.save("house", "en", "fr", "<p>new</p>")
+    scraped_at = await session.scalar(select(ScrapePageModel.scraped_at))
+    # unchanged page is not written again
+    await archive.save("house", "en", "fr", "<p>new</p>")
+
+    assert await archive.get("HOUSE", "en", "fr") == "<p>new</p>"
+    assert await archive.get("house", "en", "de") is None
+    assert await session.scalar(select(ScrapePageModel.scraped_at)) == scraped_at
+
+    [page] = await archive.get_batch()
+    assert (page.word, page.sl, page.tl) == ("house", "en", "fr")
+    assert decompress_page(page.page) == "<p>new</p>"
+    assert await archive.get_batch(after_page_id=page.page_id) == []
+    assert await archive.get_batch(tl="de") == []
+
+
+async def test_replace_drops_sections_missing_from_the_word():
+    repo = WordPgRepo(_session_factory=get_context)
+    await repo.save(
+        WordEntity(
+            word="house",
+            language="en",
+            definitions=[
+                DefinitionEntity(definition="maison", language="fr"),
+                DefinitionEntity(definition="Haus", language="de"),
+            ],
+            translations=[TranslationEntity(translation="wrong", language="fr")],
+        )
+    )
+
+    await repo.replace(
+        WordEntity(
+            word="house",
+            language="en",
+            definitions=[DefinitionEntity(definition="maison", language="fr")],
+            synonyms=[SynonymEntity(synonym="logement", language="fr")],
+        ),
+        "fr",
+    )
+
+    french = await repo.get("house", "en", "fr")
+    assert french.translations == []
+    assert [s.synonym for s in french.synonyms] == ["logement"]
+    assert (await repo.get("house", "en", "de")).definitions[0].definition == "Haus"
+
+
+async def test_reprocess_pages_with_new_classes():
+    archive = ScrapeArchivePgRepo(_session_factory=get_context)
+    repo = WordPgRepo(_session_factory=get_context)
+    await repo.save(
+        WordEntity(
+            word="house",
+            language="en",
+            definitions=[DefinitionEntity(definition="stale", language="fr")],
+        )
+    )
+    await archive.save("house", "en", "fr", PAGE)
+    # nothing matches the translation class, the word is kept
+    await archive.save("tree", "en", "fr", "<div>arbre</div>")
+    await repo.save(
+        WordEntity(
+            word="tree",
+            language="en",
+            definitions=[DefinitionEntity(definition="arbre", language="fr")],
+        )
+    )
+
+    await reprocess_pages.main(
+        argparse.Namespace(
+            processes=2,
+            batch_size=1,
+            sl=None,
+            tl=None,
+            dry_run=False,
+            translation_class="new-translation",
+            example_class="me82ge",
+            synonym_class="FpAlrf",
+        )
+    )
+
+    house = await repo.get("house", "en", "fr")
+    assert [d.definition for d in house.definitions] == ["maison"]
+    assert [t.translation for t in house.translations] == ["domicile"]
+    assert [s.synonym for s in house.synonyms] == ["logement"]
+    tree = await repo.get("tree", "en", "fr")
+    assert [d.definition for d in tree.definitions] == ["arbre"]
+
+
+async def test_reprocess_pages_dry_run_prints_changes(capsys):
+    archive = ScrapeArchivePgRepo(_session_factory=get_context)
+    repo = WordPgRepo(_session_factory=get_context)
+    await repo.save(
+        WordEntity(
+            word="house",
+            language="en",
+            definitions=[
+                DefinitionEntity(definition="maison", language="fr"),
+                DefinitionEntity(definition="stale", language="fr"),
+            ],
+        )
+    )
+    await archive.save("house", "en", "fr", PAGE)
+
+    await reprocess_pages.main(
+        argparse.Namespace(
+            processes=1,
+            batch_size=10,
+            sl=None,
+            tl=None,
+            dry_run=True,
+            translation_class="new-translation",
+            example_class="me82ge",
+            synonym_class="FpAlrf",
+        )
+    )
+
+    out = capsys.readouterr().out
+    assert "house en:fr" in out
+    assert "definitions: +[] -['stale']" in out
+    assert "translations: +['domicile'] -[]" in out
+    assert "synonyms: +['logement'] -[]" in out
+    assert "1 words changed" in out
+    house = await repo.get("house", "en", "fr")
+    assert [d.definition for d in house.definitions] == ["maison", "stale"]
+    assert house.synonyms == []
@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.session import get_context
+from app.domain.entities import DefinitionEntity, TranslationEntity, WordEntity
+from app.repo.pg.partitions import InvalidLanguageException, PartitionPgRepo
+from app.repo.pg.word import WordPgRepo
+
+
+async def explain(session: AsyncSession, query) -> str:
+    sql = query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    plan = await session.execute(text(f"EXPLAIN {sql}"))
+    return "\n".join(plan.scalars())
+
+
+async def test_add_language_moves_rows_online(session: AsyncSession):
+    words = WordPgRepo(_session_factory=get_context)
+    partitions = PartitionPgRepo(_session_factory=get_context)
+    word = WordEntity(
+        word="apple",
+        language="en",
+        definitions=[
+            DefinitionEntity(definition="pomme", language="fr"),
+            DefinitionEntity(definition="Apfel", language="de"),
+        ],
+        translations=[TranslationEntity(translation="pommier", language="fr")],
+    )
+    await words.save(word)
+
+    assert await partitions.add_language("fr", batch_size=1) == 2
+    # already partitioned
+    assert await partitions.add_language("fr") == 0
+
+    bounds = await partitions.get_partitions()
+    assert bounds["definitions"] == {
+        "definitions_default": "DEFAULT",
+        "definitions_fr": "FOR VALUES IN ('fr')",
+    }
+    assert bounds["synonyms"]["synonyms_fr"] == "FOR VALUES IN ('fr')"
+
+    rows = await session.execute(
+        text("SELECT language, count(*) FROM definitions_default GROUP BY language")
+    )
+    assert rows.all() == [("de", 1)]
+
+    french = await words.get("apple", "en", "fr")
+    assert [d.definition for d in french.definitions] == ["pomme"]
+    assert [t.translation for t in french.translations] == ["pommier"]
+    assert (await words.get("apple", "en", "de")).definitions[0].definition == "Apfel"
+
+    # cascades reach the new partitions
+    await words.delete_words(["apple"], "en")
+    rows = await session.execute(text("SELECT count(*) FROM definitions_fr"))
+    assert rows.scalar() == 0
+
+
+async def test_lookup_prunes_partitions(session: AsyncSession):
+    await PartitionPgRepo(_session_factory=get_context).add_language("fr")
+
+    plan = await explain(session, WordPgRepo._normalized_query("apple", "en", "fr"))
+    for table in ("definitions", "synonyms", "translations", "examples"):
+        assert f"{table}_fr" in plan
+        assert f"{table}_default" not in plan
+
+    plan = await explain(session, WordPgRepo._normalized_query("apple", "en", "de"))
+    assert "definitions_default" in plan
+    assert "definitions_fr" not in plan
+
+
+@pytest.mark.parametrize("language", ["", "fr; DROP TABLE words", "f'r"])
+def test_partition_name_rejects_malformed_language(language: str):
+    with pytest.raises(InvalidLanguageException):
+        PartitionPgRepo.partition_name("definitions", language)
+
+
+def test_partition_name():
+    assert PartitionPgRepo.partition_name("examples", "zh-CN") == "examples_zh_cn"
@@ -0,0 +1,189 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.scheduler import Priority, ScrapeQueueTimeoutException
+from app.core.session import async_engine, get_context
+from app.domain.entities import DefinitionEntity, JobStatus, WordEntity
+from app.repo.pg.queue import DONE_CHANNEL, NotificationListener, ScrapeQueuePgRepo
+from app.repo.pg.word import WordPgRepo
+from app.repo.word import WordRepo
+from app.scrape_worker import ScrapeWorker
+
+
+class FakeGoogleRepo:
+    def __init__(self, known=("fr",)):
+        self.known = known
+        self.scraped = []
+
+    async def get(self, word, sl, tl):
+        self.scraped.append((word, tl))
+        if tl not in self.known:
+            return None
+        return WordEntity(
+            word=word,
+            language=sl,
+            definitions=[DefinitionEntity(definition=f"{word}-{tl}", language=tl)],
+        )
+
+
+async def test_enqueue_shares_active_job():
+    queue = ScrapeQueuePgRepo(_session_factory=get_context)
+
+    job_id = await queue.enqueue("House", "en", "fr", priority=1)
+    assert await queue.enqueue(" house ", "en", "fr") == job_id
+    assert await queue.enqueue("house", "en", "de") != job_id
+
+    # moved up by the interactive request
+    assert (await queue.get(job_id)).priority == 0
+
+    await queue.dequeue(limit=2)
+    await queue.finish(job_id)
+    # finished jobs are not shared
+    assert await queue.enqueue("house", "en", "fr") != job_id
+
+
+async def test_dequeue_by_priority_skips_locked():
+    queue = ScrapeQueuePgRepo(_session_factory=get_context)
+    background = await queue.enqueue("apple", "en", "fr", priority=1)
+    first = await queue.enqueue("pear", "en", "fr")
+    second = await queue.enqueue("plum", "en", "fr")
+
+    async with get_context() as session:
+        # another worker holds the first job
+        await session.execute(
+            text("SELECT 1 FROM scrape_jobs WHERE job_id = :id FOR UPDATE"),
+            {"id": first},
+        )
+        jobs = await queue.dequeue(limit=1)
+        assert [job.job_id for job in jobs] == [second]
+
+    jobs = await queue.dequeue(limit=5)
+    assert [job.job_id for job in jobs] == [first, background]
+    assert all(job.status == JobStatus.RUNNING for job in jobs)
+    assert jobs[0].attempts == 1
+    assert await queue.dequeue() == []
+
+
+async def test_wait_is_notified_on_finish():
+    listener = NotificationListener(async_engine, DONE_CHANNEL)
+    # polls too slowly to finish the test without the notification
+    queue = ScrapeQueuePgRepo(
+        _session_factory=get_context, listener=listener, poll_interval=60
+    )
+    job_id = await queue.enqueue("apple", "en", "fr")
+    await queue.dequeue()
+
+    try:
+        waiting = asyncio.create_task(queue.wait(job_id, timeout=10))
+        await asyncio.sleep(0.1)
+        await queue.finish(job_id, error="Word not found")
+        job = await asyncio.wait_for(waiting, 5)
+    finally:
+        await listener.stop()
+
+    assert job.status == JobStatus.FAILED
+    assert job.error == "Word not found"
+    assert await queue.wait(await queue.enqueue("pear", "en", "fr"), 0.1) is None
+
+
+async def test_requeue_stale(session: AsyncSession):
+    queue = ScrapeQueuePgRepo(_session_factory=get_context)
+    retried = await queue.enqueue("apple", "en", "fr")
+    exhausted = await queue.enqueue("pear", "en", "fr")
+    await queue.dequeue(limit=2)
+    await session.execute(
+        text(
+            "UPDATE scrape_jobs SET updated_at = now() - interval '1 hour',"
+            " attempts = CASE WHEN job_id = :id THEN 3 ELSE attempts END"
+        ),
+        {"id": exhausted},
+    )
+    await session.commit()
+
+    assert await queue.requeue_stale(timeout=60, max_attempts=3) == 1
+    assert (await queue.get(retried)).status == JobStatus.PENDING
+    assert (await queue.get(exhausted)).status == JobStatus.FAILED
+
+    await queue.purge(older_than=0)
+    assert await queue.get(exhausted) is None
+    assert await queue.get(retried) is not None
+
+
+async def test_word_repo_waits_for_scrape_worker():
+    queue = ScrapeQueuePgRepo(_session_factory=get_context, poll_interval=0.05)
+    pg_repo = WordPgRepo(_session_factory=get_context)
+    google_repo = FakeGoogleRepo()
+    worker = ScrapeWorker(queue=queue, pg_repo=pg_repo, google_repo=google_repo)
+    repo = WordRepo(
+        pg_repo=pg_repo,
+        google_repo=None,
+        scrape_queue=queue,
+        scrape_wait=5,
+        provider_chain={"default": ["scraper"]},
+    )
+
+    async def work(jobs: int):
+        while jobs:
+            jobs -= await worker.run_once()
+            await asyncio.sleep(0.01)
+
+    working = asyncio.create_task(work(2))
+    word, missing = await asyncio.gather(
+        repo.get("apple", "en", "fr"), repo.get("apple", "en", "de")
+    )
+    await working
+
+    assert word.definitions[0].definition == "apple-fr"
+    assert missing is None
+    assert sorted(google_repo.scraped) == [("apple", "de"), ("apple", "fr")]
+
+    # nobody consumes the queue
+    repo.scrape_wait = 0.1
+    with pytest.raises(ScrapeQueueTimeoutException):
+        await repo.get("pear", "en", "fr", Priority.BACKGROUND)
+
+
+class LaggingReplicaPgRepo(WordPgRepo):
+    """Its replica never sees the words saved by the scrape workers."""
+
+    async def get(self, word, sl, tl, primary=False):
+        if not primary:
+            return None
+        return await super().get(word, sl, tl, primary=True)
+
+
+async def test_word_repo_reads_the_scraped_word_from_the_primary():
+    queue = ScrapeQueuePgRepo(_session_factory=get_context, poll_interval=0.05)
+    worker = ScrapeWorker(
+        queue=queue,
+        pg_repo=WordPgRepo(_session_factory=get_context),
+        google_repo=FakeGoogleRepo(),
+    )
+    repo = WordRepo(
+        pg_repo=LaggingReplicaPgRepo(_session_factory=get_context),
+        google_repo=None,
+        scrape_queue=queue,
+        scrape_wait=5,
+        provider_chain={"default": ["scraper"]},
+    )
+
+    async def work():
+        while not await worker.run_once():
+            await asyncio.sleep(0.01)
+
+    word, _ = await asyncio.gather(repo.get("apple", "en", "fr"), work())
+
+    assert word.definitions[0].definition == "apple-fr"
+
+
+async def test_get_latest_job_of_the_word():
+    queue = ScrapeQueuePgRepo(_session_factory=get_context)
+    first = await queue.enqueue("apple", "en", "fr")
+    await queue.finish(first, error="Word not found")
+    second = await queue.enqueue("Apple ", "en", "fr")
+
+    assert (await queue.get_latest("apple", "en", "fr")).job_id == second
+    assert await queue.get_latest("apple", "en", "de") is None
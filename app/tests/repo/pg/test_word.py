@@ -1,11 +1,24 @@
+from datetime import timedelta
+
 import pytest
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.session import get_context, get_read_context
+from app.domain.entities import (
+    DefinitionEntity,
+    ExampleEntity,
+    ReverseTranslationEntity,
+    TranslationEntity,
+    WordEntity,
+)
 from app.models import Definition as DefinitionModel
 from app.models import Example as ExampleModel
 from app.models import Synonym as SynonymModel
 from app.models import Translation as TranslationModel
 from app.models import Word as WordModel
+from app.models import WordEntry as WordEntryModel
+from app.models import WordStat as WordStatModel
 from app.repo.pg.word import UndefinedWordException, WordPgRepo
 
 
@@ -18,7 +31,7 @@ async def test_get_word(session: AsyncSession):
     )
     test_synonym = SynonymModel(synonym="pome", language="en", word=test_word)
     test_translation = TranslationModel(
-        translation="manzana", language="es", word=test_word
+        translation="manzana", language="en", word=test_word
     )
     test_example = ExampleModel(
         example="An apple a day keeps the doctor away.", language="en", word=test_word
@@ -110,3 +123,410 @@ async def test_get_id_multiple_results(session: AsyncSession):
     await session.delete(test_word1)
     await session.delete(test_word2)
     await session.commit()
+
+
+async def test_get_word_uses_read_session(session: AsyncSession):
+    test_word = WordModel(word="pear", language="en")
+    test_definition = DefinitionModel(
+        definition="poire", language="fr", word=test_word
+    )
+    session.add_all([test_word, test_definition])
+    await session.commit()
+
+    def primary_session():
+        raise AssertionError("lookups must not use the primary session")
+
+    repo = WordPgRepo(
+        _session_factory=primary_session, _read_session_factory=get_read_context
+    )
+
+    word_entity = await repo.get("pear", "en", "fr")
+
+    assert word_entity is not None
+    assert word_entity.definitions[0].definition == "poire"
+
+
+async def test_get_word_from_primary(session: AsyncSession):
+    session.add(
+        DefinitionModel(
+            definition="poire",
+            language="fr",
+            word=WordModel(word="pear", language="en"),
+        )
+    )
+    await session.commit()
+
+    def read_session():
+        raise AssertionError("the word must be read from the primary")
+
+    repo = WordPgRepo(
+        _session_factory=get_context, _read_session_factory=read_session
+    )
+
+    word_entity = await repo.get("pear", "en", "fr", primary=True)
+
+    assert word_entity.definitions[0].definition == "poire"
+
+
+async def test_delete_cascades_to_related_data(session: AsyncSession):
+    test_word = WordModel(word="plum", language="en")
+    test_definition = DefinitionModel(definition="prune", language="fr", word=test_word)
+    test_example = ExampleModel(example="A ripe plum.", language="en", word=test_word)
+    other_word = WordModel(word="cherry", language="en")
+    other_definition = DefinitionModel(
+        definition="cerise", language="fr", word=other_word
+    )
+    session.add_all(
+        [test_word, test_definition, test_example, other_word, other_definition]
+    )
+    await session.commit()
+
+    repo = WordPgRepo(_session_factory=get_context)
+
+    await repo.delete(test_word.word_id)
+
+    definitions = (await session.execute(select(DefinitionModel.definition))).all()
+    examples = (await session.execute(select(ExampleModel.example))).all()
+    assert definitions == [("cerise",)]
+    assert examples == []
+
+
+async def test_delete_filtered_in_batches(session: AsyncSession):
+    session.add_all(
+        [
+            WordModel(word="apple", language="en"),
+            WordModel(word="pineapple", language="en"),
+            WordModel(word="apple", language="fr"),
+            WordModel(word="pear", language="en"),
+        ]
+    )
+    await session.commit()
+
+    repo = WordPgRepo(_session_factory=get_context)
+
+    assert await repo.delete_filtered("apple", "en", limit=1) == 1
+    assert await repo.delete_filtered("apple", "en", limit=1) == 1
+    assert await repo.delete_filtered("apple", "en", limit=1) == 0
+
+    words = (
+        await session.execute(select(WordModel.word, WordModel.language))
+    ).all()
+    assert sorted(words) == [("apple", "fr"), ("pear", "en")]
+
+
+async def test_search_definitions_and_examples(session: AsyncSession):
+    bank = WordModel(word="bank", language="en")
+    deposit = WordModel(word="deposit", language="en")
+    session.add_all(
+        [
+            bank,
+            deposit,
+            ExampleModel(
+                example="I opened a bank account.", language="en", word=bank
+            ),
+            ExampleModel(
+                example="Money on a bank account, a savings account.",
+                language="en",
+                word=deposit,
+            ),
+            DefinitionModel(
+                definition="Money placed into a bank account.",
+                language="en",
+                word=deposit,
+            ),
+            ExampleModel(example="The river bank.", language="en", word=bank),
+        ]
+    )
+    await session.commit()
+
+    repo = WordPgRepo(_session_factory=lambda: session)
+
+    page = await repo.search("bank accounts", "en", limit=2)
+    assert len(page.hits) == 2
+    assert page.hits[0].rank >= page.hits[1].rank
+    assert page.next_cursor is not None
+
+    next_page = await repo.search(
+        "bank accounts", "en", limit=2, after=page.next_cursor
+    )
+    assert len(next_page.hits) == 1
+    assert next_page.next_cursor is None
+
+    hits = page.hits + next_page.hits
+    assert {(hit.word, hit.kind) for hit in hits} == {
+        ("bank", "example"),
+        ("deposit", "example"),
+        ("deposit", "definition"),
+    }
+    assert all("account" in hit.text for hit in hits)
+
+
+async def test_save_writes_entry_read_by_get(session: AsyncSession):
+    repo = WordPgRepo(_session_factory=get_context)
+    word = WordEntity(
+        word="apple",
+        language="en",
+        definitions=[DefinitionEntity(definition="pomme", language="fr")],
+        examples=[ExampleEntity(example="An apple a day.", language="fr")],
+    )
+
+    await repo.save(word)
+    word.translations.append(TranslationEntity(translation="pomme", language="fr"))
+    await repo.save(word)
+
+    entry = (await session.execute(select(WordEntryModel))).scalar_one()
+    assert entry.tl == "fr"
+    assert entry.version == 2
+    assert entry.payload["translations"] == [
+        {"translation": "pomme", "language": "fr"}
+    ]
+
+    # the normalized rows are gone, so the entity can only come from the entry
+    await session.execute(delete(ExampleModel))
+    await session.commit()
+
+    assert await repo.get("apple", "en", "fr") == word
+    assert await repo.get("apple", "en", "de") is None
+
+
+async def test_rebuild_entries(session: AsyncSession):
+    words = [WordModel(word=f"word{i}", language="en") for i in range(3)]
+    session.add_all(
+        [
+            *words,
+            *(
+                DefinitionModel(definition=f"mot{i}", language="fr", word=word)
+                for i, word in enumerate(words[:2])
+            ),
+        ]
+    )
+    await session.commit()
+
+    repo = WordPgRepo(_session_factory=get_context)
+
+    last_word_id = await repo.rebuild_entries(limit=2)
+    assert last_word_id == words[1].word_id
+    # the last word has no definition, it still moves the batch forward
+    last_word_id = await repo.rebuild_entries(last_word_id, limit=2)
+    assert last_word_id == words[2].word_id
+    assert await repo.rebuild_entries(last_word_id, limit=2) is None
+
+    entries = (
+        await session.execute(select(WordEntryModel.word_id, WordEntryModel.tl))
+    ).all()
+    assert sorted(entries) == [(words[0].word_id, "fr"), (words[1].word_id, "fr")]
+
+
+async def test_rebuild_entries_past_batch_without_definitions(
+    session: AsyncSession,
+):
+    words = [WordModel(word=f"word{i}", language="en") for i in range(4)]
+    session.add_all(
+        [
+            *words,
+            *(
+                DefinitionModel(definition=f"mot{i}", language="fr", word=word)
+                for i, word in enumerate(words)
+                if i >= 2
+            ),
+        ]
+    )
+    await session.commit()
+
+    repo = WordPgRepo(_session_factory=get_context)
+    last_word_id, batches = 0, 0
+    while (last_word_id := await repo.rebuild_entries(last_word_id, limit=2)):
+        batches += 1
+
+    assert batches == 2
+    entries = (await session.execute(select(WordEntryModel.word_id))).scalars()
+    assert sorted(entries) == [words[2].word_id, words[3].word_id]
+
+
+async def test_get_many_from_entries_and_normalized_tables(session: AsyncSession):
+    repo = WordPgRepo(_session_factory=get_context)
+    await repo.save(
+        WordEntity(
+            word="house",
+            language="en",
+            definitions=[DefinitionEntity(definition="maison", language="fr")],
+        )
+    )
+    # not backfilled into word_entries
+    word = (await session.execute(select(WordModel))).scalar_one()
+    session.add_all(
+        [
+            DefinitionModel(definition="Haus", language="de", word_id=word.word_id),
+            ExampleModel(example="Das Haus.", language="de", word_id=word.word_id),
+            ExampleModel(example="Una casa.", language="es", word_id=word.word_id),
+        ]
+    )
+    await session.commit()
+
+    words = await repo.get_many("house", "en", ["fr", "de", "es"])
+
+    assert sorted(words) == ["de", "fr"]
+    assert words["fr"].definitions[0].definition == "maison"
+    assert [e.example for e in words["de"].examples] == ["Das Haus."]
+
+
+async def test_reverse_lookup(session: AsyncSession):
+    house = WordModel(word="house", language="en")
+    home = WordModel(word="home", language="en")
+    casa = WordModel(word="casa", language="it")
+    session.add_all(
+        [
+            house,
+            home,
+            casa,
+            TranslationModel(translation="Maison", language="fr", word=house),
+            TranslationModel(translation="maison", language="fr", word=home),
+            TranslationModel(translation="maisonnette", language="fr", word=home),
+            TranslationModel(translation="maison", language="fr", word=casa),
+            TranslationModel(translation="100%", language="fr", word=casa),
+            TranslationModel(translation="Haus", language="de", word=house),
+        ]
+    )
+    await session.commit()
+
+    repo = WordPgRepo(_session_factory=lambda: session)
+
+    words = await repo.reverse_lookup(["maison", "chien"], "fr", sl="en")
+    assert words == {
+        "maison": [
+            ReverseTranslationEntity(word="home", language="en", translation="maison"),
+            ReverseTranslationEntity(
+                word="house", language="en", translation="Maison"
+            ),
+        ],
+        "chien": [],
+    }
+
+    words = await repo.reverse_lookup(["maison"], "fr", partial=True, limit=3)
+    assert [(w.word, w.translation) for w in words["maison"]] == [
+        ("casa", "maison"),
+        ("home", "maison"),
+        ("home", "maisonnette"),
+    ]
+
+    words = await repo.reverse_lookup(["0%", "_0"], "fr", partial=True)
+    assert [w.word for w in words["0%"]] == ["casa"]
+    assert words["_0"] == []
+
+
+async def test_get_hot_entries(session: AsyncSession):
+    repo = WordPgRepo(_session_factory=get_context)
+    for word, tls in (("old", ["fr", "de"]), ("new", ["fr"])):
+        await repo.save(
+            WordEntity(
+                word=word,
+                language="en",
+                definitions=[
+                    DefinitionEntity(definition=f"{word}-{tl}", language=tl)
+                    for tl in tls
+                ],
+            )
+        )
+
+    entries = [entry async for entry in repo.get_hot_entries(top_n=1)]
+
+    assert sorted((word, sl, tl) for word, sl, tl, _ in entries) == [
+        ("new", "en", "fr"),
+        ("old", "en", "de"),
+    ]
+    assert all(payload["word"] == word for word, _, _, payload in entries)
+
+
+async def test_save_merges_normalized_variants(session: AsyncSession):
+    repo = WordPgRepo(_session_factory=get_context)
+    for variant, translation in (
+        ("House", "Haus"),
+        (" house ", "Gebaeude"),
+        ("HOUSE", "Haus"),
+    ):
+        await repo.save(
+            WordEntity(
+                word=variant,
+                language="en",
+                definitions=[DefinitionEntity(definition="Haus", language="de")],
+                translations=[
+                    TranslationEntity(translation=translation, language="de")
+                ],
+            )
+        )
+
+    stored = (await session.execute(select(WordModel))).scalar_one()
+    assert stored.word == "House"
+    assert stored.normalized == "house"
+
+    word = await repo.get("  HOUSE", "en", "de")
+    assert word is not None
+    assert {t.translation for t in word.translations} == {"Haus", "Gebaeude"}
+    assert await repo.get_id("house", "en") == stored.word_id
+
+
+async def test_save_stats_decays_scores(session: AsyncSession):
+    repo = WordPgRepo(_session_factory=get_context, stats_half_life=3600)
+    await repo.save(WordEntity(word="house", language="en"))
+
+    await repo.save_stats({("house", "en", "fr"): 4, ("missing", "en", "fr"): 1})
+    # the stored score is an hour old when the next hits arrive
+    await session.execute(
+        update(WordStatModel).values(
+            updated_at=WordStatModel.updated_at - timedelta(hours=1)
+        )
+    )
+    await session.commit()
+    await repo.save_stats({("house", "en", "fr"): 1})
+
+    stat = (await session.execute(select(WordStatModel))).scalar_one()
+    assert stat.tl == "fr"
+    assert stat.hits == 5
+    assert stat.score == pytest.approx(3, rel=1e-3)
+
+
+async def test_get_hot_entries_by_popularity(session: AsyncSession):
+    repo = WordPgRepo(_session_factory=get_context)
+    for word in ("cat", "dog", "bird"):
+        await repo.save(
+            WordEntity(
+                word=word,
+                language="en",
+                definitions=[DefinitionEntity(definition=word, language="fr")],
+            )
+        )
+    await repo.save_stats({("cat", "en", "fr"): 3, ("dog", "en", "fr"): 5})
+
+    entries = [entry async for entry in repo.get_hot_entries(top_n=3)]
+
+    # bird has no hits, it follows the popular ones
+    assert [word for word, _, _, _ in entries] == ["dog", "cat", "bird"]
+
+
+async def test_get_pages_with_requested_sections(session: AsyncSession):
+    repo = WordPgRepo(_session_factory=get_context)
+    for word in ("cat", "bird", "dog"):
+        await repo.save(
+            WordEntity(
+                word=word,
+                language="en",
+                definitions=[
+                    DefinitionEntity(definition=f"{word} 1", language="fr"),
+                    DefinitionEntity(definition=f"{word} 2", language="de"),
+                ],
+                examples=[ExampleEntity(example=f"a {word}", language="fr")],
+            )
+        )
+
+    words = await repo.get_pages(1, 2, include_definitions=True)
+
+    assert [(w.word, w.language) for w in words] == [("bird", "en"), ("cat", "en")]
+    assert [(d.definition, d.language) for d in words[1].definitions] == [
+        ("cat 1", "fr"),
+        ("cat 2", "de"),
+    ]
+    assert words[1].examples == []
+
+    [dog] = await repo.get_pages(2, 2, include_examples=True)
+    assert dog.definitions == []
+    assert [e.example for e in dog.examples] == ["a dog"]
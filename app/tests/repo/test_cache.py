@@ -0,0 +1,82 @@
+from unittest.mock import patch
+
+from app.domain.entities import DefinitionEntity, WordEntity
+from app.repo.cache import WordCache
+
+
+def make_word(word: str, tl: str = "fr") -> WordEntity:
+    return WordEntity(
+        word=word,
+        language="en",
+        definitions=[DefinitionEntity(definition=f"{word}-{tl}", language=tl)],
+    )
+
+
+def test_cache_evicts_least_recently_used():
+    cache = WordCache(capacity=2)
+    cache.put(make_word("house"), "fr")
+    cache.put(make_word("cat"), "fr")
+
+    assert cache.get("House ", "en", "fr") == make_word("house")
+    cache.put(make_word("dog"), "fr")
+
+    assert cache.get("cat", "en", "fr") is None
+    assert cache.get("house", "en", "fr") is not None
+    assert cache.get("dog", "en", "fr") is not None
+    # stored words have a language
+    assert cache.get("dog", "auto", "fr") is None
+
+
+def test_cache_entries_expire():
+    cache = WordCache(ttl=10)
+    with patch("app.repo.cache.time.monotonic", return_value=100.0):
+        cache.put(make_word("house"), "fr")
+    with patch("app.repo.cache.time.monotonic", return_value=109.0):
+        assert cache.get("house", "en", "fr") is not None
+    with patch("app.repo.cache.time.monotonic", return_value=111.0):
+        assert cache.get("house", "en", "fr") is None
+    assert len(cache) == 0
+
+
+def test_cache_discard():
+    cache = WordCache()
+    cache.put(make_word("house", "fr"), "fr")
+    cache.put(make_word("house", "de"), "de")
+    cache.put(make_word("cat"), "fr")
+
+    cache.discard("HOUSE", "en")
+    assert cache.get("house", "en", "fr") is None
+    assert cache.get("house", "en", "de") is None
+
+    cache.discard("cat")
+    assert len(cache) == 0
+
+
+def test_cache_discard_after_eviction():
+    cache = WordCache(capacity=2)
+    cache.put(make_word("house", "fr"), "fr")
+    cache.put(make_word("house", "de"), "de")
+    cache.put(make_word("cat"), "fr")
+
+    cache.discard("house", "en")
+    assert len(cache) == 1
+    cache.put(make_word("house", "fr"), "fr")
+    cache.discard("house")
+    assert len(cache) == 1
+    assert cache.get("cat", "en", "fr") is not None
+
+
+def test_cache_warm_keeps_most_valuable():
+    cache = WordCache(capacity=2)
+    entries = [
+        (word, "en", "fr", make_word(word).model_dump())
+        for word in ("house", "cat", "dog")
+    ]
+
+    assert cache.warm(entries) == 2
+    assert cache.get("dog", "en", "fr") is None
+
+    # the least valuable warmed entry goes first
+    cache.put(make_word("bird"), "fr")
+    assert cache.get("cat", "en", "fr") is None
+    assert cache.get("house", "en", "fr") == make_word("house")
@@ -0,0 +1,122 @@
+import pytest
+
+from app.domain.entities import DefinitionEntity, WordEntity
+from app.repo.snapshot import (
+    InvalidSnapshotException,
+    WordSnapshot,
+    _Mapping,
+    write_snapshot,
+)
+from app.repo.word import WordRepo
+
+
+def make_entry(word: str, sl: str, tl: str, definition: str):
+    entity = WordEntity(
+        word=word,
+        language=sl,
+        definitions=[DefinitionEntity(definition=definition, language=tl)],
+    )
+    return word, sl, tl, entity.model_dump(mode="json")
+
+
+def test_snapshot_lookup(tmp_path):
+    path = str(tmp_path / "words.snapshot")
+    entries = [
+        make_entry("house", "en", "fr", "maison"),
+        make_entry("house", "en", "de", "Haus"),
+        make_entry("maison", "fr", "en", "house"),
+        make_entry("hôtel", "fr", "en", "hotel"),
+    ]
+    assert write_snapshot(path, entries) == 4
+
+    snapshot = WordSnapshot(path)
+
+    word = snapshot.get("house", "en", "de")
+    assert word.definitions == [DefinitionEntity(definition="Haus", language="de")]
+    assert snapshot.get("hôtel", "fr", "en").definitions[0].definition == "hotel"
+    assert snapshot.get("house", "en", "es") is None
+    assert snapshot.get("houses", "en", "fr") is None
+    assert snapshot.get("house", "auto", "fr") is None
+
+    snapshot.discard("house", "en")
+    assert snapshot.get("house", "en", "fr") is None
+    assert snapshot.get("maison", "fr", "en") is not None
+
+
+def test_snapshot_is_swapped_on_rebuild(tmp_path):
+    path = str(tmp_path / "words.snapshot")
+    snapshot = WordSnapshot(path, check_interval=0)
+    assert snapshot.get("house", "en", "fr") is None
+
+    write_snapshot(path, [make_entry("house", "en", "fr", "maison")])
+    assert snapshot.get("house", "en", "fr").definitions[0].definition == "maison"
+    snapshot.discard("house")
+
+    write_snapshot(path, [make_entry("house", "en", "fr", "demeure")])
+    assert snapshot.get("house", "en", "fr").definitions[0].definition == "demeure"
+
+    write_snapshot(path, [])
+    assert snapshot.get("house", "en", "fr") is None
+    assert list(tmp_path.iterdir()) == [tmp_path / "words.snapshot"]
+
+
+@pytest.mark.parametrize(
+    "content", [b"not a snapshot at all", b"", b"WSNAP001\x05"]
+)
+def test_invalid_snapshot_is_ignored(tmp_path, content: bytes):
+    path = tmp_path / "words.snapshot"
+    path.write_bytes(content)
+    snapshot = WordSnapshot(str(path), check_interval=0)
+
+    assert snapshot.get("house", "en", "fr") is None
+
+    write_snapshot(str(path), [make_entry("house", "en", "fr", "maison")])
+    assert snapshot.get("house", "en", "fr").definitions[0].definition == "maison"
+
+
+def test_truncated_snapshot_is_invalid(tmp_path):
+    path = tmp_path / "words.snapshot"
+    write_snapshot(str(path), [make_entry("house", "en", "fr", "maison")])
+    path.write_bytes(path.read_bytes()[:-5])
+
+    with pytest.raises(InvalidSnapshotException):
+        _Mapping(str(path))
+    assert WordSnapshot(str(path)).get("house", "en", "fr") is None
+
+
+def test_discard_matching_hides_filtered_words(tmp_path):
+    path = str(tmp_path / "words.snapshot")
+    write_snapshot(
+        path,
+        [
+            make_entry("house", "en", "fr", "maison"),
+            make_entry("greenhouse", "en", "fr", "serre"),
+            make_entry("tree", "en", "fr", "arbre"),
+            make_entry("mouse", "fr", "en", "mouse"),
+        ],
+    )
+    snapshot = WordSnapshot(path)
+
+    snapshot.discard_matching("HOUSE", "en")
+    assert snapshot.get("house", "en", "fr") is None
+    assert snapshot.get("greenhouse", "en", "fr") is None
+    assert snapshot.get("tree", "en", "fr") is not None
+
+    snapshot.discard_matching("ous")
+    assert snapshot.get("mouse", "fr", "en") is None
+
+
+class FilteredPgRepo:
+    async def delete_filtered(self, word_filter, sl, limit):
+        return 1
+
+
+async def test_bulk_delete_by_filter_hides_snapshot_words(tmp_path):
+    path = str(tmp_path / "words.snapshot")
+    write_snapshot(path, [make_entry("greenhouse", "en", "fr", "serre")])
+    snapshot = WordSnapshot(path)
+    repo = WordRepo(pg_repo=FilteredPgRepo(), google_repo=None, snapshot=snapshot)
+
+    assert await repo.bulk_delete(word_filter="house", sl="en") == 1
+
+    assert snapshot.get("greenhouse", "en", "fr") is None
@@ -0,0 +1,27 @@
+from app.repo.stats import DROPPED, WordStats
+
+
+def test_stats_count_normalized_words():
+    stats = WordStats()
+    stats.record("House", "en", "fr")
+    stats.record(" house", "en", "fr")
+    stats.record("house", "en", "de")
+
+    assert stats.drain() == {("house", "en", "fr"): 2, ("house", "en", "de"): 1}
+    assert stats.drain() == {}
+
+
+def test_stats_restore_and_bound():
+    stats = WordStats(max_keys=2)
+    stats.record("house", "en", "fr")
+    counts = stats.drain()
+    stats.record("house", "en", "fr")
+    stats.restore(counts)
+    assert stats.drain() == {("house", "en", "fr"): 2}
+
+    dropped = DROPPED.value()
+    for word in ("house", "cat", "dog", "house"):
+        stats.record(word, "en", "fr")
+
+    assert stats.drain() == {("house", "en", "fr"): 2, ("cat", "en", "fr"): 1}
+    assert DROPPED.value() == dropped + 1
@@ -0,0 +1,64 @@
+from app.repo.suggest import SuggestIndex
+
+
+def test_suggest_by_popularity():
+    index = SuggestIndex()
+    index.rebuild(
+        [
+            ("house", "en", 1),
+            ("Home", "en", 3),
+            ("hose", "en", 1),
+            ("hotel", "en", 0),
+            ("homme", "fr", 2),
+        ]
+    )
+
+    assert index.suggest("ho", "en", limit=3) == [
+        ("Home", "en"),
+        ("hose", "en"),
+        ("house", "en"),
+    ]
+    assert index.suggest("HOM") == [("Home", "en"), ("homme", "fr")]
+    assert index.suggest("x") == []
+
+    index.touch("hotel", "en")
+    index.touch("hotel", "en")
+    assert index.suggest("hote", "en", limit=2) == [("hotel", "en")]
+    # rankings of short prefixes are cached, new words are merged into them
+    assert index.suggest("ho", "en", limit=2) == [("Home", "en"), ("hose", "en")]
+    index.add("hoop", "en", 2)
+    assert index.suggest("ho", "en", limit=2) == [("Home", "en"), ("hoop", "en")]
+
+    # lookups counted by the worker survive the rebuild
+    index.rebuild([("Home", "en", 3), ("hose", "en", 1), ("hotel", "en", 0)])
+    assert index.suggest("ho", "en", limit=2) == [("Home", "en"), ("hotel", "en")]
+
+
+def test_suggest_incremental_updates():
+    index = SuggestIndex()
+
+    index.add("apple", "en", 1)
+    index.add("apricot", "en")
+    index.add("apple", "en")
+    assert len(index) == 2
+    assert index.suggest("ap", "en") == [("apple", "en"), ("apricot", "en")]
+
+    index.remove("apple")
+    assert index.suggest("ap", "en") == [("apricot", "en")]
+
+    index.add("pineapple", "en")
+    index.remove_matching("PRIC", "en")
+    assert index.suggest("a", "en") == []
+    assert index.suggest("p", "en") == [("pineapple", "en")]
+
+
+def test_suggest_ranks_every_match_of_a_large_range():
+    index = SuggestIndex(max_candidates=2, cached_prefix_length=1)
+    index.rebuild([(f"word{i}", "en", 0) for i in range(5)] + [("wordz", "en", 1)])
+
+    assert index.suggest("wor", "en", limit=2) == [("wordz", "en"), ("word0", "en")]
+
+    index.add("wordy", "en", 2)
+    assert index.suggest("wor", "en", limit=2) == [("wordy", "en"), ("wordz", "en")]
+    index.remove("wordy")
+    assert index.suggest("wor", "en", limit=2) == [("wordz", "en"), ("word0", "en")]
@@ -1,5 +1,9 @@
 from httpx import AsyncClient, codes
+from passlib.hash import bcrypt
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import config
 from app.main import app
 from app.models import User
 from app.tests.conftest import default_user_email, default_user_password
@@ -62,3 +66,33 @@ async def test_auth_refresh_token(client: AsyncClient, default_user: User):
     assert "refresh_token" in token
     assert "refresh_token_expires_at" in token
     assert "refresh_token_issued_at" in token
+
+
+async def test_auth_access_token_rehashes_password(
+    client: AsyncClient, default_user: User, session: AsyncSession
+):
+    # hash made with other than SECURITY_BCRYPT_ROUNDS rounds
+    outdated_hash = bcrypt.using(rounds=4).hash(default_user_password)
+    await session.execute(
+        update(User)
+        .where(User.id == default_user.id)
+        .values(hashed_password=outdated_hash)
+    )
+    await session.commit()
+
+    response = await client.post(
+        app.url_path_for("login_access_token"),
+        data={
+            "username": default_user_email,
+            "password": default_user_password,
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == codes.OK
+
+    result = await session.execute(
+        select(User.hashed_password).where(User.id == default_user.id)
+    )
+    new_hash = result.scalar_one()
+    assert new_hash != outdated_hash
+    assert bcrypt.from_string(new_hash).rounds == config.settings.SECURITY_BCRYPT_ROUNDS